@@ -20,6 +20,10 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TCS.settings')
 # Initialiser Django ASGI application pour HTTP
 django_asgi_app = get_asgi_application()
 
+# Préchargement optionnel du modèle de matching
+from matching.services.model_registry import warm_up_if_configured  # noqa: E402
+warm_up_if_configured()
+
 # Combiner tous les patterns WebSocket
 all_websocket_patterns = notifications_ws_patterns + chat_ws_patterns
 
@@ -1,9 +1,17 @@
 from __future__ import absolute_import, unicode_literals
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TCS.settings')
 
 app = Celery('TCS')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def warm_up_matching_model(**kwargs):
+    """Précharge le modèle de matching dans chaque processus worker (après le fork)."""
+    from matching.services.model_registry import warm_up_if_configured
+    warm_up_if_configured()
@@ -25,10 +25,49 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = config('DJANGO_SECRET_KEY')
 
 OPENAI_API_KEY = config('OPENAI_API_KEY')
+# Passerelle LLM (candidates.services.llm_gateway) : URL d'un serveur compatible OpenAI
+# (ex. http://localhost:8001/v1 avec `manage.py run_fake_llm_server`), modèle, limites par processus
+LLM_BASE_URL = config('LLM_BASE_URL', default='')
+LLM_MODEL = config('LLM_MODEL', default='gpt-4')
+LLM_TIMEOUT_SECONDS = config('LLM_TIMEOUT_SECONDS', default=120, cast=float)
+LLM_MAX_CONCURRENCY = config('LLM_MAX_CONCURRENCY', default=4, cast=int)
+LLM_REQUESTS_PER_MINUTE = config('LLM_REQUESTS_PER_MINUTE', default=60, cast=int)
+LLM_TOKENS_PER_MINUTE = config('LLM_TOKENS_PER_MINUTE', default=40000, cast=int)
+LLM_MAX_RETRIES = config('LLM_MAX_RETRIES', default=5, cast=int)
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TCS.settings')
 CELERY_BROKER_URL = config('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND')
 
+# Cache des CVs déjà parsés (SHA-256 du PDF + version du prompt) : taille maximale et durée sans utilisation avant éviction
+CV_PARSE_CACHE_MAX_ENTRIES = config('CV_PARSE_CACHE_MAX_ENTRIES', default=10000, cast=int)
+CV_PARSE_CACHE_MAX_AGE_DAYS = config('CV_PARSE_CACHE_MAX_AGE_DAYS', default=180, cast=int)
+# Budget d'extraction du texte des PDFs : au-delà, les pages suivantes ne sont pas lues
+CV_PDF_MAX_PAGES = config('CV_PDF_MAX_PAGES', default=6, cast=int)
+CV_PDF_MAX_CHARS = config('CV_PDF_MAX_CHARS', default=15000, cast=int)
+
+# Matching sémantique (SentenceTransformer)
+MATCHING_MODEL_NAME = config('MATCHING_MODEL_NAME', default='all-MiniLM-L6-v2')
+# Précharger le modèle au démarrage des workers (gunicorn/daphne/celery) au lieu de la première requête
+MATCHING_MODEL_WARMUP = config('MATCHING_MODEL_WARMUP', default=False, cast=bool)
+# Matrices d'embeddings projetées en mémoire (float16 ou int8) et index ANN par forum
+MATCHING_INDEX_DIR = config('MATCHING_INDEX_DIR', default=str(BASE_DIR / 'matching_indexes'))
+MATCHING_VECTOR_DTYPE = config('MATCHING_VECTOR_DTYPE', default='float16')
+# Agrégation des similarités des blocs d'un profil (une par expérience, compétences, formation, langues) : max ou mean
+MATCHING_SECTION_AGGREGATION = config('MATCHING_SECTION_AGGREGATION', default='max')
+# Index ANN (IVF) : utilisé à partir de ce nombre de candidats retenus, listes sondées et facteur de re-classement exact
+MATCHING_ANN_MIN_CANDIDATES = config('MATCHING_ANN_MIN_CANDIDATES', default=5000, cast=int)
+MATCHING_ANN_NPROBE = config('MATCHING_ANN_NPROBE', default=8, cast=int)
+MATCHING_ANN_RERANK_FACTOR = config('MATCHING_ANN_RERANK_FACTOR', default=5, cast=int)
+# Délai de regroupement des modifications avant ré-encodage des profils / offres modifiés
+MATCHING_DIRTY_DEBOUNCE_SECONDS = config('MATCHING_DIRTY_DEBOUNCE_SECONDS', default=30, cast=int)
+# Durée de conservation des tâches de matching (résultats) sans activité
+MATCHING_JOB_RETENTION_DAYS = config('MATCHING_JOB_RETENTION_DAYS', default=7, cast=int)
+
+# Cache des documents de forum (détail et listes) : durée de vie maximale, les modifications l'invalident aussitôt
+FORUM_CACHE_TIMEOUT = config('FORUM_CACHE_TIMEOUT', default=3600, cast=int)
+# Taille de page des listes de forums à venir (?page_size= permet de la changer, jusqu'à 200)
+FORUM_LIST_PAGE_SIZE = config('FORUM_LIST_PAGE_SIZE', default=50, cast=int)
+
 # Zoom Configuration
 ZOOM_ACCOUNT_ID = config('ZOOM_ACCOUNT_ID')
 ZOOM_CLIENT_ID = config('ZOOM_CLIENT_ID')
@@ -76,6 +115,8 @@ CORS_ALLOWED_ORIGINS = [
 # Configuration CORS pour les cookies HttpOnly
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = False  # Désactiver pour la sécurité
+# En-têtes lisibles par le frontend : cache des forums et pagination des listes
+CORS_EXPOSE_HEADERS = ['ETag', 'Link', 'X-Total-Count']
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -128,6 +169,24 @@ else:
         },
     }
 
+# Cache (recommandations de matching, documents de forum, ...) partagé entre les processus (gunicorn, daphne,
+# Celery) : les invalidations faites par un processus doivent être vues par tous. Redis si disponible,
+# sinon fichiers sur disque (une seule machine). Pas de LocMemCache : il est propre à chaque processus.
+if os.environ.get('USE_REDIS', 'false').lower() == 'true':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('REDIS_CACHE_URL', default='redis://localhost:6379/1'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('FILE_CACHE_DIR', default=str(BASE_DIR / 'cache')),
+        }
+    }
+
 
 TEMPLATES = [
     {
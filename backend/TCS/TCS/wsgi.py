@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TCS.settings')
 
 application = get_wsgi_application()
+
+# Préchargement optionnel du modèle de matching dans chaque worker
+from matching.services.model_registry import warm_up_if_configured  # noqa: E402
+warm_up_if_configured()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Candidate,Experience,Education,Skill,Language,CandidateLanguage
+from .models import Candidate,Experience,Education,Skill,Language,CandidateLanguage,CVParseCache,CandidateProfileSnapshot,ServiceCounter
 
 # Register your models here.
 admin.site.register(Candidate)
@@ -9,5 +9,8 @@ admin.site.register(Education)
 admin.site.register(Skill)
 admin.site.register(Language)
 admin.site.register(CandidateLanguage)
+admin.site.register(CVParseCache)
+admin.site.register(CandidateProfileSnapshot)
+admin.site.register(ServiceCounter)
 
 
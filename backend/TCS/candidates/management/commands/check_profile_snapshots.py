@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from candidates.services.profile_snapshot import find_drifted_snapshots, refresh_profile_snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        'Vérifie que les profils candidats précalculés correspondent aux tables du profil '
+        '(option : régénère les documents absents, dépassés ou divergents)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Régénérer les documents en écart'
+        )
+        parser.add_argument(
+            '--candidate',
+            type=int,
+            nargs='+',
+            help='Limiter la vérification à ces candidats (identifiants)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Nombre de candidats comparés par lot (défaut: 500)'
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(find_drifted_snapshots(options['candidate'], batch_size=options['batch_size']))
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('✅ Tous les profils précalculés sont à jour'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'⚠️  {len(drifted)} profils précalculés en écart'))
+        for candidate_id in drifted[:20]:
+            self.stdout.write(f'  🔍 Candidat {candidate_id}')
+        if len(drifted) > 20:
+            self.stdout.write(f'  ... et {len(drifted) - 20} autres')
+
+        if options['fix']:
+            for start in range(0, len(drifted), options['batch_size']):
+                refresh_profile_snapshots(drifted[start:start + options['batch_size']])
+            self.stdout.write(self.style.SUCCESS(f'🔄 {len(drifted)} profils précalculés régénérés'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from candidates.utils.cv_classifier import get_prefilter_stats, reset_prefilter_stats
+
+
+class Command(BaseCommand):
+    help = 'Affiche les statistiques de la pré-classification locale des CVs (documents rejetés sans appel à OpenAI)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Remettre à zéro les compteurs après affichage'
+        )
+
+    def handle(self, *args, **options):
+        stats = get_prefilter_stats()
+        self.stdout.write('📊 Pré-classification des CVs :')
+        self.stdout.write(f"  📄 Documents analysés : {stats['total']}")
+        self.stdout.write(f"  ✅ Transmis au modèle : {stats['accepted']}")
+        self.stdout.write(f"  ⛔ Rejetés localement : {stats['rejected']}")
+        self.stdout.write(f"  🎯 Taux de rejet : {stats['rejection_rate'] if stats['rejection_rate'] is not None else '-'}")
+        for reason, count in stats['rejected_by_reason'].items():
+            self.stdout.write(f"    - {reason} : {count}")
+
+        if options['reset']:
+            reset_prefilter_stats()
+            self.stdout.write('🔄 Compteurs remis à zéro')
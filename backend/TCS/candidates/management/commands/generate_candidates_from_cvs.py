@@ -1,11 +1,41 @@
-import os
 import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
-from django.core.files import File
-from django.conf import settings
+from django.db import connection, transaction
+
 from users.models import User
 from candidates.models import Candidate, Experience, Education, Skill, Language, CandidateLanguage
-from candidates.utils.cv_parser import parse_uploaded_pdf
+from candidates.utils.cv_parser import parse_cv_bytes
+from candidates.utils.pdf_text import extract_pdf_texts, get_extraction_stats, record_extraction
+from candidates.services.cv_parse_cache import get_cache_stats
+from candidates.services.cv_storage import store_cv
+from candidates.services.llm_gateway import get_gateway_metrics
+from candidates.utils.cv_classifier import get_prefilter_stats
+from matching.services.dirty_queue import mark_dirty, suspend_dirty_tracking
+
+MANIFEST_NAME = '.import_manifest.json'
+# Fichiers terminés : ignorés à la reprise (les erreurs sont retentées)
+DONE_STATUSES = ('created', 'rejected', 'exists')
+
+
+def _parse_file(path, cv_text=None):
+    """Exécutée dans un thread du pool : lecture du PDF et parsing (cache, pré-classification, OpenAI)."""
+    try:
+        with open(path, 'rb') as f:
+            return parse_cv_bytes(f.read(), cv_text=cv_text)
+    except Exception as e:
+        return {"is_cv": False, "error": f"💥 Erreur de parsing : {str(e)}"}
+    finally:
+        # Chaque thread ouvre sa propre connexion (cache de parsing)
+        connection.close()
+
+
+def _cut(value, max_length=255):
+    return (value or '')[:max_length]
 
 
 class Command(BaseCommand):
@@ -29,10 +59,32 @@ class Command(BaseCommand):
             action='store_true',
             help='Mode test - ne crée pas vraiment les candidats'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Nombre de CVs parsés en parallèle (par défaut: 8)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Nombre de candidats écrits par transaction (par défaut: 200)'
+        )
+        parser.add_argument(
+            '--extract-processes',
+            type=int,
+            default=0,
+            help='Extraire le texte des PDFs dans un pool de N processus avant le parsing (par défaut: 0, extraction dans les threads)'
+        )
+        parser.add_argument(
+            '--manifest',
+            type=str,
+            help=f'Fichier de reprise (par défaut: <cv-folder>/{MANIFEST_NAME})'
+        )
 
     def handle(self, *args, **options):
         cv_folder = options['cv_folder']
-        password = options['password']
         dry_run = options['dry_run']
 
         # Vérifier que le dossier existe
@@ -42,191 +94,251 @@ class Command(BaseCommand):
             )
             return
 
-        # Lister tous les fichiers PDF dans le dossier
-        pdf_files = [f for f in os.listdir(cv_folder) if f.lower().endswith('.pdf')]
-        
+        # Ordre stable : l'email candidat{i} d'un fichier ne change pas d'une exécution à l'autre
+        pdf_files = sorted(f for f in os.listdir(cv_folder) if f.lower().endswith('.pdf'))
+
         if not pdf_files:
             self.stdout.write(
                 self.style.WARNING(f'Aucun fichier PDF trouvé dans {cv_folder}')
             )
             return
 
+        self.manifest_path = options['manifest'] or os.path.join(cv_folder, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+        pending = [
+            (f'candidat{i}@gmail.com', pdf_file, os.path.join(cv_folder, pdf_file))
+            for i, pdf_file in enumerate(pdf_files, 1)
+            if self.manifest.get(pdf_file, {}).get('status') not in DONE_STATUSES
+        ]
+
         self.stdout.write(
-            self.style.SUCCESS(f'📁 {len(pdf_files)} CVs trouvés dans {cv_folder}')
+            self.style.SUCCESS(
+                f'📁 {len(pdf_files)} CVs trouvés dans {cv_folder}, {len(pdf_files) - len(pending)} déjà traités'
+            )
         )
 
         if dry_run:
             self.stdout.write(
-                self.style.WARNING('🧪 MODE TEST - Aucun candidat ne sera créé')
+                self.style.WARNING(f'🧪 MODE TEST - {len(pending)} candidats seraient créés, aucun ne sera créé')
             )
+            return
 
-        success_count = 0
-        error_count = 0
+        pending = self._skip_existing(pending)
 
-        for i, pdf_file in enumerate(pdf_files, 1):
-            try:
-                self.stdout.write(f'\n📄 Traitement du CV {i}/{len(pdf_files)}: {pdf_file}')
-                
-                # Générer l'email du candidat
-                email = f'candidat{i}@gmail.com'
-                
-                # Vérifier si le candidat existe déjà
-                if User.objects.filter(email=email).exists():
-                    self.stdout.write(
-                        self.style.WARNING(f'⚠️  Le candidat {email} existe déjà, passage au suivant')
-                    )
-                    continue
+        texts = {}
+        if options['extract_processes'] and pending:
+            self.stdout.write(f'📄 Extraction du texte de {len(pending)} PDFs ({options["extract_processes"]} processus)...')
+            extracted = extract_pdf_texts([path for _, _, path in pending], max_workers=options['extract_processes'])
+            for result in extracted.values():
+                record_extraction(result)
+            texts = {path: result['text'] for path, result in extracted.items() if 'text' in result}
 
-                if dry_run:
-                    self.stdout.write(f'🧪 [TEST] Créerait le candidat: {email}')
-                    continue
+        self.hashed_password = make_password(options['password'])
+        self.counts = {'created': 0, 'rejected': 0, 'error': 0}
+        self.start = time.perf_counter()
+        processed = 0
+        batch = []
 
-                # Chemin complet du fichier CV
-                cv_path = os.path.join(cv_folder, pdf_file)
-                
-                # Parser le CV d'abord
-                self.stdout.write('🤖 Parsing du CV...')
-                with open(cv_path, 'rb') as cv_file:
-                    # Vérifier que c'est un PDF
-                    if not pdf_file.lower().endswith('.pdf'):
-                        self.stdout.write(
-                            self.style.ERROR(f'❌ Le fichier {pdf_file} n\'est pas un PDF')
-                        )
-                        error_count += 1
-                        continue
-                    
-                    # Parser directement avec read_pdf et parse_cv_with_chatgpt
-                    from candidates.utils.cv_parser import read_pdf, parse_cv_with_chatgpt
-                    import json
-                    
-                    try:
-                        cv_text = read_pdf(cv_file)
-                        gpt_response = parse_cv_with_chatgpt(cv_text)
-                        parsed_data = json.loads(gpt_response)
-                    except json.JSONDecodeError:
-                        parsed_data = {
-                            "is_cv": False,
-                            "error": "❌ Le JSON retourné n'est pas valide."
-                        }
-                    except Exception as e:
-                        parsed_data = {
-                            "is_cv": False,
-                            "error": f"💥 Erreur de parsing : {str(e)}"
-                        }
-                    
-                    if not parsed_data.get('is_cv', False):
-                        self.stdout.write(
-                            self.style.ERROR(f'❌ Le fichier {pdf_file} n\'est pas un CV valide')
-                        )
-                        error_count += 1
-                        continue
-
-                    cv_data = parsed_data.get('data', {})
-                    
-                    # Créer l'utilisateur
-                    self.stdout.write(f'👤 Création du compte: {email}')
-                    user = User.objects.create_user(
-                        email=email,
-                        password=password,
-                        role='candidate',
-                        is_active=True  # Activer directement le compte
-                    )
-                    
-                    # Créer le profil candidat
-                    candidate = Candidate.objects.create(
-                        user=user,
-                        first_name=cv_data.get('first_name', ''),
-                        last_name=cv_data.get('last_name', ''),
-                        title=cv_data.get('title', ''),
-                        phone=cv_data.get('phone', ''),
-                        bio=f"Profil généré automatiquement à partir du CV {pdf_file}"
-                    )
-                    
-                    # Enregistrer le CV dans le profil du candidat
-                    with open(cv_path, 'rb') as cv_file_for_save:
-                        candidate.cv_file.save(
-                            pdf_file,
-                            File(cv_file_for_save),
-                            save=True
-                        )
-                    
-                    # Créer les expériences
-                    for exp_data in cv_data.get('experiences', []):
-                        # Nettoyer les dates
-                        start_date = self._clean_date(exp_data.get('start_date'))
-                        end_date = self._clean_date(exp_data.get('end_date'))
-                        
-                        Experience.objects.create(
-                            candidate=candidate,
-                            job_title=exp_data.get('job_title', ''),
-                            company=exp_data.get('company', ''),
-                            description=exp_data.get('description', ''),
-                            start_date=start_date,
-                            end_date=end_date
-                        )
-                    
-                    # Créer les formations
-                    for edu_data in cv_data.get('educations', []):
-                        # Nettoyer les dates
-                        start_date = self._clean_date(edu_data.get('start_date'))
-                        end_date = self._clean_date(edu_data.get('end_date'))
-                        
-                        Education.objects.create(
-                            candidate=candidate,
-                            degree=edu_data.get('degree', ''),
-                            institution=edu_data.get('institution', ''),
-                            start_date=start_date,
-                            end_date=end_date
-                        )
-                    
-                    # Créer les compétences
-                    for skill_name in cv_data.get('skills', []):
-                        if skill_name.strip():  # Ignorer les compétences vides
-                            Skill.objects.create(
-                                candidate=candidate,
-                                name=skill_name.strip()
-                            )
-                    
-                    # Créer les langues
-                    for lang_data in cv_data.get('languages', []):
-                        lang_name = lang_data.get('name', '').strip()
-                        lang_level = lang_data.get('level', '')
-                        
-                        if lang_name:
-                            # Créer ou récupérer la langue
-                            language, created = Language.objects.get_or_create(
-                                name=lang_name
-                            )
-                            
-                            # Associer la langue au candidat
-                            CandidateLanguage.objects.create(
-                                candidate=candidate,
-                                language=language,
-                                level=lang_level
-                            )
-                    
-                    self.stdout.write(
-                        self.style.SUCCESS(f'✅ Candidat {email} créé avec succès!')
-                    )
-                    success_count += 1
+        self.stdout.write(f'🤖 Parsing de {len(pending)} CVs ({options["workers"]} en parallèle)...')
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {
+                pool.submit(_parse_file, path, texts.get(path)): (email, pdf_file, path)
+                for email, pdf_file, path in pending
+            }
+            for future in as_completed(futures):
+                email, pdf_file, path = futures[future]
+                parsed_data = future.result()
+                processed += 1
 
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f'❌ Erreur lors du traitement de {pdf_file}: {str(e)}')
-                )
-                error_count += 1
+                if not parsed_data.get('is_cv', False):
+                    status = 'error' if parsed_data.get('error') and not parsed_data.get('reason') else 'rejected'
+                    self.counts[status] += 1
+                    self.manifest[pdf_file] = {"status": status, "error": parsed_data.get('error', '')}
+                    self.stdout.write(self.style.ERROR(f'❌ Le fichier {pdf_file} n\'est pas un CV valide'))
+                else:
+                    batch.append((email, pdf_file, path, parsed_data.get('data', {})))
+
+                if len(batch) >= options['batch_size']:
+                    self._write_batch(batch)
+                    batch = []
+                    self._report(processed, len(pending))
 
+            if batch:
+                self._write_batch(batch)
+        self._save_manifest()
+
+        elapsed = time.perf_counter() - self.start
         # Résumé final
         self.stdout.write('\n' + '='*50)
         self.stdout.write('📊 RÉSUMÉ:')
-        self.stdout.write(f'✅ Candidats créés avec succès: {success_count}')
-        self.stdout.write(f'❌ Erreurs: {error_count}')
-        self.stdout.write(f'📁 Total de CVs traités: {len(pdf_files)}')
-        
-        if dry_run:
-            self.stdout.write(
-                self.style.WARNING('🧪 Mode test - Aucun candidat réel n\'a été créé')
-            )
+        self.stdout.write(f"✅ Candidats créés avec succès: {self.counts['created']}")
+        self.stdout.write(f"⛔ Documents rejetés: {self.counts['rejected']}")
+        self.stdout.write(f"❌ Erreurs: {self.counts['error']}")
+        self.stdout.write(f'📁 Total de CVs traités: {processed}')
+        self.stdout.write(
+            f'⚡ Débit: {processed / elapsed * 60 if elapsed else 0:.1f} CVs/min '
+            f"({self.counts['created'] / elapsed * 60 if elapsed else 0:.1f} candidats créés/min, {elapsed:.1f}s)"
+        )
+        stats = get_cache_stats()
+        self.stdout.write(
+            f"🗃️ Cache de parsing: {stats['hits']} succès / {stats['misses']} échecs "
+            f"(taux {stats['hit_rate']}), {stats['entries']} entrées"
+        )
+        extraction = get_extraction_stats()
+        self.stdout.write(
+            f"📄 Extraction PDF: {extraction['extractions']} documents, {extraction['pages']} pages lues, "
+            f"{extraction['truncated']} tronqués, {extraction['mean_seconds']} s en moyenne"
+        )
+        prefilter = get_prefilter_stats()
+        self.stdout.write(
+            f"🚦 Pré-classification: {prefilter['rejected']} documents rejetés sans appel OpenAI "
+            f"sur {prefilter['total']} analysés"
+        )
+        llm = get_gateway_metrics()
+        self.stdout.write(
+            f"🤖 Appels LLM: {llm['calls']} ({llm['retries']} nouvelles tentatives, {llm['coalesced']} regroupés), "
+            f"{llm['prompt_tokens'] + llm['completion_tokens']} tokens, latence p50 {llm.get('p50_ms')} ms / p95 {llm.get('p95_ms')} ms"
+        )
+        self.stdout.write(f'📝 Manifeste de reprise: {self.manifest_path}')
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _save_manifest(self):
+        """Écriture atomique : une interruption laisse le manifeste précédent intact."""
+        tmp_path = f'{self.manifest_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _skip_existing(self, pending):
+        """Fichiers dont le compte existe déjà (import précédent sans manifeste) : marqués et ignorés."""
+        existing = set()
+        emails = [email for email, _, _ in pending]
+        for start in range(0, len(emails), 1000):
+            existing.update(User.objects.filter(email__in=emails[start:start + 1000]).values_list('email', flat=True))
+        for email, pdf_file, _ in pending:
+            if email in existing:
+                self.manifest[pdf_file] = {"status": "exists", "email": email}
+                self.stdout.write(
+                    self.style.WARNING(f'⚠️  Le candidat {email} existe déjà, passage au suivant')
+                )
+        return [item for item in pending if item[0] not in existing]
+
+    def _report(self, processed, total):
+        elapsed = time.perf_counter() - self.start
+        rate = processed / elapsed * 60 if elapsed else 0
+        self.stdout.write(
+            f"⏱️ {processed}/{total} CVs traités, {self.counts['created']} candidats créés — {rate:.1f} CVs/min"
+        )
+
+    def _write_batch(self, batch):
+        """
+        Crée les comptes, profils et lignes de profil d'un lot par bulk_create dans une seule transaction,
+        puis marque les candidats pour le calcul de leurs embeddings (bulk_create ne déclenche pas les signaux).
+        En cas d'échec, tout le lot est noté en erreur dans le manifeste et sera retenté.
+        """
+        try:
+            with transaction.atomic(), suspend_dirty_tracking():
+                candidate_ids = self._create_candidates(batch)
+        except Exception as e:
+            for _, pdf_file, _, _ in batch:
+                self.manifest[pdf_file] = {"status": "error", "error": f"💥 Erreur d'écriture : {str(e)}"}
+            self.counts['error'] += len(batch)
+            self.stdout.write(self.style.ERROR(f'❌ Échec de l\'écriture d\'un lot de {len(batch)} candidats: {str(e)}'))
+        else:
+            mark_dirty('candidate', candidate_ids)
+            for email, pdf_file, _, _ in batch:
+                self.manifest[pdf_file] = {"status": "created", "email": email}
+            self.counts['created'] += len(batch)
+            self.stdout.write(self.style.SUCCESS(f'✅ Lot de {len(batch)} candidats créé'))
+        self._save_manifest()
+
+    def _create_candidates(self, batch):
+        emails = [email for email, _, _, _ in batch]
+        users = User.objects.bulk_create([
+            User(email=email, password=self.hashed_password, role='candidate', is_active=True)
+            for email in emails
+        ])
+        if any(user.pk is None for user in users):
+            # Bases ne renvoyant pas les clés primaires insérées (MySQL)
+            users_by_email = User.objects.in_bulk(emails, field_name='email')
+            users = [users_by_email[email] for email in emails]
+
+        candidates = []
+        for user, (email, pdf_file, path, cv_data) in zip(users, batch):
+            # Enregistrer le CV dans le stockage des médias (adressé par contenu)
+            with open(path, 'rb') as cv_file:
+                cv_name = store_cv(cv_file)
+            candidates.append(Candidate(
+                user=user,
+                first_name=_cut(cv_data.get('first_name')),
+                last_name=_cut(cv_data.get('last_name')),
+                title=_cut(cv_data.get('title'), 20),
+                phone=_cut(cv_data.get('phone'), 20),
+                bio=f"Profil généré automatiquement à partir du CV {pdf_file}",
+                cv_file=cv_name,
+            ))
+        Candidate.objects.bulk_create(candidates)
+
+        languages = self._get_languages(batch)
+        experiences, educations, skills, candidate_languages = [], [], [], []
+        for candidate, (_, _, _, cv_data) in zip(candidates, batch):
+            for exp_data in cv_data.get('experiences') or []:
+                experiences.append(Experience(
+                    candidate=candidate,
+                    job_title=_cut(exp_data.get('job_title')),
+                    company=_cut(exp_data.get('company')),
+                    description=exp_data.get('description') or '',
+                    start_date=self._clean_date(exp_data.get('start_date')),
+                    end_date=self._clean_date(exp_data.get('end_date')),
+                ))
+            for edu_data in cv_data.get('educations') or []:
+                educations.append(Education(
+                    candidate=candidate,
+                    degree=_cut(edu_data.get('degree')),
+                    institution=_cut(edu_data.get('institution')),
+                    start_date=self._clean_date(edu_data.get('start_date')),
+                    end_date=self._clean_date(edu_data.get('end_date')),
+                ))
+            for skill_name in cv_data.get('skills') or []:
+                if isinstance(skill_name, str) and skill_name.strip():  # Ignorer les compétences vides
+                    skills.append(Skill(candidate=candidate, name=_cut(skill_name.strip())))
+            # Une seule ligne par langue et par candidat (unique_together)
+            seen_languages = set()
+            for lang_data in cv_data.get('languages') or []:
+                lang_name = _cut((lang_data.get('name') or '').strip())
+                if lang_name and lang_name not in seen_languages:
+                    seen_languages.add(lang_name)
+                    candidate_languages.append(CandidateLanguage(
+                        candidate=candidate,
+                        language=languages[lang_name],
+                        level=_cut(lang_data.get('level')),
+                    ))
+
+        Experience.objects.bulk_create(experiences, batch_size=1000)
+        Education.objects.bulk_create(educations, batch_size=1000)
+        Skill.objects.bulk_create(skills, batch_size=1000)
+        CandidateLanguage.objects.bulk_create(candidate_languages, batch_size=1000)
+        return [candidate.pk for candidate in candidates]
+
+    def _get_languages(self, batch):
+        """Langues citées dans le lot {nom: Language}, les nouvelles étant créées en une requête."""
+        names = {
+            _cut((lang_data.get('name') or '').strip())
+            for _, _, _, cv_data in batch
+            for lang_data in cv_data.get('languages') or []
+        }
+        names.discard('')
+        languages = Language.objects.in_bulk(names, field_name='name')
+        missing = names - set(languages)
+        if missing:
+            Language.objects.bulk_create([Language(name=name) for name in missing], ignore_conflicts=True)
+            languages = Language.objects.in_bulk(names, field_name='name')
+        return languages
 
     def _clean_date(self, date_str):
         """Nettoie une date et retourne None si elle n'est pas valide"""
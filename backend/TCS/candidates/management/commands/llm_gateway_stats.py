@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from candidates.services.llm_gateway import get_gateway_metrics, reset_gateway_metrics
+
+
+class Command(BaseCommand):
+    help = 'Affiche les métriques de la passerelle LLM (appels, tokens, latence, nouvelles tentatives)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Remettre à zéro les compteurs après affichage'
+        )
+
+    def handle(self, *args, **options):
+        metrics = get_gateway_metrics()
+        self.stdout.write('📊 Passerelle LLM :')
+        self.stdout.write(f"  🤖 Appels : {metrics['calls']}")
+        self.stdout.write(f"  🔗 Requêtes regroupées : {metrics['coalesced']}")
+        self.stdout.write(f"  🔁 Nouvelles tentatives : {metrics['retries']}")
+        self.stdout.write(f"  ❌ Échecs : {metrics['failures']}")
+        self.stdout.write(f"  🧮 Tokens : {metrics['prompt_tokens']} prompt + {metrics['completion_tokens']} réponse")
+        self.stdout.write(
+            f"  ⏱️ Latence moyenne : {metrics['mean_latency_ms'] if metrics['mean_latency_ms'] is not None else '-'} ms"
+        )
+
+        if options['reset']:
+            reset_gateway_metrics()
+            self.stdout.write('🔄 Compteurs remis à zéro')
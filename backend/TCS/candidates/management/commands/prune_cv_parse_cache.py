@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from candidates.services.cv_parse_cache import evict_expired, evict_overflow, get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Évince les entrées périmées ou en surnombre du cache de parsing des CVs et affiche ses statistiques'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age-days',
+            type=int,
+            help='Durée sans utilisation avant éviction (défaut: CV_PARSE_CACHE_MAX_AGE_DAYS)'
+        )
+        parser.add_argument(
+            '--max-entries',
+            type=int,
+            help="Nombre maximal d'entrées conservées (défaut: CV_PARSE_CACHE_MAX_ENTRIES)"
+        )
+        parser.add_argument(
+            '--stats-only',
+            action='store_true',
+            help='Afficher les statistiques sans rien supprimer'
+        )
+        parser.add_argument(
+            '--reset-stats',
+            action='store_true',
+            help='Remettre à zéro les compteurs de succès / échecs après affichage'
+        )
+
+    def handle(self, *args, **options):
+        if not options['stats_only']:
+            expired = evict_expired(options['max_age_days'])
+            overflow = evict_overflow(options['max_entries'])
+            self.stdout.write(self.style.SUCCESS(
+                f'🧹 {expired} entrées périmées et {overflow} entrées en surnombre supprimées'
+            ))
+
+        stats = get_cache_stats()
+        self.stdout.write('📊 Cache de parsing des CVs :')
+        self.stdout.write(f"  🗃️ Entrées : {stats['entries']}")
+        self.stdout.write(f"  ✅ Succès : {stats['hits']}")
+        self.stdout.write(f"  ❌ Échecs : {stats['misses']}")
+        self.stdout.write(f"  🎯 Taux de succès : {stats['hit_rate'] if stats['hit_rate'] is not None else '-'}")
+        self.stdout.write(f"  💸 Appels OpenAI évités (total des entrées) : {stats['saved_calls']}")
+
+        if options['reset_stats']:
+            reset_cache_stats()
+            self.stdout.write('🔄 Compteurs remis à zéro')
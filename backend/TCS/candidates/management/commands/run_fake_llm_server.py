@@ -0,0 +1,180 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from candidates.services.synthetic_profiles import (
+    COMPANIES, DEGREES, FIRST_NAMES, INSTITUTIONS, JOB_TITLES_BY_SECTOR, LANGUAGES, LAST_NAMES, LEVELS,
+    SKILLS_BY_SECTOR,
+)
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+
+
+def fake_cv_data(prompt):
+    """CV plausible et déterministe (même prompt, même réponse), au format attendu par cv_parser."""
+    rng = random.Random(hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+    sector = rng.choice(list(SKILLS_BY_SECTOR))
+    email = EMAIL_PATTERN.search(prompt)
+    return {
+        "first_name": rng.choice(FIRST_NAMES),
+        "last_name": rng.choice(LAST_NAMES),
+        "title": rng.choice(['Madame', 'Monsieur']),
+        "email": email.group(0) if email else '',
+        "phone": f"06{rng.randint(10000000, 99999999)}",
+        "linkedin": '',
+        "education_level": rng.choice(['Bac+2', 'Bac+3', 'Bac+5']),
+        "preferred_contract_type": rng.choice(['CDI', 'CDD', 'Stage', 'Alternance']),
+        "experiences": [
+            {
+                "job_title": rng.choice(JOB_TITLES_BY_SECTOR[sector]),
+                "company": rng.choice(COMPANIES),
+                "description": ", ".join(rng.sample(SKILLS_BY_SECTOR[sector], k=3)),
+                "start_date": f"{2015 + i * 3}-09-01",
+                "end_date": f"{2017 + i * 3}-08-31",
+            }
+            for i in range(rng.randint(1, 3))
+        ],
+        "educations": [{
+            "degree": rng.choice(DEGREES),
+            "institution": rng.choice(INSTITUTIONS),
+            "start_date": "2010-09-01",
+            "end_date": "2015-06-30",
+        }],
+        "skills": rng.sample(SKILLS_BY_SECTOR[sector], k=min(5, len(SKILLS_BY_SECTOR[sector]))),
+        "languages": [
+            {"name": name, "level": rng.choice(LEVELS)} for name in rng.sample(LANGUAGES, k=rng.randint(1, 2))
+        ],
+    }
+
+
+class RateWindow:
+    """Compte les requêtes de la dernière minute pour simuler la limite de débit de l'API."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.timestamps = []
+        self.lock = threading.Lock()
+
+    def allow(self):
+        if not self.limit:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            self.timestamps = [t for t in self.timestamps if now - t < 60]
+            if len(self.timestamps) >= self.limit:
+                return False
+            self.timestamps.append(now)
+            return True
+
+
+def make_handler(options, window, stdout):
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            if options['verbose']:
+                stdout.write(f"🛰️ {self.address_string()} {format % args}")
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                return
+
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+            if not window.allow() or random.random() < options['rate_limit_rate']:
+                self._send_json(
+                    429,
+                    {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                    headers={'Retry-After': '1'},
+                )
+                return
+            if random.random() < options['error_rate']:
+                self._send_json(500, {"error": {"message": "Internal error", "type": "server_error"}})
+                return
+
+            time.sleep(max(0, random.gauss(options['latency_ms'], options['jitter_ms'])) / 1000)
+
+            prompt = "\n".join(message.get('content') or '' for message in request.get('messages', []))
+            content = json.dumps({"is_cv": True, "data": fake_cv_data(prompt)}, ensure_ascii=False)
+            prompt_tokens = len(prompt) // 4
+            completion_tokens = len(content) // 4
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get('model', 'fake'),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+
+    return FakeOpenAIHandler
+
+
+class Command(BaseCommand):
+    help = (
+        "Lance un serveur local compatible OpenAI (/v1/chat/completions) renvoyant des CVs fictifs, "
+        "pour tester la chaîne de parsing hors ligne : LLM_BASE_URL=http://localhost:8001/v1"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1', help='Adresse d\'écoute (défaut: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8001, help='Port d\'écoute (défaut: 8001)')
+        parser.add_argument('--latency-ms', type=float, default=800, help='Latence moyenne des réponses (défaut: 800)')
+        parser.add_argument('--jitter-ms', type=float, default=300, help='Écart-type de la latence (défaut: 300)')
+        parser.add_argument(
+            '--requests-per-minute',
+            type=int,
+            default=0,
+            help='Limite simulée de requêtes par minute, réponses 429 au-delà (défaut: 0, sans limite)'
+        )
+        parser.add_argument(
+            '--rate-limit-rate',
+            type=float,
+            default=0.0,
+            help='Proportion de réponses 429 aléatoires (défaut: 0)'
+        )
+        parser.add_argument(
+            '--error-rate',
+            type=float,
+            default=0.0,
+            help='Proportion de réponses 500 aléatoires (défaut: 0)'
+        )
+        parser.add_argument('--verbose', action='store_true', help='Journaliser chaque requête')
+
+    def handle(self, *args, **options):
+        window = RateWindow(options['requests_per_minute'])
+        server = ThreadingHTTPServer((options['host'], options['port']), make_handler(options, window, self.stdout))
+        self.stdout.write(self.style.SUCCESS(
+            f"🛰️ Serveur LLM fictif sur http://{options['host']}:{options['port']}/v1 "
+            f"(latence {options['latency_ms']:.0f}±{options['jitter_ms']:.0f} ms)"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write('🛑 Arrêt du serveur')
+        finally:
+            server.server_close()
@@ -0,0 +1,144 @@
+import os
+import re
+import time
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from candidates.models import Candidate
+from candidates.services.cv_storage import CV_DIRECTORY, is_cv_referenced, iter_stored_cvs, store_cv
+from candidates.services.profile_snapshot import refresh_profile_snapshots
+
+# Copies temporaires laissées par l'ancien upload (NamedTemporaryFile(delete=False, suffix=".pdf")).
+# Le motif est celui de tout NamedTemporaryFile en .pdf : balayage seulement sur un dossier donné par --temp-dir.
+# Conservé volontairement avec la lecture des chemins absolus d'async_parse_cv : une tâche de l'ancien upload
+# perdue ou rejouée (file Celery, résultat en échec) laisse sa copie, que seule cette option récupère.
+TEMP_FILE_PATTERN = re.compile(r'^tmp\w{8}\.pdf$')
+CONTENT_ADDRESSED_PATTERN = re.compile(rf'^{CV_DIRECTORY}/[0-9a-f]{{2}}/[0-9a-f]{{64}}\.pdf$')
+
+
+class Command(BaseCommand):
+    help = (
+        'Récupère l\'espace des CVs : fichiers de CV plus référencés par aucun candidat '
+        '(options : copies temporaires orphelines de l\'ancien upload, '
+        'migration des anciens CVs vers le stockage adressé par contenu)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Lister ce qui serait supprimé sans rien supprimer'
+        )
+        parser.add_argument(
+            '--min-age-hours',
+            type=float,
+            default=1,
+            help='Âge minimal d\'un CV non référencé avant suppression, pour épargner un upload en cours (défaut: 1)'
+        )
+        parser.add_argument(
+            '--temp-max-age-hours',
+            type=float,
+            default=24,
+            help='Âge minimal d\'une copie temporaire avant suppression (défaut: 24)'
+        )
+        parser.add_argument(
+            '--temp-dir',
+            type=str,
+            default=None,
+            help='Dossier où balayer les copies temporaires de l\'ancien upload (tmpXXXXXXXX.pdf). '
+                 'Sans cette option, aucune copie temporaire n\'est supprimée'
+        )
+        parser.add_argument(
+            '--migrate-legacy',
+            action='store_true',
+            help='Ranger d\'abord les CVs existants sous leur adresse de contenu (les doublons sont fusionnés)'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        if dry_run:
+            self.stdout.write(self.style.WARNING('🧪 MODE TEST - Aucun fichier ne sera supprimé'))
+
+        if options['migrate_legacy']:
+            self.migrate_legacy(dry_run)
+
+        temp_dir = options['temp_dir']
+        if temp_dir:
+            temp_count, temp_bytes = self.sweep_temp_files(temp_dir, options['temp_max_age_hours'], dry_run)
+        cv_count, cv_bytes = self.sweep_unreferenced_cvs(options['min_age_hours'], dry_run)
+
+        self.stdout.write('\n📊 RÉSUMÉ:')
+        if temp_dir:
+            self.stdout.write(f'🗑️ Copies temporaires: {temp_count} ({temp_bytes / 1024 / 1024:.1f} Mo)')
+        self.stdout.write(f'🗑️ CVs non référencés: {cv_count} ({cv_bytes / 1024 / 1024:.1f} Mo)')
+
+    def migrate_legacy(self, dry_run):
+        legacy = [
+            (candidate_id, name)
+            for candidate_id, name in Candidate.objects.exclude(cv_file='').exclude(cv_file__isnull=True)
+            .values_list('pk', 'cv_file')
+            if not CONTENT_ADDRESSED_PATTERN.match(name)
+        ]
+        self.stdout.write(f'📦 {len(legacy)} CVs à ranger sous leur adresse de contenu')
+        if dry_run:
+            return
+
+        migrated = []
+        for candidate_id, name in legacy:
+            if not default_storage.exists(name):
+                self.stdout.write(self.style.WARNING(f'⚠️  Fichier introuvable pour le candidat {candidate_id}: {name}'))
+                continue
+            with default_storage.open(name, 'rb') as f:
+                new_name = store_cv(f)
+            # update() : le fichier du CV n'entre pas dans le texte des embeddings, pas de signal utile
+            Candidate.objects.filter(pk=candidate_id, cv_file=name).update(cv_file=new_name)
+            migrated.append(candidate_id)
+        # Le lien du CV figure dans le profil précalculé
+        refresh_profile_snapshots(migrated)
+        self.stdout.write(self.style.SUCCESS(f'✅ {len(migrated)} CVs rangés, les anciens fichiers sont balayés ci-dessous'))
+
+    def sweep_temp_files(self, temp_dir, max_age_hours, dry_run):
+        count = size = 0
+        limit = time.time() - max_age_hours * 3600
+        try:
+            entries = list(os.scandir(temp_dir))
+        except FileNotFoundError:
+            return count, size
+
+        for entry in entries:
+            if not entry.is_file() or not TEMP_FILE_PATTERN.match(entry.name):
+                continue
+            stat = entry.stat()
+            if stat.st_mtime > limit:
+                continue
+            count += 1
+            size += stat.st_size
+            self.stdout.write(f'🗑️ {entry.path}')
+            if not dry_run:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+        return count, size
+
+    def sweep_unreferenced_cvs(self, min_age_hours, dry_run):
+        referenced = set(
+            Candidate.objects.exclude(cv_file='').exclude(cv_file__isnull=True).values_list('cv_file', flat=True)
+        )
+        limit = timezone.now() - timedelta(hours=min_age_hours)
+        count = size = 0
+        for name in iter_stored_cvs():
+            if name in referenced or default_storage.get_modified_time(name) > limit:
+                continue
+            # Nouvelle vérification : le fichier a pu être réutilisé depuis la lecture des références
+            if is_cv_referenced(name):
+                continue
+            count += 1
+            size += default_storage.size(name)
+            self.stdout.write(f'🗑️ {name}')
+            if not dry_run:
+                default_storage.delete(name)
+        return count, size
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVParseCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(help_text='SHA-256 des octets du PDF', max_length=64)),
+                ('prompt_version', models.CharField(help_text='Version du prompt de parsing (cv_parser.PROMPT_VERSION)', max_length=20)),
+                ('result', models.JSONField(help_text='JSON retourné par le modèle {is_cv, data}')),
+                ('hits', models.PositiveIntegerField(default=0, help_text='Nombre de parsings évités grâce à cette entrée')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Cache de parsing CV',
+                'verbose_name_plural': 'Cache de parsing CV',
+                'unique_together': {('content_hash', 'prompt_version')},
+            },
+        ),
+    ]
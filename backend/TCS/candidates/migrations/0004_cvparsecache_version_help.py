@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0003_cvparsecache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cvparsecache',
+            name='prompt_version',
+            field=models.CharField(help_text='Version du prompt et du modèle de parsing (cv_parser.get_cache_version)', max_length=20),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 20:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0004_cvparsecache_version_help'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateProfileSnapshot',
+            fields=[
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile_snapshot', serialize=False, to='candidates.candidate')),
+                ('schema_version', models.PositiveSmallIntegerField(help_text="Format du document (profile_snapshot.SNAPSHOT_SCHEMA_VERSION), reconstruit s'il est dépassé")),
+                ('version', models.PositiveIntegerField(default=1, help_text='Incrémentée à chaque régénération')),
+                ('data', models.JSONField(help_text='Profil sérialisé : expériences, formations, compétences, langues')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Profil candidat précalculé',
+                'verbose_name_plural': 'Profils candidats précalculés',
+            },
+        ),
+    ]
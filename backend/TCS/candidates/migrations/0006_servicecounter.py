@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0005_candidateprofilesnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Compteur de service',
+                'verbose_name_plural': 'Compteurs de service',
+            },
+        ),
+    ]
@@ -81,6 +81,58 @@ class CandidateLanguage(models.Model):
         return f"{self.candidate.first_name} speaks {self.language.name} ({self.level})"
 
 
+class CVParseCache(models.Model):
+    """Résultat du parsing d'un CV, indexé par le contenu du PDF et la version du prompt"""
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 des octets du PDF")
+    prompt_version = models.CharField(max_length=20, help_text="Version du prompt et du modèle de parsing (cv_parser.get_cache_version)")
+    result = models.JSONField(help_text="JSON retourné par le modèle {is_cv, data}")
+    hits = models.PositiveIntegerField(default=0, help_text="Nombre de parsings évités grâce à cette entrée")
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ('content_hash', 'prompt_version')
+        verbose_name = "Cache de parsing CV"
+        verbose_name_plural = "Cache de parsing CV"
+
+    def __str__(self):
+        return f"CV {self.content_hash[:12]} (prompt {self.prompt_version})"
+
+
+class ServiceCounter(models.Model):
+    """Compteur partagé entre processus (web, Celery, commandes) : cache de parsing, pré-classification, passerelle LLM"""
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Compteur de service"
+        verbose_name_plural = "Compteurs de service"
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+
+class CandidateProfileSnapshot(models.Model):
+    """Profil complet du candidat précalculé (format CandidateSerializer), régénéré à chaque écriture du profil"""
+    candidate = models.OneToOneField(
+        Candidate, on_delete=models.CASCADE, primary_key=True, related_name='profile_snapshot'
+    )
+    schema_version = models.PositiveSmallIntegerField(
+        help_text="Format du document (profile_snapshot.SNAPSHOT_SCHEMA_VERSION), reconstruit s'il est dépassé"
+    )
+    version = models.PositiveIntegerField(default=1, help_text="Incrémentée à chaque régénération")
+    data = models.JSONField(help_text="Profil sérialisé : expériences, formations, compétences, langues")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Profil candidat précalculé"
+        verbose_name_plural = "Profils candidats précalculés"
+
+    def __str__(self):
+        return f"Snapshot {self.candidate_id} v{self.version}"
+
+
 class CandidateForumProgress(models.Model):
     """Modèle pour stocker la progression de gamification d'un candidat dans un forum"""
     candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='forum_progress')
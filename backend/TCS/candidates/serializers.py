@@ -52,7 +52,7 @@ class CandidateLanguageSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CandidateLanguage
-        fields = ['language', 'level']
+        fields = ['id', 'language', 'level']
 
 
 class CandidateSerializer(serializers.ModelSerializer):
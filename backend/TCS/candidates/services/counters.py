@@ -0,0 +1,32 @@
+"""
+Compteurs de service stockés en base (ServiceCounter) : incrémentés par les processus web et Celery,
+lus par les commandes de statistiques, quel que soit le backend de cache configuré.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from candidates.models import ServiceCounter
+
+
+def increment_counter(name, amount=1):
+    """Ajoute `amount` au compteur `name` (créé au besoin), par une mise à jour atomique en base."""
+    if not amount:
+        return
+    if ServiceCounter.objects.filter(name=name).update(value=F('value') + amount):
+        return
+    try:
+        with transaction.atomic():
+            ServiceCounter.objects.create(name=name, value=amount)
+    except IntegrityError:
+        # Créé entre-temps par un autre processus
+        ServiceCounter.objects.filter(name=name).update(value=F('value') + amount)
+
+
+def get_counters(names):
+    """Retourne {nom: valeur} des compteurs `names` (0 pour un compteur jamais incrémenté)."""
+    values = dict(ServiceCounter.objects.filter(name__in=names).values_list('name', 'value'))
+    return {name: values.get(name, 0) for name in names}
+
+
+def reset_counters(names):
+    ServiceCounter.objects.filter(name__in=names).delete()
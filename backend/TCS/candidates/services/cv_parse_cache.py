@@ -0,0 +1,84 @@
+"""
+Cache des CVs parsés : un PDF déjà analysé (mêmes octets, même version du prompt) est servi
+depuis la base sans nouvel appel à OpenAI (ré-uploads, relance de generate_candidates_from_cvs).
+Les entrées les moins récemment utilisées sont évincées au-delà de CV_PARSE_CACHE_MAX_ENTRIES,
+celles inutilisées depuis CV_PARSE_CACHE_MAX_AGE_DAYS par `prune_cv_parse_cache`.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from candidates.models import CVParseCache
+from candidates.services.counters import get_counters, increment_counter, reset_counters
+
+HITS_COUNTER = 'cv_parse_cache:hits'
+MISSES_COUNTER = 'cv_parse_cache:misses'
+
+
+def hash_pdf(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_cached_parse(content_hash, prompt_version):
+    """Retourne le JSON parsé du PDF s'il est en cache (et compte le succès), sinon None."""
+    entry = CVParseCache.objects.filter(
+        content_hash=content_hash, prompt_version=prompt_version
+    ).only('pk', 'result').first()
+    if entry is None:
+        increment_counter(MISSES_COUNTER)
+        return None
+
+    CVParseCache.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    increment_counter(HITS_COUNTER)
+    return entry.result
+
+
+def store_parse(content_hash, prompt_version, result):
+    """Enregistre le résultat d'un parsing puis évince les entrées en surnombre."""
+    CVParseCache.objects.update_or_create(
+        content_hash=content_hash,
+        prompt_version=prompt_version,
+        defaults={"result": result, "last_used_at": timezone.now()},
+    )
+    evict_overflow()
+
+
+def evict_overflow(max_entries=None):
+    """Supprime les entrées les moins récemment utilisées au-delà de `max_entries`. Retourne le nombre supprimé."""
+    max_entries = settings.CV_PARSE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    overflow = CVParseCache.objects.count() - max_entries
+    if overflow <= 0:
+        return 0
+    stale_ids = list(CVParseCache.objects.order_by('last_used_at').values_list('pk', flat=True)[:overflow])
+    return CVParseCache.objects.filter(pk__in=stale_ids).delete()[0]
+
+
+def evict_expired(max_age_days=None):
+    """Supprime les entrées inutilisées depuis `max_age_days` jours. Retourne le nombre supprimé."""
+    max_age_days = settings.CV_PARSE_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    limit = timezone.now() - timedelta(days=max_age_days)
+    return CVParseCache.objects.filter(last_used_at__lt=limit).delete()[0]
+
+
+def get_cache_stats():
+    """
+    Statistiques du cache : nombre d'entrées, succès / échecs de recherche depuis la dernière remise
+    à zéro des compteurs (ServiceCounter) et taux de succès, total des parsings évités enregistré sur les entrées.
+    """
+    counters = get_counters([HITS_COUNTER, MISSES_COUNTER])
+    hits, misses = counters[HITS_COUNTER], counters[MISSES_COUNTER]
+    lookups = hits + misses
+    return {
+        "entries": CVParseCache.objects.count(),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 3) if lookups else None,
+        "saved_calls": CVParseCache.objects.aggregate(total=Sum('hits'))['total'] or 0,
+    }
+
+
+def reset_cache_stats():
+    reset_counters([HITS_COUNTER, MISSES_COUNTER])
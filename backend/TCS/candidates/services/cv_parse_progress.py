@@ -0,0 +1,57 @@
+"""
+Progression du parsing d'un CV poussée sur le WebSocket des notifications (groupe notifications_<user_id>,
+NotificationConsumer.cv_parse_progress) : le frontend n'interroge plus task_status en boucle
+quand la couche de canaux est partagée entre processus (Redis), cf. progress_pushed.
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+logger = logging.getLogger(__name__)
+
+# Étapes dans l'ordre, avec leur pourcentage d'avancement
+STAGES = {
+    'uploaded': 10,
+    'text_extracted': 40,
+    'parsed': 80,
+    'completed': 100,
+}
+
+
+def progress_pushed():
+    """
+    Vrai si la progression envoyée par les workers Celery atteint le serveur WebSocket :
+    InMemoryChannelLayer (sans Redis) est propre au processus, le frontend doit alors interroger task_status.
+    """
+    from channels.layers import InMemoryChannelLayer
+
+    try:
+        channel_layer = get_channel_layer()
+    except Exception:
+        return False
+    return channel_layer is not None and not isinstance(channel_layer, InMemoryChannelLayer)
+
+
+def send_cv_parse_progress(user_id, task_id, stage, result=None):
+    """
+    Envoie une étape du parsing à l'utilisateur. L'étape finale ('completed' ou 'failed')
+    porte le résultat de la tâche ({is_cv, data} ou {is_cv: false, error}).
+    """
+    if not user_id:
+        return
+    event = {
+        'type': 'cv_parse_progress',
+        'task_id': task_id,
+        'stage': stage,
+        'progress': STAGES.get(stage, 100),
+    }
+    if result is not None:
+        event['result'] = result
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer:
+            async_to_sync(channel_layer.group_send)(f'notifications_{user_id}', event)
+    except Exception as e:
+        # Ne pas bloquer le parsing si le WebSocket échoue : task_status reste disponible
+        logger.error(f"❌ Erreur lors de l'envoi de la progression du CV: {str(e)}")
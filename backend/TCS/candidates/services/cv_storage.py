@@ -0,0 +1,108 @@
+"""
+Stockage des CVs adressé par contenu : un fichier est rangé sous cvs/<sha256[:2]>/<sha256>.pdf,
+deux dépôts identiques partagent donc le même fichier (et la même entrée du cache de parsing).
+Le parsing lit directement le fichier stocké, projeté en mémoire quand le stockage est local.
+Les fichiers plus référencés par aucun candidat sont récupérés par `sweep_cv_storage`.
+"""
+import hashlib
+import mmap
+import os
+from contextlib import contextmanager
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+CV_DIRECTORY = 'cvs'
+
+
+def hash_cv_file(file):
+    """SHA-256 du contenu d'un fichier (upload Django ou fichier binaire), lu par morceaux."""
+    file = file if isinstance(file, File) else File(file)
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def cv_storage_name(content_hash):
+    return f"{CV_DIRECTORY}/{content_hash[:2]}/{content_hash}.pdf"
+
+
+def store_cv(file):
+    """Enregistre un CV sous son adresse de contenu s'il n'y est pas déjà. Retourne le nom de stockage."""
+    name = cv_storage_name(hash_cv_file(file))
+    if not default_storage.exists(name):
+        # Deux dépôts simultanés du même fichier : le stockage renomme le second, qui reste valide
+        return default_storage.save(name, file if isinstance(file, File) else File(file))
+
+    # Fichier réutilisé : rajeuni pour que le balayage ne le supprime pas avant l'enregistrement du candidat
+    try:
+        os.utime(default_storage.path(name))
+    except (NotImplementedError, FileNotFoundError):
+        pass
+    return name
+
+
+def assign_cv(candidate, file):
+    """Associe le CV au candidat. L'ancien fichier est laissé au balayage (il peut être partagé)."""
+    from candidates.services.profile_snapshot import refresh_profile_snapshot
+
+    candidate.cv_file.name = store_cv(file)
+    candidate.save()
+    refresh_profile_snapshot(candidate)
+    return candidate.cv_file.name
+
+
+@contextmanager
+def open_cv(name):
+    """
+    Contenu d'un CV stocké, sans copie intermédiaire : projection en mémoire (mmap, qui se lit aussi
+    comme un fichier) pour un stockage local, octets lus depuis le stockage sinon.
+    """
+    try:
+        path = default_storage.path(name)
+    except NotImplementedError:
+        path = None
+
+    if path is None:
+        with default_storage.open(name, 'rb') as f:
+            yield f.read()
+        return
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+
+def is_cv_referenced(name, exclude_candidate_id=None):
+    from candidates.models import Candidate
+
+    candidates = Candidate.objects.filter(cv_file=name)
+    if exclude_candidate_id is not None:
+        candidates = candidates.exclude(pk=exclude_candidate_id)
+    return candidates.exists()
+
+
+def release_cv(candidate):
+    """Détache le CV du candidat (sans sauvegarder) et supprime le fichier si plus aucun autre candidat ne le partage."""
+    name = candidate.cv_file.name
+    candidate.cv_file = None
+    if name and not is_cv_referenced(name, exclude_candidate_id=candidate.pk):
+        default_storage.delete(name)
+
+
+def iter_stored_cvs(directory=CV_DIRECTORY):
+    """Noms de tous les fichiers stockés sous `directory`, sous-dossiers compris."""
+    try:
+        directories, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for file_name in files:
+        yield f"{directory}/{file_name}"
+    for sub_directory in directories:
+        yield from iter_stored_cvs(f"{directory}/{sub_directory}")
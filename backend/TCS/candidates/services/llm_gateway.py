@@ -0,0 +1,245 @@
+"""
+Passerelle partagée vers l'API OpenAI (ou un serveur compatible, cf. `run_fake_llm_server`) :
+- limiteurs à seau de jetons sur les requêtes et les tokens par minute
+- concurrence bornée (sémaphore)
+- nouvelles tentatives avec backoff exponentiel (429, 5xx, timeouts, erreurs réseau)
+- regroupement des requêtes identiques en vol : un seul appel, tous les appelants reçoivent la réponse
+- métriques par appel (latence, tokens, tentatives), agrégées en base (ServiceCounter)
+
+Les limiteurs et le regroupement sont propres au processus : avec plusieurs workers,
+LLM_REQUESTS_PER_MINUTE et LLM_TOKENS_PER_MINUTE sont à répartir entre eux.
+"""
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from openai import APIConnectionError, APITimeoutError, InternalServerError, OpenAI, RateLimitError
+
+from candidates.services.counters import get_counters, increment_counter, reset_counters
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+# Estimation grossière avant l'appel : ~4 caractères par token
+CHARS_PER_TOKEN = 4
+LATENCY_SAMPLES = 1000
+
+METRICS_COUNTER_PREFIX = 'llm_gateway:'
+METRICS_COUNTERS = [
+    'calls', 'coalesced', 'retries', 'failures', 'prompt_tokens', 'completion_tokens', 'latency_ms',
+]
+
+
+class LLMGatewayError(Exception):
+    """Appel abandonné après épuisement des nouvelles tentatives, ou erreur non récupérable."""
+
+
+class TokenBucket:
+    """Seau de `capacity` jetons rechargé de `rate` jetons par seconde ; `acquire` bloque jusqu'à disponibilité."""
+
+    def __init__(self, capacity, rate):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount=1):
+        # Une demande plus grosse que le seau attend qu'il soit plein, puis le met en négatif
+        amount = float(amount)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= min(amount, self.capacity):
+                    self.tokens -= amount
+                    return
+                wait = (min(amount, self.capacity) - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def debit(self, amount):
+        """Retire `amount` jetons sans attendre (correction après coup de l'estimation des tokens)."""
+        with self.lock:
+            self._refill()
+            self.tokens -= amount
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class LLMGateway:
+    def __init__(self, client=None, model=None, max_concurrency=None, requests_per_minute=None,
+                 tokens_per_minute=None, max_retries=None):
+        self.client = client or OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.LLM_BASE_URL or None,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            # Les nouvelles tentatives sont gérées ici, avec les limiteurs
+            max_retries=0,
+        )
+        self.model = model or settings.LLM_MODEL
+        self.max_retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+        requests_per_minute = requests_per_minute or settings.LLM_REQUESTS_PER_MINUTE
+        tokens_per_minute = tokens_per_minute or settings.LLM_TOKENS_PER_MINUTE
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.semaphore = threading.BoundedSemaphore(max_concurrency or settings.LLM_MAX_CONCURRENCY)
+        self.in_flight = {}
+        self.in_flight_lock = threading.Lock()
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def chat_completion(self, messages, model=None, temperature=0, max_tokens=None):
+        """
+        Retourne le texte de la réponse. Les appels identiques (modèle, messages, paramètres)
+        lancés pendant qu'un premier est en vol attendent et partagent sa réponse.
+        Lève LLMGatewayError si l'appel échoue définitivement.
+        """
+        request = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens is not None:
+            request["max_tokens"] = max_tokens
+        key = hashlib.sha256(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()
+
+        with self.in_flight_lock:
+            entry = self.in_flight.get(key)
+            leader = entry is None
+            if leader:
+                entry = self.in_flight[key] = _InFlight()
+
+        if not leader:
+            _count('coalesced')
+            entry.done.wait()
+            if entry.error:
+                raise entry.error
+            return entry.result
+
+        try:
+            entry.result = self._call(request)
+            return entry.result
+        except Exception as e:
+            # Toute erreur du premier appel (y compris une réponse sans contenu) est transmise aux requêtes regroupées
+            entry.error = e
+            raise
+        finally:
+            with self.in_flight_lock:
+                self.in_flight.pop(key, None)
+            entry.done.set()
+
+    def _call(self, request):
+        prompt_chars = sum(len(message.get("content") or '') for message in request["messages"])
+        estimated_tokens = prompt_chars // CHARS_PER_TOKEN + (request.get("max_tokens") or 0)
+
+        for attempt in range(self.max_retries + 1):
+            self.request_bucket.acquire()
+            self.token_bucket.acquire(estimated_tokens)
+            start = time.perf_counter()
+            try:
+                with self.semaphore:
+                    response = self.client.chat.completions.create(**request)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    _count('failures')
+                    raise LLMGatewayError(f"Échec de l'appel au modèle après {attempt + 1} tentatives : {str(e)}") from e
+                delay = _retry_delay(e, attempt)
+                _count('retries')
+                logger.warning(f"🔁 Appel LLM en échec ({type(e).__name__}), nouvelle tentative dans {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                _count('failures')
+                raise LLMGatewayError(f"Erreur de l'appel au modèle : {str(e)}") from e
+
+            latency_ms = (time.perf_counter() - start) * 1000
+            usage = getattr(response, 'usage', None)
+            prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+            completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+            if prompt_tokens + completion_tokens > estimated_tokens:
+                self.token_bucket.debit(prompt_tokens + completion_tokens - estimated_tokens)
+
+            self.latencies.append(latency_ms)
+            _count('calls')
+            _count('prompt_tokens', prompt_tokens)
+            _count('completion_tokens', completion_tokens)
+            _count('latency_ms', int(latency_ms))
+            logger.info(
+                f"🤖 Appel LLM {request['model']} : {latency_ms:.0f} ms, "
+                f"{prompt_tokens}+{completion_tokens} tokens, {attempt + 1} tentative(s)"
+            )
+            return response.choices[0].message.content.strip()
+
+    def latency_percentiles(self):
+        """Latences p50 / p95 (ms) des derniers appels du processus."""
+        samples = sorted(self.latencies)
+        if not samples:
+            return {"p50_ms": None, "p95_ms": None}
+        return {
+            "p50_ms": round(samples[len(samples) // 2], 1),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 1),
+        }
+
+
+def _retry_delay(error, attempt):
+    """Délai avant la tentative suivante : en-tête Retry-After s'il est fourni, sinon backoff exponentiel avec gigue."""
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** attempt, BACKOFF_MAX_SECONDS)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _count(name, amount=1):
+    increment_counter(METRICS_COUNTER_PREFIX + name, amount)
+
+
+def get_gateway_metrics():
+    """
+    Appels, requêtes regroupées, nouvelles tentatives, échecs, tokens consommés et latence moyenne,
+    tous processus confondus (ServiceCounter). Les percentiles de latence ne couvrent que le processus courant.
+    """
+    values = get_counters([METRICS_COUNTER_PREFIX + name for name in METRICS_COUNTERS])
+    metrics = {name: values[METRICS_COUNTER_PREFIX + name] for name in METRICS_COUNTERS}
+    latency_ms = metrics.pop('latency_ms')
+    metrics["mean_latency_ms"] = round(latency_ms / metrics['calls'], 1) if metrics['calls'] else None
+    if _gateway is not None:
+        metrics.update(_gateway.latency_percentiles())
+    return metrics
+
+
+def reset_gateway_metrics():
+    reset_counters([METRICS_COUNTER_PREFIX + name for name in METRICS_COUNTERS])
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """Passerelle du processus, créée au premier appel (limiteurs et regroupement partagés par tous les threads)."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+    return _gateway
@@ -1,6 +1,6 @@
 from rest_framework.response import Response
 from rest_framework import status
-from candidates.serializers import CandidateSerializer
+from candidates.services.profile_snapshot import get_profile_snapshot
 
 
 def update_base_info(candidate, data):
@@ -21,10 +21,9 @@ def get_candidate_profile(user):
     """
     Retourne le profil complet du candidat connecté.
     """
-    try:
-        candidate = user.candidate_profile
-    except AttributeError:
+    # Le candidat a pour clé primaire son utilisateur : une seule ligne lue
+    profile = get_profile_snapshot(user.pk)
+    if profile is None:
         return Response({"detail": "Candidate profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = CandidateSerializer(candidate)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return Response(profile, status=status.HTTP_200_OK)
@@ -1,13 +1,22 @@
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
 
 from .base_info import update_base_info
-from .skill import update_skills
-from .education import update_educations
-from .experience import update_experiences
-from .language import update_languages
+from .skill import diff_skills
+from .education import diff_educations
+from .experience import diff_experiences
+from .language import diff_languages
+from .upsert import upsert_profile_sections
 from users.utils import send_user_token
-from candidates.serializers import CandidateSerializer
+from candidates.services.profile_snapshot import refresh_profile_snapshot
+
+PROFILE_SECTIONS = {
+    'skills': diff_skills,
+    'educations': diff_educations,
+    'experiences': diff_experiences,
+    'candidate_languages': diff_languages,
+}
 
 
 def complete_candidate_profile(user, data):
@@ -32,11 +41,12 @@ def complete_candidate_profile(user, data):
 
     try:
         # 🔄 Mise à jour des sections
-        update_base_info(candidate, data)
-        update_skills(candidate, data)
-        update_educations(candidate, data)
-        update_experiences(candidate, data)
-        update_languages(candidate, data)
+        # Infos de base puis sections en lot, dans une seule transaction
+        with transaction.atomic():
+            update_base_info(candidate, data)
+            upsert_profile_sections(candidate, data, PROFILE_SECTIONS)
+            # 🗂️ Profil précalculé régénéré avec l'écriture
+            profile = refresh_profile_snapshot(candidate)
 
         # 📧 Envoi du mail de validation si email modifié
         new_email = data.get('email')
@@ -53,10 +63,9 @@ def complete_candidate_profile(user, data):
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         # ✅ Retour du profil mis à jour
-        serializer = CandidateSerializer(candidate)
         return Response({
             'message': "Profil candidat mis à jour avec succès.",
-            'profile': serializer.data
+            'profile': profile
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
@@ -1,39 +1,35 @@
 from candidates.models import CandidateLanguage, Language
+from .upsert import SectionChanges, diff_rows
 
 
-def create_languages(candidate, language_data):
-    """
-    Associe les nouvelles langues au candidat avec leur niveau.
-    """
-    existing = set(candidate.candidate_languages.values_list('language__name', flat=True))
-
-    for lang in language_data:
-        name = lang.get('language')
-        level = lang.get('level')
-        if name and name not in existing:
-            try:
-                language_obj = Language.objects.get(name=name)
-                CandidateLanguage.objects.create(
-                    candidate=candidate,
-                    language=language_obj,
-                    level=level
-                )
-            except Language.DoesNotExist:
-                continue  # ignore silently
-
+def _update_level(candidate_language, lang):
+    """Mise à jour du niveau si différent. Retourne True si la langue a changé."""
+    level = lang.get('level')
+    if candidate_language.level == level:
+        return False
+    candidate_language.level = level
+    return True
 
-def delete_languages(candidate, language_data):
-    """
-    Supprime les associations de langues absentes des nouvelles données.
-    """
-    incoming_names = {lang.get('language') for lang in language_data}
-    candidate.candidate_languages.exclude(language__name__in=incoming_names).delete()
 
-
-def update_languages(candidate, data):
+def diff_languages(candidate, data):
     """
-    Met à jour toutes les langues du candidat.
+    Langues à associer (avec leur niveau), à mettre à jour et à retirer.
+    Les langues inconnues du référentiel sont ignorées.
     """
     language_data = data.get('candidate_languages', [])
-    create_languages(candidate, language_data)
-    delete_languages(candidate, language_data)
+    names = {lang.get('language') for lang in language_data if lang.get('language')}
+    languages = Language.objects.in_bulk(names, field_name='name') if names else {}
+
+    return diff_rows(
+        SectionChanges(CandidateLanguage, update_fields=['level']),
+        candidate.candidate_languages.select_related('language'),
+        language_data,
+        row_key=lambda candidate_language: candidate_language.language.name,
+        data_key=lambda lang: lang.get('language') if lang.get('language') in languages else None,
+        build=lambda lang: CandidateLanguage(
+            candidate=candidate,
+            language=languages[lang.get('language')],
+            level=lang.get('level')
+        ),
+        update=_update_level,
+    )
@@ -1,29 +1,22 @@
 from candidates.models import Skill
+from .upsert import SectionChanges, diff_rows
 
 
-def update_skills(candidate, data):
+def _skill_name(entry):
+    name = entry.get('name') if isinstance(entry, dict) else entry
+    return name.strip().lower() if name and name.strip() else None
+
+
+def diff_skills(candidate, data):
     """
-    Met à jour les compétences du candidat.
+    Compétences à ajouter / supprimer.
     Clé utilisée : nom de la compétence (case insensitive)
     """
-    skills_data = data.get('skills', [])
-    incoming_names = {
-        (entry.get('name') if isinstance(entry, dict) else entry).strip().lower()
-        for entry in skills_data
-        if (entry.get('name') if isinstance(entry, dict) else entry)
-    }
-
-    existing_skills = {
-        skill.name.strip().lower(): skill
-        for skill in candidate.skills.all()
-    }
-
-    # Ajouter les nouvelles compétences
-    for name in incoming_names:
-        if name not in existing_skills:
-            Skill.objects.create(candidate=candidate, name=name)
-
-    # Supprimer les compétences absentes
-    for name, skill in existing_skills.items():
-        if name not in incoming_names:
-            skill.delete()
+    return diff_rows(
+        SectionChanges(Skill),
+        candidate.skills.all(),
+        data.get('skills', []),
+        row_key=lambda skill: skill.name.strip().lower(),
+        data_key=_skill_name,
+        build=lambda entry: Skill(candidate=candidate, name=_skill_name(entry)),
+    )
@@ -0,0 +1,91 @@
+"""
+Mise à jour groupée des sections du profil (compétences, formations, expériences, langues) :
+les ajouts, modifications et suppressions de chaque section sont calculés en mémoire,
+puis appliqués dans une seule transaction par bulk_create, bulk_update et une suppression filtrée.
+Le nombre de requêtes ne dépend pas de la taille du profil.
+"""
+from django.db import models, transaction
+
+from matching.services.dirty_queue import mark_dirty, suspend_dirty_tracking
+
+
+def to_date(value):
+    """Date reçue du frontend ('YYYY-MM-DD', vide ou None), comparable aux dates stockées."""
+    if value in (None, ''):
+        return None
+    return models.DateField().to_python(value)
+
+
+class SectionChanges:
+    """Lignes d'une section à créer, à modifier (champs `update_fields`) et à supprimer."""
+
+    def __init__(self, model, update_fields=()):
+        self.model = model
+        self.update_fields = list(update_fields)
+        self.creates = []
+        self.updates = []
+        self.delete_ids = []
+
+    def __bool__(self):
+        return bool(self.creates or self.updates or self.delete_ids)
+
+    def apply(self):
+        # Suppressions d'abord : une clé retirée puis recréée ne heurte pas une contrainte d'unicité
+        if self.delete_ids:
+            self.model.objects.filter(pk__in=self.delete_ids).delete()
+        if self.updates:
+            self.model.objects.bulk_update(self.updates, self.update_fields)
+        if self.creates:
+            self.model.objects.bulk_create(self.creates)
+
+
+def diff_rows(changes, existing_rows, incoming, row_key, data_key, build, update=None):
+    """
+    Remplit `changes` en comparant les lignes existantes aux données reçues, par clé :
+    - donnée sans ligne correspondante : `build(data)` à créer
+    - ligne correspondante : modifiée si `update(row, data)` retourne True
+    - ligne sans donnée correspondante (ou doublon d'une clé existante) : supprimée
+    Une clé `None` ignore la donnée ; seule la première donnée d'une clé est retenue.
+    """
+    existing = {}
+    for row in existing_rows:
+        key = row_key(row)
+        if key in existing:
+            changes.delete_ids.append(row.pk)
+        else:
+            existing[key] = row
+
+    seen = set()
+    for data in incoming:
+        key = data_key(data)
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+        row = existing.get(key)
+        if row is None:
+            changes.creates.append(build(data))
+        elif update is not None and update(row, data):
+            changes.updates.append(row)
+
+    changes.delete_ids.extend(row.pk for key, row in existing.items() if key not in seen)
+    return changes
+
+
+def upsert_profile_sections(candidate, data, sections):
+    """
+    Applique les sections `sections` ({nom: fonction diff(candidate, data) -> SectionChanges})
+    dans une transaction. bulk_create / bulk_update ne déclenchent pas les signaux de matching :
+    le candidat est marqué à ré-encoder une seule fois, s'il a changé.
+    Retourne les noms des sections modifiées.
+    """
+    changed = []
+    with transaction.atomic():
+        with suspend_dirty_tracking():
+            for name, diff in sections.items():
+                changes = diff(candidate, data)
+                if changes:
+                    changes.apply()
+                    changed.append(name)
+        if changed:
+            mark_dirty('candidate', [candidate.pk])
+    return changed
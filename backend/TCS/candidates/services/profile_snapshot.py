@@ -0,0 +1,182 @@
+"""
+Profil candidat précalculé : le document CandidateSerializer (expériences, formations, compétences,
+langues) est stocké par candidat et régénéré à chaque écriture du profil. Les lectures le servent
+en une seule ligne au lieu de reconstruire l'arbre depuis cinq tables.
+Un document absent ou d'un format dépassé est reconstruit à la lecture ; la dérive éventuelle
+(écriture hors des services du profil) est détectée par `check_profile_snapshots`.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from rest_framework import serializers
+
+from candidates.models import Candidate, CandidateProfileSnapshot
+
+# À incrémenter quand le format de CandidateSerializer change : les documents sont alors reconstruits
+SNAPSHOT_SCHEMA_VERSION = 1
+
+
+def _candidates_with_profile(candidate_ids):
+    return Candidate.objects.filter(pk__in=candidate_ids).select_related('user').prefetch_related(
+        'experiences', 'educations', 'skills', 'candidate_languages__language'
+    )
+
+
+def build_profile_snapshot(candidate):
+    """Document du profil tel que le renvoie CandidateSerializer, réduit à des types JSON."""
+    from candidates.serializers import CandidateSerializer
+
+    return json.loads(json.dumps(CandidateSerializer(candidate).data, cls=DjangoJSONEncoder))
+
+
+def refresh_profile_snapshots(candidate_ids):
+    """
+    Régénère le document des candidats `candidate_ids` (les identifiants sans candidat sont ignorés).
+    Nombre de requêtes constant. Retourne {candidate_id: document}.
+    """
+    candidate_ids = list(candidate_ids)
+    if not candidate_ids:
+        return {}
+
+    documents = {candidate.pk: build_profile_snapshot(candidate) for candidate in _candidates_with_profile(candidate_ids)}
+    existing = CandidateProfileSnapshot.objects.in_bulk(list(documents))
+
+    now = timezone.now()
+    to_create, to_update = [], []
+    for candidate_id, data in documents.items():
+        snapshot = existing.get(candidate_id)
+        if snapshot is None:
+            to_create.append(CandidateProfileSnapshot(
+                candidate_id=candidate_id, schema_version=SNAPSHOT_SCHEMA_VERSION, data=data
+            ))
+            continue
+        snapshot.schema_version = SNAPSHOT_SCHEMA_VERSION
+        snapshot.version += 1
+        snapshot.data = data
+        snapshot.updated_at = now
+        to_update.append(snapshot)
+
+    if to_create:
+        # ignore_conflicts : un autre processus a pu créer le document entre-temps, il est aussi à jour
+        CandidateProfileSnapshot.objects.bulk_create(to_create, ignore_conflicts=True)
+    if to_update:
+        CandidateProfileSnapshot.objects.bulk_update(to_update, ['schema_version', 'version', 'data', 'updated_at'])
+    return documents
+
+
+def refresh_profile_snapshot(candidate):
+    """Régénère le document d'un candidat après modification de son profil et le retourne."""
+    return refresh_profile_snapshots([candidate.pk]).get(candidate.pk)
+
+
+def get_profile_snapshots(candidate_ids):
+    """
+    Documents des candidats demandés, en une requête : {candidate_id: document}.
+    Les documents absents ou d'un format dépassé sont reconstruits au passage.
+    """
+    candidate_ids = set(candidate_ids)
+    if not candidate_ids:
+        return {}
+
+    documents = dict(
+        CandidateProfileSnapshot.objects.filter(
+            candidate_id__in=candidate_ids, schema_version=SNAPSHOT_SCHEMA_VERSION
+        ).values_list('candidate_id', 'data')
+    )
+    missing = candidate_ids - documents.keys()
+    if missing:
+        documents.update(refresh_profile_snapshots(missing))
+    return documents
+
+
+def get_profile_snapshot(candidate_id):
+    """Document d'un candidat, None si le candidat n'existe pas."""
+    return get_profile_snapshots([candidate_id]).get(candidate_id)
+
+
+def find_drifted_snapshots(candidate_ids=None, batch_size=500):
+    """
+    Compare les documents stockés au profil reconstruit depuis les tables, par lots.
+    Génère les identifiants des candidats dont le document est absent, dépassé ou différent.
+    """
+    candidates = Candidate.objects.order_by('pk').values_list('pk', flat=True)
+    if candidate_ids is not None:
+        candidates = candidates.filter(pk__in=candidate_ids)
+    candidate_ids = list(candidates)
+
+    for start in range(0, len(candidate_ids), batch_size):
+        batch = candidate_ids[start:start + batch_size]
+        stored = {
+            snapshot.candidate_id: snapshot
+            for snapshot in CandidateProfileSnapshot.objects.filter(candidate_id__in=batch)
+        }
+        for candidate in _candidates_with_profile(batch):
+            snapshot = stored.get(candidate.pk)
+            if (
+                snapshot is None
+                or snapshot.schema_version != SNAPSHOT_SCHEMA_VERSION
+                or snapshot.data != build_profile_snapshot(candidate)
+            ):
+                yield candidate.pk
+
+
+def get_forum_searches(pairs):
+    """
+    Recherches (CandidateSearch) des inscriptions `pairs` [(forum_id, candidate_id)], en une requête :
+    {(forum_id, candidate_id): recherche ou None}. Les recherches dépendent du forum, elles ne font pas
+    partie du document du profil.
+    """
+    from forums.models import ForumRegistration
+
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    registrations = ForumRegistration.objects.filter(
+        forum_id__in={forum_id for forum_id, _ in pairs},
+        candidate_id__in={candidate_id for _, candidate_id in pairs},
+    ).select_related('search')
+    return {
+        (registration.forum_id, registration.candidate_id): registration.search
+        for registration in registrations
+        if (registration.forum_id, registration.candidate_id) in pairs
+    }
+
+
+class ProfileSnapshotListSerializer(serializers.ListSerializer):
+    """
+    Liste d'objets liés à un candidat (attribut `candidate_id`) : les documents de toute la liste
+    sont chargés en une requête avant la sérialisation, l'élément les lit via `snapshot_for`.
+    Les recherches des inscriptions (objets avec `forum_id`) sont chargées pour toute la liste
+    au premier appel de `forum_search_for`.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.items = items
+        self.profile_snapshots = get_profile_snapshots(item.candidate_id for item in items if item.candidate_id)
+        return super().to_representation(items)
+
+    def get_forum_searches(self):
+        if not hasattr(self, 'forum_searches'):
+            self.forum_searches = get_forum_searches(
+                (item.forum_id, item.candidate_id) for item in self.items if item.forum_id and item.candidate_id
+            )
+        return self.forum_searches
+
+
+def snapshot_for(serializer, candidate_id):
+    """Document d'un candidat pour `serializer`, préchargé par ProfileSnapshotListSerializer si possible."""
+    snapshots = getattr(serializer.parent, 'profile_snapshots', None)
+    if snapshots is None:
+        return get_profile_snapshot(candidate_id)
+    return snapshots.get(candidate_id)
+
+
+def forum_search_for(serializer, forum_id, candidate_id):
+    """Recherche de l'inscription du candidat au forum, préchargée par ProfileSnapshotListSerializer si possible."""
+    parent = serializer.parent
+    if isinstance(parent, ProfileSnapshotListSerializer) and hasattr(parent, 'items'):
+        return parent.get_forum_searches().get((forum_id, candidate_id))
+    return get_forum_searches([(forum_id, candidate_id)]).get((forum_id, candidate_id))
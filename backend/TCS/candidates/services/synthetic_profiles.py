@@ -0,0 +1,42 @@
+"""
+Vocabulaire des profils candidats synthétiques (secteurs, compétences, postes, entreprises, formations,
+langues, noms) : partagé par les forums de benchmark du matching (matching.services.synthetic_forum)
+et le faux serveur LLM (run_fake_llm_server).
+"""
+
+SKILLS_BY_SECTOR = {
+    'IT': ['Python', 'Django', 'React', 'TypeScript', 'Java', 'Spring Boot', 'SQL', 'PostgreSQL', 'Docker',
+           'Kubernetes', 'AWS', 'Terraform', 'Go', 'C++', 'Git', 'CI/CD', 'Linux', 'Kafka', 'Spark', 'Machine Learning'],
+    'Marketing': ['SEO', 'SEA', 'Google Analytics', 'Content marketing', 'Emailing', 'Réseaux sociaux',
+                  'CRM', 'Copywriting', 'A/B testing', 'Growth hacking'],
+    'Commerce': ['Prospection', 'Négociation', 'Salesforce', 'Gestion de portefeuille', 'Closing',
+                 'Relation client', 'Business development', 'Grands comptes'],
+    'RH': ['Recrutement', 'Paie', 'SIRH', 'Droit social', 'Gestion des talents', 'Formation', 'Onboarding'],
+    'Finance': ['Comptabilité', 'Contrôle de gestion', 'Excel', 'SAP', 'IFRS', 'Trésorerie', 'Audit', 'Consolidation'],
+    'Santé': ['Soins infirmiers', 'Pharmacologie', 'Gestion des urgences', 'Hygiène hospitalière', 'Dossier patient'],
+    'Logistique': ['Supply chain', 'WMS', 'Gestion des stocks', 'Transport', 'Lean', 'Approvisionnement'],
+    'BTP': ['AutoCAD', 'Conduite de travaux', 'Métré', 'Revit', 'Sécurité chantier', 'Gros œuvre'],
+}
+
+JOB_TITLES_BY_SECTOR = {
+    'IT': ['Développeur Backend', 'Développeur Full-Stack', 'Data Engineer', 'Ingénieur DevOps', 'Data Scientist',
+           'Administrateur Systèmes', 'Développeur Frontend', 'Ingénieur QA'],
+    'Marketing': ['Chargé de marketing digital', 'Responsable acquisition', 'Community manager', 'Chef de produit marketing'],
+    'Commerce': ['Commercial B2B', 'Business developer', 'Account manager', 'Ingénieur commercial'],
+    'RH': ['Chargé de recrutement', 'Gestionnaire paie', 'Responsable RH', 'Talent acquisition'],
+    'Finance': ['Comptable', 'Contrôleur de gestion', 'Analyste financier', 'Auditeur'],
+    'Santé': ['Infirmier', 'Aide-soignant', 'Pharmacien', 'Cadre de santé'],
+    'Logistique': ['Responsable logistique', 'Gestionnaire de stocks', 'Approvisionneur', 'Chef de quai'],
+    'BTP': ['Conducteur de travaux', 'Chef de chantier', 'Dessinateur projeteur', 'Ingénieur structure'],
+}
+
+COMPANIES = ['Capgemini', 'Sopra Steria', 'Airbus', 'Orange', 'Thales', 'BNP Paribas', 'Decathlon', 'SNCF',
+             'Vinci', 'Sanofi', 'Ubisoft', 'Michelin', 'Safran', 'L\'Oréal', 'Leroy Merlin', 'CHU de Toulouse']
+DEGREES = ['Master Informatique', 'Licence Gestion', 'BTS Commerce', 'DUT GEA', 'Diplôme d\'ingénieur',
+           'Master Finance', 'Licence Marketing', 'Master RH', 'BTS Logistique', 'Diplôme d\'État infirmier']
+INSTITUTIONS = ['Université Toulouse III', 'INSA Lyon', 'Sorbonne Université', 'Université de Bordeaux',
+                'IUT de Nantes', 'ESSEC', 'Université de Lille', 'École Centrale', 'Université de Strasbourg']
+LANGUAGES = ['Français', 'Anglais', 'Espagnol', 'Allemand', 'Italien']
+LEVELS = ['Beginner', 'Intermediate', 'Advanced', 'Fluent']
+FIRST_NAMES = ['Camille', 'Lucas', 'Léa', 'Hugo', 'Chloé', 'Nathan', 'Manon', 'Louis', 'Inès', 'Thomas', 'Sarah', 'Yanis']
+LAST_NAMES = ['Martin', 'Bernard', 'Dubois', 'Thomas', 'Robert', 'Petit', 'Durand', 'Leroy', 'Moreau', 'Garcia']
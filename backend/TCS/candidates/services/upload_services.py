@@ -1,6 +1,7 @@
 from rest_framework.response import Response
 from rest_framework import status
 from candidates.models import Candidate
+from candidates.services.cv_storage import assign_cv
 from candidates.utils.cv_parser import parse_uploaded_pdf
 
 
@@ -24,8 +25,7 @@ def handle_cv_upload(request):
         return Response({"error": "Candidate profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
     # 📝 Sauvegarde du fichier
-    candidate.cv_file = file
-    candidate.save()
+    assign_cv(candidate, file)
 
     # 🤖 Parsing via OpenAI
     parsed_data = parse_uploaded_pdf(file)
@@ -1,28 +1,51 @@
 from celery import shared_task
-import json
 import os
-from candidates.utils.cv_parser import read_pdf, parse_cv_with_chatgpt
+from django.core.files.storage import default_storage
+from candidates.services.cv_parse_progress import send_cv_parse_progress
+from candidates.services.cv_storage import open_cv
+from candidates.utils.cv_parser import parse_cv_bytes
 
 
-@shared_task
-def async_parse_cv(file_path):
+@shared_task(bind=True)
+def async_parse_cv(self, cv_name, user_id=None):
+    """
+    Parse un CV stocké (nom dans le stockage des médias, lu sans copie) et pousse chaque étape
+    (uploaded, text_extracted, parsed, completed / failed) sur le WebSocket des notifications
+    de l'utilisateur ; l'étape finale porte le résultat.
+    """
+    def notify(stage, result=None):
+        send_cv_parse_progress(user_id, self.request.id, stage, result)
+
     try:
-        print(f"[CELERY] Traitement du fichier : {file_path}")
+        print(f"[CELERY] Traitement du fichier : {cv_name}")
 
-        if not os.path.exists(file_path):
-            return {"error": f"Fichier introuvable : {file_path}"}
+        # Tâches mises en file avant le stockage adressé par contenu : copie temporaire à supprimer.
+        # Conservé volontairement pour les tâches rejouées ; les copies orphelines sont balayées
+        # par sweep_cv_storage --temp-dir
+        if os.path.isabs(cv_name):
+            if not os.path.exists(cv_name):
+                result = {"error": f"Fichier introuvable : {cv_name}"}
+                notify('failed', result)
+                return result
+            with open(cv_name, "rb") as f:
+                data = f.read()
+            os.remove(cv_name)
+            notify('uploaded')
+            result = parse_cv_bytes(data, on_stage=notify)
 
-        with open(file_path, "rb") as f:
-            cv_text = read_pdf(f)
+        else:
+            if not default_storage.exists(cv_name):
+                result = {"error": f"Fichier introuvable : {cv_name}"}
+                notify('failed', result)
+                return result
 
-        parsed_result = parse_cv_with_chatgpt(cv_text)
-        try:
-            return json.loads(parsed_result)
-        except json.JSONDecodeError:
-            return {
-                "error": "Échec de parsing JSON. Résultat brut retourné.",
-                "raw_result": parsed_result,
-            }
+            notify('uploaded')
+            with open_cv(cv_name) as data:
+                # PDF déjà parsé : résultat servi par le cache, sans appel à OpenAI
+                result = parse_cv_bytes(data, on_stage=notify)
 
     except Exception as e:
-        return {"error": f"Erreur interne dans la tâche Celery : {str(e)}"}
+        result = {"error": f"Erreur interne dans la tâche Celery : {str(e)}"}
+
+    notify('completed' if result.get('is_cv') else 'failed', result)
+    return result
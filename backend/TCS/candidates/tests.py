@@ -1,3 +1,73 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from candidates.models import Candidate, CandidateLanguage, Education, Experience, Language, Skill
+from candidates.services.profile.complete_profile import PROFILE_SECTIONS
+from candidates.services.profile.upsert import upsert_profile_sections
+from users.models import User
+
+LANGUAGES = [f'Langue {i}' for i in range(12)]
+# Savepoint et sa libération, lecture des lignes existantes des 4 sections et du référentiel des langues
+UPSERT_READ_QUERIES = 7
+# Plus, par section : suppression (collecte puis DELETE), création en lot, modification en lot
+# (expériences et langues), et le marquage du candidat à ré-encoder
+UPSERT_QUERIES = UPSERT_READ_QUERIES + 4 * 3 + 2 + 1
+
+
+class UpsertProfileSectionsQueryCountTests(TestCase):
+    """La mise à jour des sections du profil se fait en un nombre fixe de requêtes, quel que soit leur nombre de lignes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Language.objects.bulk_create([Language(name=name) for name in LANGUAGES])
+        cls.small = cls.create_candidate('petit@test.fr', rows=1)
+        cls.large = cls.create_candidate('grand@test.fr', rows=10)
+
+    @classmethod
+    def create_candidate(cls, email, rows):
+        """`rows` lignes par section, plus une ligne (d'indice 0) que la mise à jour retire"""
+        user = User.objects.create_user(email, 'password', role='candidate')
+        candidate = Candidate.objects.create(user=user, first_name='Jean', last_name='Dupont')
+        languages = Language.objects.in_bulk(LANGUAGES, field_name='name')
+        for i in range(rows + 1):
+            Skill.objects.create(candidate=candidate, name=f'compétence {i}')
+            Education.objects.create(candidate=candidate, degree=f'Diplôme {i}', institution='Université')
+            Experience.objects.create(
+                candidate=candidate, job_title=f'Poste {i}', company='Entreprise', start_date=date(2020, 1, 1)
+            )
+            CandidateLanguage.objects.create(candidate=candidate, language=languages[LANGUAGES[i]], level='B1')
+        return candidate
+
+    @staticmethod
+    def profile_data(rows):
+        """Ligne 0 de chaque section retirée, les `rows` suivantes gardées (dates, niveau modifiés), une ligne ajoutée"""
+        kept = range(1, rows + 2)
+        return {
+            'skills': [{'name': f'compétence {i}'} for i in kept],
+            'educations': [{'degree': f'Diplôme {i}', 'institution': 'Université'} for i in kept],
+            'experiences': [
+                {'job_title': f'Poste {i}', 'company': 'Entreprise', 'start_date': '2021-06-01'} for i in kept
+            ],
+            'candidate_languages': [{'language': LANGUAGES[i], 'level': 'C1'} for i in kept],
+        }
+
+    def upsert(self, candidate, rows):
+        return upsert_profile_sections(candidate, self.profile_data(rows), PROFILE_SECTIONS)
+
+    def test_query_count_does_not_depend_on_section_size(self):
+        for candidate, rows in ((self.small, 1), (self.large, 10)):
+            candidate = Candidate.objects.get(pk=candidate.pk)
+            with self.assertNumQueries(UPSERT_QUERIES):
+                changed = self.upsert(candidate, rows)
+            self.assertEqual(changed, list(PROFILE_SECTIONS))
+            self.assertEqual(candidate.skills.count(), rows + 1)
+            self.assertFalse(candidate.skills.filter(name='compétence 0').exists())
+            self.assertEqual(set(candidate.experiences.values_list('start_date', flat=True)), {date(2021, 6, 1)})
+            self.assertEqual(set(candidate.candidate_languages.values_list('level', flat=True)), {'C1'})
+
+    def test_unchanged_profile_writes_nothing(self):
+        candidate = Candidate.objects.get(pk=self.large.pk)
+        self.upsert(candidate, rows=10)
+        with self.assertNumQueries(UPSERT_READ_QUERIES):
+            self.assertEqual(self.upsert(candidate, rows=10), [])
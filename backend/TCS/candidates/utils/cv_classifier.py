@@ -0,0 +1,117 @@
+"""
+Pré-classification locale du texte extrait d'un PDF : les documents qui ne sont manifestement
+pas des CVs (factures, attestations, scans sans texte, rapports) sont rejetés sans appel à OpenAI.
+Le filtre est volontairement permissif : un document douteux est transmis au modèle.
+"""
+import re
+import unicodedata
+
+from candidates.services.counters import get_counters, increment_counter, reset_counters
+
+# PDF scanné (images seules) : quasiment aucun texte extractible
+MIN_IMAGE_TEXT_LENGTH = 40
+MIN_TEXT_LENGTH = 150
+# Au-delà, un document peu dense en rubriques de CV est un rapport / mémoire
+LONG_DOCUMENT_WORDS = 2000
+MIN_LONG_DOCUMENT_SECTION_DENSITY = 1.0
+
+SECTION_KEYWORDS = [
+    'experience', 'experiences professionnelles', 'parcours professionnel', 'work experience', 'employment',
+    'formation', 'formations', 'education', 'diplome', 'diplomes', 'etudes',
+    'competences', 'skills', 'savoir-faire', 'langues', 'languages',
+    'centres d\'interet', 'loisirs', 'interests', 'hobbies', 'certifications', 'projets', 'projects',
+    'profil', 'profile', 'summary', 'curriculum vitae', 'references', 'stage', 'stages', 'internship',
+]
+NON_CV_KEYWORDS = [
+    'facture', 'invoice', 'montant', 'total ttc', 'total ht', 'tva', 'devis', 'bon de commande',
+    'conditions generales', 'releve', 'attestation', 'certifie que', 'certificat', 'ordonnance',
+    'contrat de travail', 'avis d\'imposition', 'quittance', 'reglement', 'echeance',
+]
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+PHONE_PATTERN = re.compile(r'(?:\+\d{1,3}[\s.-]?)?\(?\d{1,4}\)?(?:[\s.-]?\d{2,4}){3,4}')
+DATE_PATTERN = re.compile(
+    r'\b(?:0?[1-9]|1[0-2])[/.-](?:19|20)\d{2}\b'
+    r'|\b(?:janv|fevr|mars|avr|mai|juin|juil|aout|sept|oct|nov|dec|jan|feb|mar|apr|may|jun|jul|aug|sep)[a-z]*\.?\s+(?:19|20)\d{2}\b'
+    r'|\b(?:19|20)\d{2}\s*[-–]\s*(?:(?:19|20)\d{2}|aujourd\'hui|present|actuel)\b'
+    r'|\b(?:19|20)\d{2}\b'
+)
+
+STATS_COUNTER_PREFIX = 'cv_prefilter:'
+STATS_OUTCOMES = ['accepted', 'image_only', 'too_short', 'non_cv_document', 'no_cv_signal', 'long_document']
+
+
+def _normalize(text):
+    """Minuscules sans accents, pour des mots-clés indépendants de la casse et de l'encodage."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def _count_keywords(text, keywords):
+    return sum(1 for keyword in keywords if re.search(rf'\b{re.escape(keyword)}\b', text))
+
+
+def extract_signals(text):
+    """Signaux bon marché calculés sur le texte extrait : longueur, rubriques de CV, motifs de contact et de dates."""
+    normalized = _normalize(text or '')
+    words = len(normalized.split())
+    section_hits = _count_keywords(normalized, SECTION_KEYWORDS)
+    return {
+        "length": len(normalized.strip()),
+        "words": words,
+        "section_keywords": section_hits,
+        # Rubriques distinctes pour 1000 mots
+        "section_density": round(section_hits * 1000 / words, 2) if words else 0.0,
+        "non_cv_keywords": _count_keywords(normalized, NON_CV_KEYWORDS),
+        "emails": len(EMAIL_PATTERN.findall(normalized)),
+        "phones": len(PHONE_PATTERN.findall(normalized)),
+        "dates": len(DATE_PATTERN.findall(normalized)),
+    }
+
+
+def classify_cv_text(text):
+    """
+    Retourne (is_plausible_cv, raison, signaux). La raison vaut 'accepted' ou le motif du rejet
+    ('image_only', 'too_short', 'non_cv_document', 'no_cv_signal', 'long_document').
+    """
+    signals = extract_signals(text)
+    has_contact = signals["emails"] > 0 or signals["phones"] > 0
+
+    if signals["length"] < MIN_IMAGE_TEXT_LENGTH:
+        reason = 'image_only'
+    elif signals["length"] < MIN_TEXT_LENGTH:
+        reason = 'too_short'
+    elif signals["non_cv_keywords"] >= 3 and signals["non_cv_keywords"] > signals["section_keywords"]:
+        reason = 'non_cv_document'
+    elif signals["section_keywords"] == 0 and not (has_contact and signals["dates"] >= 2):
+        reason = 'no_cv_signal'
+    elif signals["words"] > LONG_DOCUMENT_WORDS and signals["section_density"] < MIN_LONG_DOCUMENT_SECTION_DENSITY:
+        reason = 'long_document'
+    else:
+        reason = 'accepted'
+
+    _record_outcome(reason)
+    return reason == 'accepted', reason, signals
+
+
+def _record_outcome(reason):
+    increment_counter(STATS_COUNTER_PREFIX + reason)
+
+
+def get_prefilter_stats():
+    """Nombre de documents acceptés et rejetés par motif, taux de rejet (appels OpenAI évités)."""
+    counts = get_counters([STATS_COUNTER_PREFIX + outcome for outcome in STATS_OUTCOMES])
+    counts = {outcome: counts[STATS_COUNTER_PREFIX + outcome] for outcome in STATS_OUTCOMES}
+    total = sum(counts.values())
+    rejected = total - counts['accepted']
+    return {
+        "total": total,
+        "accepted": counts['accepted'],
+        "rejected": rejected,
+        "rejection_rate": round(rejected / total, 3) if total else None,
+        "rejected_by_reason": {outcome: count for outcome, count in counts.items() if outcome != 'accepted'},
+    }
+
+
+def reset_prefilter_stats():
+    reset_counters([STATS_COUNTER_PREFIX + outcome for outcome in STATS_OUTCOMES])
@@ -1,25 +1,27 @@
-from openai import OpenAI
-import PyPDF2
+import hashlib
+import io
 import json
 from django.conf import settings
+from candidates.services.cv_parse_cache import get_cached_parse, hash_pdf, store_parse
+from candidates.utils.cv_classifier import classify_cv_text
+from candidates.services.llm_gateway import get_gateway
+from candidates.utils.pdf_text import extract_pdf_text, record_extraction
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+# ⚠️ À incrémenter à chaque modification du prompt : invalide le cache des CVs parsés
+PROMPT_VERSION = "3"
 
-def read_pdf(file):
-    """Lit un fichier PDF et retourne le texte extrait."""
-    try:
-        reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            content = page.extract_text()
-            if content:
-                text += content + "\n"
-        return text.strip()
-    except Exception as e:
-        raise ValueError(f"Erreur de lecture du PDF : {str(e)}")
+def read_pdf(file, max_pages=None, max_chars=None):
+    """Lit un fichier PDF et retourne le texte extrait, borné à CV_PDF_MAX_PAGES pages et CV_PDF_MAX_CHARS caractères."""
+    result = extract_pdf_text(file, max_pages, max_chars)
+    record_extraction(result)
+    return result["text"]
 
 def parse_cv_with_chatgpt(cv_text):
-    """Utilise GPT pour renvoyer un JSON avec is_cv + data (si applicable)."""
+    """
+    Utilise GPT pour renvoyer un JSON avec is_cv + data (si applicable).
+    La pré-classification locale (classify_cv_text) n'écarte que les documents manifestement hors sujet :
+    le modèle reste juge des documents douteux (lettre de motivation, rapport, ...).
+    """
 
     prompt = f"""
     Tu es un assistant RH. Voici un texte extrait d’un document PDF :
@@ -73,8 +75,8 @@ def parse_cv_with_chatgpt(cv_text):
     Aucun commentaire, aucun mot ou texte autour. Juste le JSON.
     """
 
-    response = client.chat.completions.create(
-        model="gpt-4",
+    # Limitation de débit, nouvelles tentatives et regroupement des CVs identiques en vol
+    return get_gateway().chat_completion(
         messages=[
             {"role": "system", "content": "Tu es un assistant RH qui répond uniquement avec du JSON strictement valide."},
             {"role": "user", "content": prompt}
@@ -82,22 +84,55 @@ def parse_cv_with_chatgpt(cv_text):
         temperature=0
     )
 
-    return response.choices[0].message.content.strip()
+def get_cache_version():
+    """
+    Version des entrées du cache de parsing : prompt, modèle et serveur LLM
+    (les réponses d'un serveur de test ne sont jamais servies en production), et bornes de l'extraction
+    du texte (un CV parsé sur ses 6 premières pages n'est pas servi quand la borne passe à 10).
+    """
+    backend = hashlib.sha256(
+        f"{settings.LLM_MODEL}|{settings.LLM_BASE_URL}|{settings.CV_PDF_MAX_PAGES}|{settings.CV_PDF_MAX_CHARS}".encode('utf-8')
+    ).hexdigest()[:12]
+    return f"{PROMPT_VERSION}:{backend}"
 
-def parse_uploaded_pdf(file):
-    """Lit et parse un fichier PDF contenant un CV."""
-    if not file.name.lower().endswith('.pdf') or file.content_type != 'application/pdf':
-        return {
-            "is_cv": False,
-            "error": "⛔ Format invalide. Seuls les fichiers PDF sont acceptés."
-        }
+def parse_cv_bytes(data, cv_text=None, on_stage=None):
+    """
+    Parse le contenu d'un PDF, en servant depuis le cache un PDF identique déjà parsé
+    avec la même version du prompt. Seules les réponses JSON valides sont mises en cache.
+    `data` : octets du PDF ou vue projetée en mémoire (cv_storage.open_cv), lue sans copie.
+    `cv_text` : texte déjà extrait (imports en masse, extract_pdf_texts), sinon lu depuis `data`.
+    `on_stage(stage)` est appelé après l'extraction ('text_extracted') et l'analyse ('parsed').
+    """
+    notify = on_stage or (lambda stage: None)
+
+    content_hash = hash_pdf(data)
+    cached = get_cached_parse(content_hash, get_cache_version())
+    if cached is not None:
+        notify('parsed')
+        return cached
 
+    gpt_response = None
     try:
-        cv_text = read_pdf(file)
+        if cv_text is None:
+            stream = data if hasattr(data, 'seek') else io.BytesIO(data)
+            stream.seek(0)
+            cv_text = read_pdf(stream)
+        notify('text_extracted')
+
+        # 🚦 Documents manifestement hors sujet (factures, scans sans texte, ...) rejetés sans appel à OpenAI
+        is_plausible_cv, reason, _ = classify_cv_text(cv_text)
+        if not is_plausible_cv:
+            return {
+                "is_cv": False,
+                "error": "⛔ Le document ne ressemble pas à un CV.",
+                "reason": reason
+            }
+
         gpt_response = parse_cv_with_chatgpt(cv_text)
 
-        # ✅ Conversion directe (aucun nettoyage)
-        return json.loads(gpt_response)
+        # ✅ Conversion directe (aucun nettoyage) : le modèle confirme ou non qu'il s'agit d'un CV
+        result = json.loads(gpt_response)
+        notify('parsed')
 
     except json.JSONDecodeError:
         return {
@@ -111,3 +146,17 @@ def parse_uploaded_pdf(file):
             "is_cv": False,
             "error": f"💥 Erreur interne : {str(e)}"
         }
+
+    store_parse(content_hash, get_cache_version(), result)
+    return result
+
+def parse_uploaded_pdf(file):
+    """Lit et parse un fichier PDF contenant un CV."""
+    if not file.name.lower().endswith('.pdf') or file.content_type != 'application/pdf':
+        return {
+            "is_cv": False,
+            "error": "⛔ Format invalide. Seuls les fichiers PDF sont acceptés."
+        }
+
+    file.seek(0)
+    return parse_cv_bytes(file.read())
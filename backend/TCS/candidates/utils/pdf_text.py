@@ -0,0 +1,113 @@
+"""
+Extraction bornée du texte des PDFs : les pages sont lues une à une et la lecture s'arrête
+dès que le budget de pages ou de caractères est atteint (un portfolio de 40 pages n'occupe
+plus un worker ni ne produit un prompt géant). Pour les imports en masse, `extract_pdf_texts`
+répartit les documents sur un pool de processus.
+Le nombre d'extractions, de pages lues, de documents tronqués et le temps d'extraction sont
+enregistrés dans les compteurs de service (ServiceCounter) par `record_extraction`.
+"""
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+from django.conf import settings
+
+from candidates.services.counters import get_counters, increment_counter, reset_counters
+
+logger = logging.getLogger(__name__)
+
+STATS_COUNTER_PREFIX = 'pdf_text:'
+STATS_COUNTERS = ['extractions', 'pages', 'truncated', 'microseconds']
+
+
+def extract_pdf_text(file, max_pages=None, max_chars=None):
+    """
+    Lit au plus `max_pages` pages et `max_chars` caractères d'un PDF (chemin ou fichier binaire).
+    Retourne {"text", "pages", "total_pages", "truncated", "seconds"}.
+    Lève ValueError si le PDF est illisible.
+    """
+    max_pages = settings.CV_PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = settings.CV_PDF_MAX_CHARS if max_chars is None else max_chars
+
+    start = time.perf_counter()
+    try:
+        reader = PyPDF2.PdfReader(file, strict=False)
+        total_pages = len(reader.pages)
+        parts = []
+        length = 0
+        pages = 0
+        for page in reader.pages:
+            if pages >= max_pages or length >= max_chars:
+                break
+            pages += 1
+            content = page.extract_text()
+            if content:
+                parts.append(content)
+                length += len(content) + 1
+    except Exception as e:
+        raise ValueError(f"Erreur de lecture du PDF : {str(e)}")
+
+    text = "\n".join(parts).strip()
+    truncated = pages < total_pages or len(text) > max_chars
+    seconds = time.perf_counter() - start
+    logger.info(f"📄 PDF extrait : {pages}/{total_pages} pages, {min(len(text), max_chars)} caractères en {seconds:.3f}s")
+    return {
+        "text": text[:max_chars],
+        "pages": pages,
+        "total_pages": total_pages,
+        "truncated": truncated,
+        "seconds": round(seconds, 4),
+    }
+
+
+def record_extraction(result):
+    """
+    Enregistre une extraction (résultat d'extract_pdf_text) dans les compteurs de service.
+    Appelée par le processus appelant : les processus du pool d'extract_pdf_texts n'accèdent pas à la base.
+    """
+    if 'error' in result:
+        return
+    increment_counter(STATS_COUNTER_PREFIX + 'extractions')
+    increment_counter(STATS_COUNTER_PREFIX + 'pages', result['pages'])
+    increment_counter(STATS_COUNTER_PREFIX + 'truncated', int(result['truncated']))
+    increment_counter(STATS_COUNTER_PREFIX + 'microseconds', int(result['seconds'] * 1_000_000))
+
+
+def get_extraction_stats():
+    """Extractions, pages lues, documents tronqués et durée moyenne d'extraction, tous processus confondus."""
+    values = get_counters([STATS_COUNTER_PREFIX + name for name in STATS_COUNTERS])
+    stats = {name: values[STATS_COUNTER_PREFIX + name] for name in STATS_COUNTERS}
+    microseconds = stats.pop('microseconds')
+    stats["mean_seconds"] = round(microseconds / stats['extractions'] / 1_000_000, 4) if stats['extractions'] else None
+    return stats
+
+
+def reset_extraction_stats():
+    reset_counters([STATS_COUNTER_PREFIX + name for name in STATS_COUNTERS])
+
+
+def _extract_path(path, max_pages, max_chars):
+    # Exécutée dans un processus du pool : les erreurs sont renvoyées plutôt que levées
+    try:
+        return extract_pdf_text(path, max_pages, max_chars)
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+def extract_pdf_texts(paths, max_workers=None, max_pages=None, max_chars=None):
+    """
+    Extrait le texte de plusieurs PDFs (chemins) dans un pool de processus, l'analyse des pages
+    par PyPDF2 étant liée au CPU. Retourne {chemin: résultat d'extract_pdf_text ou {"error"}}.
+    """
+    max_pages = settings.CV_PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = settings.CV_PDF_MAX_CHARS if max_chars is None else max_chars
+    paths = list(paths)
+    if not paths:
+        return {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(
+            _extract_path, paths, [max_pages] * len(paths), [max_chars] * len(paths), chunksize=4
+        )
+        return dict(zip(paths, results))
@@ -5,7 +5,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.core.exceptions import ObjectDoesNotExist
 from candidates.services.public_profile import get_candidate_by_token
-from candidates.serializers import CandidateSerializer
+from candidates.services.profile_snapshot import get_profile_snapshot
 from recruiters.models import Meeting
 
 from forums.models import Forum
@@ -53,8 +53,7 @@ def public_candidate_view(request, token):
                     }, status=403)
 
                 # Si la relation existe, on peut afficher le profil
-                serializer = CandidateSerializer(candidate)
-                return Response(serializer.data)
+                return Response(get_profile_snapshot(candidate.pk))
 
             except Forum.DoesNotExist:
                 return Response({'detail': 'Forum introuvable.'}, status=404)
@@ -1,8 +1,9 @@
 from rest_framework.response import Response
 from rest_framework import status
 from candidates.models import Candidate
+from candidates.services.cv_parse_progress import progress_pushed
+from candidates.services.cv_storage import assign_cv
 from candidates.tasks import async_parse_cv
-import tempfile
 from celery.result import AsyncResult
 from rest_framework.decorators import api_view
 
@@ -24,23 +25,18 @@ def upload_cv_view(request):
     except Candidate.DoesNotExist:
         return Response({"error": "Profil candidat introuvable."}, status=status.HTTP_404_NOT_FOUND)
 
-    # Sauvegarde du fichier CV dans le modèle
-    candidate.cv_file = file
-    candidate.save()
+    # Sauvegarde du fichier CV (adressé par contenu : un fichier identique n'est stocké qu'une fois)
+    cv_name = assign_cv(candidate, file)
 
-    # Enregistrement temporaire du fichier pour le parsing async
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        for chunk in file.chunks():
-            tmp.write(chunk)
-        tmp_path = tmp.name
-
-    # Lancer la tâche asynchrone
-    task = async_parse_cv.delay(tmp_path)
+    # Lancer la tâche asynchrone sur le fichier stocké (progression poussée sur le WebSocket notifications_<user_id>)
+    task = async_parse_cv.delay(cv_name, request.user.id)
     print(">>> Task ID lancé :", task.id)
 
     return Response({
         "message": "CV reçu. L'analyse est en cours.",
-        "task_id": task.id
+        "task_id": task.id,
+        # Sans couche de canaux partagée, la progression n'arrive pas par le WebSocket : interroger task_status
+        "progress_push": progress_pushed(),
     }, status=status.HTTP_202_ACCEPTED)
 
 
@@ -48,6 +44,7 @@ def upload_cv_view(request):
 def task_status(request, task_id):
     """
     Retourne l'état de la tâche de parsing (SUCCESS, PENDING, FAILURE) et le résultat si disponible.
+    Repli du frontend quand la progression n'arrive pas par le WebSocket des notifications.
     """
     result = AsyncResult(task_id)
     return Response({
@@ -22,47 +22,45 @@ class CompanyWithRecruitersSerializer(serializers.ModelSerializer):
         model = Company
         fields = ['id','name', 'logo', 'banner', 'sectors','website', 'description', 'recruiters', 'offers', 'stand', 'approved']
 
+    # Les attributs planned_* sont posés par forums.services.forum_detail.plan_forum_details ;
+    # sans plan, chaque méthode interroge la base pour l'entreprise.
+
     def get_recruiters(self, obj):
         from recruiters.serializers import RecruiterSerializer
         forum = self.context.get('forum')
         if not forum:
             return []
-        return RecruiterSerializer(
-            obj.recruiters.filter(
+        recruiters = getattr(obj, 'planned_recruiters', None)
+        if recruiters is None:
+            recruiters = obj.recruiters.filter(
                 forum_participations__forum=forum
-            ),
-            many=True
-        ).data
+            ).select_related('company', 'user')
+        return RecruiterSerializer(recruiters, many=True).data
 
     def get_offers(self, obj):
         from recruiters.serializers import OfferSerializer
         forum = self.context.get('forum')
         if not forum:
             return []
-        offers = Offer.objects.filter(company=obj, forum=forum)
-        
-        # Debug: Vérifier les photos des recruteurs
-        for offer in offers:
-            print(f"🔍 [BACKEND] Offer {offer.id} - Recruiter {offer.recruiter.id}:")
-            print(f"  - profile_picture: {offer.recruiter.profile_picture}")
-            print(f"  - has profile_picture: {hasattr(offer.recruiter, 'profile_picture')}")
-            if hasattr(offer.recruiter, 'profile_picture') and offer.recruiter.profile_picture:
-                print(f"  - profile_picture.url: {offer.recruiter.profile_picture.url}")
-        
+        offers = getattr(obj, 'planned_offers', None)
+        if offers is None:
+            offers = Offer.objects.filter(company=obj, forum=forum).select_related(
+                'company', 'recruiter__user', 'questionnaire'
+            ).prefetch_related('questionnaire__questions')
         return OfferSerializer(offers, many=True).data
 
-    def get_stand(self, obj):
+    def _forum_company(self, obj):
         forum = self.context.get('forum')
         if not forum:
             return None
-        forum_company = obj.forum_participations.filter(forum=forum).first()
+        if hasattr(obj, 'planned_forum_company'):
+            return obj.planned_forum_company
+        return obj.forum_participations.filter(forum=forum).first()
+
+    def get_stand(self, obj):
+        forum_company = self._forum_company(obj)
         return forum_company.stand if forum_company else None
 
     def get_approved(self, obj):
-        forum = self.context.get('forum')
-        if not forum:
-            return False
-        forum_company = obj.forum_participations.filter(forum=forum).first()
+        forum_company = self._forum_company(obj)
         return forum_company.approved if forum_company else False
-
-
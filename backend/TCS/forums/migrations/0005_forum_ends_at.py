@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 21:05
+
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_ends_at(apps, schema_editor):
+    """Calcule la fin (end_date + end_time) des forums existants"""
+    Forum = apps.get_model('forums', 'Forum')
+    forums = list(Forum.objects.only('pk', 'end_date', 'end_time'))
+    for forum in forums:
+        forum.ends_at = timezone.make_aware(datetime.combine(forum.end_date, forum.end_time))
+    Forum.objects.bulk_update(forums, ['ends_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forums', '0004_programmeregistration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forum',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_ends_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='forum',
+            name='ends_at',
+            field=models.DateTimeField(db_index=True, editable=False),
+        ),
+    ]
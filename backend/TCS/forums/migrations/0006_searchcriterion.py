@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_search_criteria(apps, schema_editor):
+    """Crée les critères indexés des recherches existantes"""
+    CandidateSearch = apps.get_model('forums', 'CandidateSearch')
+    SearchCriterion = apps.get_model('forums', 'SearchCriterion')
+    rows = []
+    for search in CandidateSearch.objects.only('pk', 'contract_type', 'sector', 'region').iterator(chunk_size=2000):
+        for field in ('contract_type', 'sector'):
+            for value in dict.fromkeys(getattr(search, field) or []):
+                rows.append(SearchCriterion(search_id=search.pk, field=field, value=str(value)[:100]))
+        region = (search.region or '').strip().lower()[:100]
+        if region:
+            rows.append(SearchCriterion(search_id=search.pk, field='region', value=region))
+    SearchCriterion.objects.bulk_create(rows, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forums', '0005_forum_ends_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidatesearch',
+            name='experience',
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='SearchCriterion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('contract_type', 'Type de contrat'), ('sector', 'Secteur'), ('region', 'Région')], max_length=20)),
+                ('value', models.CharField(max_length=100)),
+                ('search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='criteria', to='forums.candidatesearch')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['field', 'value'], name='forums_sear_field_5ea09c_idx')],
+                'unique_together': {('search', 'field', 'value')},
+            },
+        ),
+        migrations.RunPython(fill_search_criteria, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,20 @@
+from datetime import datetime
+
 from django.db import models
+from django.utils import timezone
 from candidates.models import Candidate
 from organizers.models import Organizer
 from TCS.constants import FORUM_TYPE_CHOICES
 
 
 # Create your models here.
+def compute_ends_at(end_date, end_time):
+    """Date et heure de fin d'un forum, dans le fuseau du serveur (les valeurs peuvent être des chaînes)."""
+    end_date = models.DateField().to_python(end_date)
+    end_time = models.TimeField().to_python(end_time)
+    return timezone.make_aware(datetime.combine(end_date, end_time))
+
+
 class Forum(models.Model):
     name = models.CharField(max_length=255)
     type = models.CharField(max_length=20, choices=FORUM_TYPE_CHOICES)
@@ -24,8 +34,18 @@ class Forum(models.Model):
     interview_start = models.DateTimeField(null=True, blank=True, help_text="Début de la phase des entretiens")
     interview_end = models.DateTimeField(null=True, blank=True, help_text="Fin de la phase des entretiens") 
 
+    # Fin du forum (end_date + end_time), recalculée à chaque sauvegarde : filtre et tri des forums à venir en SQL
+    ends_at = models.DateTimeField(db_index=True, editable=False)
+
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        self.ends_at = compute_ends_at(self.end_date, self.end_time)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'end_date', 'end_time'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'ends_at'}
+        super().save(*args, **kwargs)
     
     def is_virtual_forum(self):
         """Vérifie si le forum est de type virtuel"""
@@ -191,9 +211,56 @@ class ForumRegistration(models.Model):
 class CandidateSearch(models.Model):
     contract_type = models.JSONField(default=list)
     sector = models.JSONField(default=list)
-    experience = models.PositiveIntegerField(null=True, blank=True)
+    experience = models.PositiveIntegerField(null=True, blank=True, db_index=True)
     region = models.CharField(max_length=100)
     rqth = models.BooleanField(default=False)
 
     def __str__(self):
-        return f"{self.contract_type}, {self.region}"
\ No newline at end of file
+        return f"{self.contract_type}, {self.region}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.criteria.all().delete()
+        SearchCriterion.objects.bulk_create(search_criteria(self))
+
+
+def search_criteria(search):
+    """
+    Lignes SearchCriterion d'une recherche : une par type de contrat, par secteur,
+    et la région normalisée. Un critère sans ligne signifie « pas de préférence ».
+    """
+    rows = [
+        SearchCriterion(search=search, field=field, value=str(value)[:100])
+        for field in ('contract_type', 'sector')
+        for value in dict.fromkeys(getattr(search, field) or [])
+    ]
+    region = normalize_region(search.region)[:100]
+    if region:
+        rows.append(SearchCriterion(search=search, field='region', value=region))
+    return rows
+
+
+def normalize_region(region):
+    return (region or '').strip().lower()
+
+
+class SearchCriterion(models.Model):
+    """Valeur d'un critère de CandidateSearch, indexée pour le pré-filtrage SQL du matching"""
+    FIELD_CHOICES = [
+        ('contract_type', 'Type de contrat'),
+        ('sector', 'Secteur'),
+        ('region', 'Région'),
+    ]
+
+    search = models.ForeignKey(CandidateSearch, on_delete=models.CASCADE, related_name='criteria')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    value = models.CharField(max_length=100)
+
+    class Meta:
+        unique_together = ('search', 'field', 'value')
+        indexes = [
+            models.Index(fields=['field', 'value']),
+        ]
+
+    def __str__(self):
+        return f"{self.field} = {self.value}"
\ No newline at end of file
@@ -1,7 +1,10 @@
+from django.db import models
 from rest_framework import serializers
 from .models import Forum, ForumRegistration, CandidateSearch, Speaker, Programme, ProgrammeRegistration
 from organizers.serializers import OrganizerSerializer
 from company.serializers import CompanyWithRecruitersSerializer
+from candidates.services.profile_snapshot import ProfileSnapshotListSerializer, snapshot_for
+from forums.services.forum_detail import plan_forum_details
 
 
 class SpeakerSerializer(serializers.ModelSerializer):
@@ -71,8 +74,11 @@ class ProgrammeSerializer(serializers.ModelSerializer):
         return None
     
     def get_participants_count(self, obj):
-        """Retourne le nombre de participants inscrits"""
-        return obj.get_participants_count()
+        """Retourne le nombre de participants inscrits (précompté par plan_forum_details si disponible)"""
+        count = getattr(obj, 'planned_participants_count', None)
+        if count is None:
+            return obj.get_participants_count()
+        return count
     
     def get_is_registered(self, obj):
         """Vérifie si l'utilisateur actuel est inscrit au programme"""
@@ -190,6 +196,14 @@ class ForumSerializer(serializers.ModelSerializer):
         return data
 
 
+class ForumDetailListSerializer(serializers.ListSerializer):
+    """Liste de forums : le plan de chargement est exécuté une seule fois pour toute la liste."""
+
+    def to_representation(self, data):
+        forums = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return super().to_representation(plan_forum_details(forums))
+
+
 class ForumDetailSerializer(serializers.ModelSerializer):
     organizer = OrganizerSerializer(read_only=True)
     companies = serializers.SerializerMethodField()
@@ -222,6 +236,12 @@ class ForumDetailSerializer(serializers.ModelSerializer):
             'phase_display',
             'is_virtual',
         ]
+        list_serializer_class = ForumDetailListSerializer
+
+    def to_representation(self, instance):
+        if not hasattr(instance, 'planned_forum_companies'):
+            plan_forum_details([instance])
+        return super().to_representation(instance)
     
     def get_current_phase(self, obj):
         return obj.get_current_phase()
@@ -301,7 +321,7 @@ class ForumDetailSerializer(serializers.ModelSerializer):
 
     def get_companies(self, obj):
         forum = obj
-        forum_companies = forum.company_participants.all()  # ForumCompany queryset
+        forum_companies = forum.planned_forum_companies  # ForumCompany préchargés par plan_forum_details
         companies = [fc.company for fc in forum_companies]
 
         return CompanyWithRecruitersSerializer(
@@ -335,7 +355,7 @@ class ForumCandidateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ForumRegistration
         fields = ['candidate', 'search']
+        list_serializer_class = ProfileSnapshotListSerializer
 
     def get_candidate(self, obj):
-        from candidates.serializers import CandidateSerializer
-        return CandidateSerializer(obj.candidate).data
+        return snapshot_for(self, obj.candidate_id)
@@ -1,12 +1,13 @@
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import Q
-from datetime import datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
 
 from forums.models import Forum
-from forums.serializers import ForumDetailSerializer
+from forums.services.forum_cache import forum_documents_response
 from candidates.models import Candidate
 
 from recruiters.models import Recruiter
@@ -17,47 +18,62 @@ from organizers.models import Organizer
 def filter_upcoming_forums(forums_queryset):
     """
     Filtre les forums pour ne garder que ceux en cours ou à venir, triés par date de fin croissante.
+    Filtre et tri se font en SQL sur ends_at (indexé).
     """
-    now = timezone.now()
-    today = now.date()
-    
-    # Filtrer d'abord par date dans la base de données
-    filtered_queryset = forums_queryset.filter(
-        Q(end_date__gt=today) | Q(end_date=today)
-    )
-    
-    # Filtrer en Python pour comparer correctement date+heure
-    forums_list = []
-    for forum in filtered_queryset:
-        forum_end_datetime = timezone.make_aware(
-            datetime.combine(forum.end_date, forum.end_time)
-        )
-        if forum_end_datetime >= now:
-            forums_list.append(forum)
-    
-    # Trier par date de fin (croissant - les plus proches en premier)
-    forums_list.sort(key=lambda f: (f.end_date, f.end_time))
-    return forums_list
-
-
-def get_candidate_forum_lists(user):
+    return forums_queryset.filter(ends_at__gte=timezone.now()).order_by('ends_at', 'pk')
+
+
+class ForumPagination(PageNumberPagination):
+    """
+    Pagination des listes de forums (?page=, ?page_size=). Le corps reste une liste :
+    le total et les pages voisines sont dans les en-têtes X-Total-Count et Link.
+    """
+    page_size = settings.FORUM_LIST_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def get_page_headers(self):
+        headers = {'X-Total-Count': str(self.page.paginator.count)}
+        links = [
+            f'<{url}>; rel="{rel}"'
+            for rel, url in (('next', self.get_next_link()), ('prev', self.get_previous_link()))
+            if url
+        ]
+        if links:
+            headers['Link'] = ', '.join(links)
+        return headers
+
+
+def paginate_forum_ids(request, forums_queryset):
+    """Identifiants des forums de la page demandée (LIMIT/OFFSET en SQL) et en-têtes de pagination."""
+    paginator = ForumPagination()
+    forum_ids = forums_queryset.values_list('pk', flat=True)
+    try:
+        page = paginator.paginate_queryset(forum_ids, request)
+    except NotFound:
+        # Page au-delà de la dernière : liste vide plutôt qu'une erreur
+        return [], {'X-Total-Count': str(forum_ids.count())}
+    return list(page), paginator.get_page_headers()
+
+
+def get_candidate_forum_lists(user, request):
     """
     Retourne les forums où le candidat est inscrit et ceux où il ne l'est pas.
-    Les forums non inscrits sont filtrés pour ne garder que ceux en cours ou à venir.
+    Les forums non inscrits sont filtrés pour ne garder que ceux en cours ou à venir, et paginés.
     """
     try:
         candidate = get_object_or_404(Candidate, user=user)
 
-        registered = Forum.objects.filter(registrations__candidate=candidate).order_by('-end_date')
+        registered = Forum.objects.filter(registrations__candidate=candidate).order_by('-ends_at')
         unregistered_queryset = Forum.objects.exclude(registrations__candidate=candidate)
         
         # Filtrer les forums non inscrits pour ne garder que ceux en cours ou à venir
-        unregistered = filter_upcoming_forums(unregistered_queryset)
+        unregistered, headers = paginate_forum_ids(request, filter_upcoming_forums(unregistered_queryset))
 
-        return Response({
-            "registered": ForumDetailSerializer(registered, many=True).data,
-            "unregistered": ForumDetailSerializer(unregistered, many=True).data,
-        }, status=status.HTTP_200_OK)
+        return forum_documents_response(request, {
+            "registered": list(registered.values_list('pk', flat=True)),
+            "unregistered": unregistered,
+        }, headers)
 
     except Exception as e:
         return Response({
@@ -66,48 +82,48 @@ def get_candidate_forum_lists(user):
 
 
 
-def get_recruiter_forum_lists(user):
+def get_recruiter_forum_lists(user, request):
     """
     Retourne les forums où le recruteur est inscrit et ceux où il ne l'est pas.
-    Les forums non inscrits sont filtrés pour ne garder que ceux en cours ou à venir.
+    Les forums non inscrits sont filtrés pour ne garder que ceux en cours ou à venir, et paginés.
     """
     try:
         recruiter = get_object_or_404(Recruiter, user=user)
 
-        registered = Forum.objects.filter(recruiter_participations__recruiter=recruiter).order_by('-end_date')
+        registered = Forum.objects.filter(recruiter_participations__recruiter=recruiter).order_by('-ends_at')
         unregistered_queryset = Forum.objects.exclude(recruiter_participations__recruiter=recruiter)
         
         # Filtrer les forums non inscrits pour ne garder que ceux en cours ou à venir
-        unregistered = filter_upcoming_forums(unregistered_queryset)
+        unregistered, headers = paginate_forum_ids(request, filter_upcoming_forums(unregistered_queryset))
 
-        return Response({
-            "registered": ForumDetailSerializer(registered, many=True).data,
-            "unregistered": ForumDetailSerializer(unregistered, many=True).data,
-        }, status=status.HTTP_200_OK)
+        return forum_documents_response(request, {
+            "registered": list(registered.values_list('pk', flat=True)),
+            "unregistered": unregistered,
+        }, headers)
 
     except Exception as e:
         return Response({
             "detail": f"Erreur lors de la récupération des forums du recruteur : {str(e)}"
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-def get_organizer_forum_lists(user):
+def get_organizer_forum_lists(user, request):
     """
     Retourne les forums organisés par l'organisateur et ceux qu'il n'a pas organisés.
-    Les forums non organisés sont filtrés pour ne garder que ceux en cours ou à venir.
+    Les forums non organisés sont filtrés pour ne garder que ceux en cours ou à venir, et paginés.
     """
     try:
         organizer = get_object_or_404(Organizer, user=user)
 
-        organized = Forum.objects.filter(organizer=organizer).order_by('-end_date')
+        organized = Forum.objects.filter(organizer=organizer).order_by('-ends_at')
         not_organized_queryset = Forum.objects.exclude(organizer=organizer)
         
         # Filtrer les forums non organisés pour ne garder que ceux en cours ou à venir
-        not_organized = filter_upcoming_forums(not_organized_queryset)
+        not_organized, headers = paginate_forum_ids(request, filter_upcoming_forums(not_organized_queryset))
 
-        return Response({
-            "organized": ForumDetailSerializer(organized, many=True).data,
-            "not_organized": ForumDetailSerializer(not_organized, many=True).data,
-        }, status=status.HTTP_200_OK)
+        return forum_documents_response(request, {
+            "organized": list(organized.values_list('pk', flat=True)),
+            "not_organized": not_organized,
+        }, headers)
 
     except Exception as e:
         return Response({
@@ -0,0 +1,140 @@
+"""
+Cache versionné des documents de forum (ForumDetailSerializer) pour le détail et les listes.
+Chaque forum a un jeton de version : le document est rangé sous forums:document:<id>:<version>,
+et les signaux (forums.signals) changent le jeton à chaque écriture qui modifie le document.
+Les réponses portent un ETag calculé sur le contenu des documents et les en-têtes de pagination : une requête If-None-Match
+correspondante reçoit un 304 sans corps, sans sérialisation.
+Le cache doit être partagé entre les processus (settings.CACHES : Redis ou fichiers) pour que le jeton
+changé par un worker ou une tâche Celery invalide le document partout.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'forums:version:{}'
+DOCUMENT_KEY = 'forums:document:{}:{}'
+# current_phase dépend de l'heure : le document expire au prochain changement de phase
+PHASE_FIELDS = ['preparation_start', 'preparation_end', 'jobdating_start', 'interview_start', 'interview_end']
+
+
+def _new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def bump_forum_versions(forum_ids):
+    """Invalide les documents des forums, une fois la transaction en cours validée."""
+    forum_ids = {forum_id for forum_id in forum_ids if forum_id}
+    if not forum_ids:
+        return
+
+    def bump():
+        cache.set_many({VERSION_KEY.format(forum_id): _new_version() for forum_id in forum_ids}, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def get_forum_versions(forum_ids):
+    """Jeton de version de chaque forum {forum_id: version}, créé au besoin."""
+    keys = {forum_id: VERSION_KEY.format(forum_id) for forum_id in forum_ids}
+    found = cache.get_many(list(keys.values()))
+    versions = {}
+    for forum_id, key in keys.items():
+        version = found.get(key)
+        if version is None:
+            # add : un autre processus a pu créer le jeton entre-temps, le sien l'emporte
+            cache.add(key, _new_version(), timeout=None)
+            version = cache.get(key)
+        versions[forum_id] = version
+    return versions
+
+
+def _document_timeout(forum, now):
+    timeout = settings.FORUM_CACHE_TIMEOUT
+    for field in PHASE_FIELDS:
+        boundary = getattr(forum, field)
+        if boundary and boundary > now:
+            timeout = min(timeout, (boundary - now).total_seconds() + 1)
+    return max(1, int(timeout))
+
+
+def get_forum_documents(forum_ids):
+    """
+    Documents des forums demandés {forum_id: {"etag", "data"}}. Seuls les documents absents du cache
+    (ou d'une version dépassée) sont sérialisés, en un seul lot. Les forums inexistants sont omis.
+    """
+    from forums.models import Forum
+    from forums.serializers import ForumDetailSerializer
+
+    forum_ids = list(dict.fromkeys(forum_ids))
+    if not forum_ids:
+        return {}
+
+    versions = get_forum_versions(forum_ids)
+    keys = {forum_id: DOCUMENT_KEY.format(forum_id, versions[forum_id]) for forum_id in forum_ids}
+    found = cache.get_many(list(keys.values()))
+    documents = {forum_id: found[key] for forum_id, key in keys.items() if key in found}
+
+    missing = [forum_id for forum_id in forum_ids if forum_id not in documents]
+    if missing:
+        forums = list(Forum.objects.filter(pk__in=missing))
+        now = timezone.now()
+        for forum, data in zip(forums, ForumDetailSerializer(forums, many=True).data):
+            data = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+            content = json.dumps(data, sort_keys=True).encode('utf-8')
+            document = {'etag': hashlib.sha1(content).hexdigest(), 'data': data}
+            cache.set(keys[forum.pk], document, timeout=_document_timeout(forum, now))
+            documents[forum.pk] = document
+    return documents
+
+
+def forum_documents_response(request, layout, headers=None):
+    """
+    Réponse construite depuis le cache des documents de forum, avec ETag :
+    - `layout` identifiant : document d'un forum (404 s'il n'existe pas)
+    - `layout` liste d'identifiants : liste de documents, dans cet ordre
+    - `layout` dict {nom: liste d'identifiants} : plusieurs listes
+    Si l'en-tête If-None-Match correspond, la réponse est un 304 sans corps.
+    `headers` s'ajoute aux en-têtes de la réponse (pagination) et entre dans l'ETag :
+    le total et les pages voisines peuvent changer sans que les documents de la page changent.
+    """
+    if isinstance(layout, dict):
+        forum_ids = [forum_id for ids in layout.values() for forum_id in ids]
+    elif isinstance(layout, (list, tuple)):
+        forum_ids = list(layout)
+    else:
+        forum_ids = [layout]
+
+    documents = get_forum_documents(forum_ids)
+
+    def resolve(pick):
+        if isinstance(layout, dict):
+            return {
+                name: [pick(forum_id) for forum_id in ids if forum_id in documents]
+                for name, ids in layout.items()
+            }
+        if isinstance(layout, (list, tuple)):
+            return [pick(forum_id) for forum_id in layout if forum_id in documents]
+        return pick(layout)
+
+    if not isinstance(layout, (dict, list, tuple)) and layout not in documents:
+        return Response({"detail": "Forum non trouvé."}, status=status.HTTP_404_NOT_FOUND)
+
+    fingerprint = json.dumps([resolve(lambda forum_id: documents[forum_id]['etag']), headers or {}], sort_keys=True)
+    etag = f'"{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()}"'
+    # no-cache : le navigateur garde la réponse mais la revalide à chaque fois (304 si inchangée)
+    headers = {**(headers or {}), 'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+    if_none_match = parse_etags(request.headers.get('If-None-Match', '')) if request else []
+    if {etag, f'W/{etag}', '*'} & set(if_none_match):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(resolve(lambda forum_id: documents[forum_id]['data']), status=status.HTTP_200_OK, headers=headers)
@@ -0,0 +1,68 @@
+"""
+Plan de chargement du détail des forums (ForumDetailSerializer) : organisateur, programmes,
+entreprises participantes, recruteurs, offres et questionnaires sont chargés en un nombre fixe
+de requêtes pour tous les forums à la fois, puis rattachés aux objets en mémoire.
+Sans ce plan, chaque entreprise déclenchait ses propres requêtes (recruteurs, offres, stand,
+validation, questionnaire de chaque offre).
+"""
+from collections import defaultdict
+
+from django.db.models import Count, Prefetch, prefetch_related_objects
+
+from forums.models import Programme
+
+
+def plan_forum_details(forums):
+    """
+    Précharge tout ce que lit ForumDetailSerializer pour `forums` et retourne la liste des forums.
+    Chaque entreprise participante (forum.planned_forum_companies[i].company) reçoit :
+    - planned_forum_company : sa ligne ForumCompany (stand, validation)
+    - planned_recruiters : ses recruteurs inscrits au forum
+    - planned_offers : ses offres du forum, questionnaire et questions compris
+    """
+    from company.models import ForumCompany
+    from recruiters.models import Offer, RecruiterForumParticipation
+
+    forums = list(forums)
+    if not forums:
+        return forums
+
+    prefetch_related_objects(
+        forums,
+        'organizer__user',
+        Prefetch(
+            'programmes',
+            queryset=Programme.objects.prefetch_related('speakers').annotate(
+                planned_participants_count=Count('registrations')
+            )
+        ),
+        Prefetch(
+            'company_participants',
+            queryset=ForumCompany.objects.select_related('company').order_by('pk'),
+            to_attr='planned_forum_companies'
+        ),
+    )
+
+    forum_ids = [forum.pk for forum in forums]
+
+    recruiters = defaultdict(list)
+    participations = RecruiterForumParticipation.objects.filter(forum_id__in=forum_ids).select_related(
+        'recruiter__company', 'recruiter__user'
+    ).order_by('recruiter_id')
+    for participation in participations:
+        recruiters[(participation.forum_id, participation.recruiter.company_id)].append(participation.recruiter)
+
+    offers = defaultdict(list)
+    forum_offers = Offer.objects.filter(forum_id__in=forum_ids).select_related(
+        'company', 'recruiter__user', 'questionnaire'
+    ).prefetch_related('questionnaire__questions').order_by('pk')
+    for offer in forum_offers:
+        offers[(offer.forum_id, offer.company_id)].append(offer)
+
+    for forum in forums:
+        for forum_company in forum.planned_forum_companies:
+            company = forum_company.company
+            company.planned_forum_company = forum_company
+            company.planned_recruiters = recruiters[(forum.pk, company.pk)]
+            company.planned_offers = offers[(forum.pk, company.pk)]
+    return forums
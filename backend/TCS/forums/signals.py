@@ -0,0 +1,81 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from company.models import Company, ForumCompany
+from forums.models import Forum, Programme, ProgrammeRegistration, Speaker
+from forums.services.forum_cache import bump_forum_versions
+from organizers.models import Organizer
+from recruiters.models import Offer, Recruiter, RecruiterForumParticipation
+from virtual.models import Question, Questionnaire
+
+# Invalidation du cache des documents de forum (forums.services.forum_cache) :
+# toute écriture visible dans ForumDetailSerializer change le jeton de version du forum concerné.
+
+
+@receiver(post_save, sender=Forum)
+@receiver(post_delete, sender=Forum)
+def forum_changed(sender, instance, **kwargs):
+    bump_forum_versions([instance.pk])
+
+
+@receiver(post_save, sender=Programme)
+@receiver(post_delete, sender=Programme)
+@receiver(post_save, sender=ForumCompany)
+@receiver(post_delete, sender=ForumCompany)
+@receiver(post_save, sender=RecruiterForumParticipation)
+@receiver(post_delete, sender=RecruiterForumParticipation)
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def forum_row_changed(sender, instance, **kwargs):
+    """Programme, participation d'entreprise ou de recruteur, offre : le document de son forum change."""
+    bump_forum_versions([instance.forum_id])
+
+
+@receiver(post_save, sender=ProgrammeRegistration)
+@receiver(post_delete, sender=ProgrammeRegistration)
+def programme_registration_changed(sender, instance, **kwargs):
+    # Nombre de participants du programme
+    bump_forum_versions(Programme.objects.filter(pk=instance.programme_id).values_list('forum_id', flat=True))
+
+
+@receiver(m2m_changed, sender=Programme.speakers.through)
+def programme_speakers_changed(sender, instance, pk_set, reverse, **kwargs):
+    if not reverse:
+        bump_forum_versions([instance.forum_id])
+    elif pk_set:
+        bump_forum_versions(Programme.objects.filter(pk__in=pk_set).values_list('forum_id', flat=True))
+
+
+@receiver(post_save, sender=Speaker)
+@receiver(pre_delete, sender=Speaker)
+def speaker_changed(sender, instance, **kwargs):
+    bump_forum_versions(instance.programmes.values_list('forum_id', flat=True))
+
+
+@receiver(post_save, sender=Company)
+def company_changed(sender, instance, **kwargs):
+    bump_forum_versions(instance.forum_participations.values_list('forum_id', flat=True))
+
+
+@receiver(post_save, sender=Recruiter)
+def recruiter_changed(sender, instance, **kwargs):
+    bump_forum_versions(instance.forum_participations.values_list('forum_id', flat=True))
+
+
+@receiver(post_save, sender=Organizer)
+def organizer_changed(sender, instance, **kwargs):
+    bump_forum_versions(instance.forums.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Questionnaire)
+@receiver(post_delete, sender=Questionnaire)
+def questionnaire_changed(sender, instance, **kwargs):
+    bump_forum_versions(Offer.objects.filter(pk=instance.offer_id).values_list('forum_id', flat=True))
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    bump_forum_versions(
+        Offer.objects.filter(questionnaire__pk=instance.questionnaire_id).values_list('forum_id', flat=True)
+    )
@@ -1,3 +1,70 @@
 from django.test import TestCase
 
-# Create your tests here.
+from company.models import Company, ForumCompany
+from forums.models import Forum, Programme
+from forums.serializers import ForumDetailSerializer
+from organizers.models import Organizer
+from recruiters.models import Offer, Recruiter, RecruiterForumParticipation
+from users.models import User
+from virtual.models import Question, Questionnaire
+
+# Requêtes du détail d'un forum déjà chargé : organisateur, son utilisateur, programmes, intervenants,
+# entreprises participantes, recruteurs inscrits, offres (avec questionnaire) et questions
+FORUM_DETAIL_QUERIES = 8
+
+
+class ForumDetailQueryCountTests(TestCase):
+    """Le détail des forums se construit en un nombre fixe de requêtes, quelle que soit leur taille"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer_user = User.objects.create_user('organizer@test.fr', 'password', role='organizer')
+        cls.organizer = Organizer.objects.create(user=organizer_user, name='Organisateur')
+        cls.small_forum = cls.create_forum('Petit forum', companies=2)
+        cls.large_forum = cls.create_forum('Grand forum', companies=12)
+
+    @classmethod
+    def create_forum(cls, name, companies):
+        forum = Forum.objects.create(name=name, type='presentiel', organizer=cls.organizer, end_date='2030-01-01')
+        Programme.objects.create(
+            forum=forum, title='Conférence', start_date='2030-01-01', end_date='2030-01-01', location='Paris'
+        )
+        for i in range(companies):
+            company = Company.objects.create(name=f'{name} {i}')
+            ForumCompany.objects.create(company=company, forum=forum, stand=f'A{i}', approved=i % 2 == 0)
+            for j in range(2):
+                user = User.objects.create_user(f'{forum.pk}-{i}-{j}@test.fr', 'password', role='company')
+                recruiter = Recruiter.objects.create(user=user, company=company, first_name='R', last_name=f'{j}')
+                RecruiterForumParticipation.objects.create(recruiter=recruiter, forum=forum)
+                offer = Offer.objects.create(
+                    recruiter=recruiter, company=company, forum=forum, title=f'Offre {j}',
+                    description='Développement', sector='informatique', contract_type='CDI'
+                )
+                if j == 0:
+                    questionnaire = Questionnaire.objects.create(offer=offer, title='Questionnaire')
+                    Question.objects.create(questionnaire=questionnaire, question_text='Pourquoi ?', question_type='text')
+        return forum
+
+    def test_detail_query_count_does_not_depend_on_forum_size(self):
+        for forum in (self.small_forum, self.large_forum):
+            forum = Forum.objects.get(pk=forum.pk)
+            with self.assertNumQueries(FORUM_DETAIL_QUERIES):
+                data = ForumDetailSerializer(forum).data
+            self.assertEqual(len(data['companies']), forum.company_participants.count())
+
+    def test_list_is_planned_once_for_all_forums(self):
+        forums = list(Forum.objects.order_by('pk'))
+        with self.assertNumQueries(FORUM_DETAIL_QUERIES):
+            data = ForumDetailSerializer(forums, many=True).data
+        self.assertEqual([len(forum['companies']) for forum in data], [2, 12])
+
+    def test_detail_content(self):
+        data = ForumDetailSerializer(Forum.objects.get(pk=self.small_forum.pk)).data
+        company = data['companies'][0]
+        self.assertEqual(company['stand'], 'A0')
+        self.assertTrue(company['approved'])
+        self.assertEqual(len(company['recruiters']), 2)
+        self.assertEqual(len(company['offers']), 2)
+        self.assertEqual(company['offers'][0]['questionnaire']['questions_count'], 1)
+        self.assertIsNone(company['offers'][1]['questionnaire'])
+        self.assertEqual(data['programmes'][0]['participants_count'], 0)
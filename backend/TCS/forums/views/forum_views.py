@@ -22,13 +22,13 @@ from recruiters.models import Offer
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def forum_list(request):
-    return get_all_forums()
+    return get_all_forums(request)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def forum_detail(request, pk):
-    return get_forum_detail(pk)
+    return get_forum_detail(pk, request)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -112,17 +112,17 @@ def get_forum_candidates(request, forum_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_forums(request):
-    return get_candidate_forum_lists(request.user)
+    return get_candidate_forum_lists(request.user, request)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def recruiter_my_forums(request):
-    return get_recruiter_forum_lists(request.user)
+    return get_recruiter_forum_lists(request.user, request)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def organizer_my_forums(request):
-    return get_organizer_forum_lists(request.user)
+    return get_organizer_forum_lists(request.user, request)
 
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
@@ -1,3 +1,30 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import CandidateEmbedding, OfferEmbedding, MatchingJob, MatchScore
+
+
+@admin.register(CandidateEmbedding)
+class CandidateEmbeddingAdmin(admin.ModelAdmin):
+    list_display = ['candidate', 'model_name', 'dimension', 'updated_at']
+    readonly_fields = ['content_hash', 'updated_at']
+    exclude = ['vector']
+
+
+@admin.register(OfferEmbedding)
+class OfferEmbeddingAdmin(admin.ModelAdmin):
+    list_display = ['offer', 'model_name', 'dimension', 'updated_at']
+    readonly_fields = ['content_hash', 'updated_at']
+    exclude = ['vector']
+
+
+@admin.register(MatchingJob)
+class MatchingJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'offer', 'status', 'progress', 'created_at', 'updated_at']
+    list_filter = ['status']
+    readonly_fields = ['version', 'results', 'created_at', 'updated_at']
+
+
+@admin.register(MatchScore)
+class MatchScoreAdmin(admin.ModelAdmin):
+    list_display = ['forum', 'offer', 'candidate', 'score', 'offer_rank', 'candidate_rank', 'computed_at']
+    list_filter = ['forum']
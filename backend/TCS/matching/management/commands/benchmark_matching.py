@@ -0,0 +1,200 @@
+import json
+import resource
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from matching.services.embeddings import get_candidate_embeddings, get_offer_embeddings
+from matching.services.forum_matrix import top_k_per_row
+from matching.services.forum_vectors import get_forum_vectors
+from matching.services.matching_offers_candidates import get_forum_registrations, matching_offer_candidates
+from matching.services.synthetic_forum import create_synthetic_forum, delete_synthetic_forum
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus (ru_maxrss est en Ko sous Linux)."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class Timer:
+    def __init__(self):
+        self.seconds = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le passage à l'échelle du matching sur des forums synthétiques "
+        "(encodage, scoring, extraction du top-k, pic de mémoire)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=str,
+            default='1000,10000,50000',
+            help='Nombres de candidats des forums générés, séparés par des virgules (défaut: 1000,10000,50000)'
+        )
+        parser.add_argument(
+            '--offers',
+            type=int,
+            default=20,
+            help="Nombre d'offres par forum (défaut: 20)"
+        )
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=10,
+            help='Taille du top-k extrait (défaut: 10)'
+        )
+        parser.add_argument(
+            '--sample-offers',
+            type=int,
+            default=5,
+            help='Nombre d\'offres passées dans matching_offer_candidates de bout en bout (défaut: 5)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Graine du générateur de données (défaut: 0)'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Conserver les forums générés au lieu de les supprimer'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Fichier JSON où écrire les résultats'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes doit être une liste d\'entiers séparés par des virgules')
+
+        self.stdout.write(
+            "ℹ️ Le pic RSS est celui du processus : pour isoler une taille, lancer une commande par taille."
+        )
+
+        results = []
+        for size in sizes:
+            self.stdout.write(f"\n📊 Forum synthétique : {size} candidats, {options['offers']} offres")
+            results.append(self.run_benchmark(size, options))
+
+        self.print_summary(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"💾 Résultats écrits dans {options['output']}"))
+
+    def run_benchmark(self, size, options):
+        top_k = options['top_k']
+        result = {"candidates": size, "offers": options['offers']}
+
+        with Timer() as t:
+            data = create_synthetic_forum(size, options['offers'], seed=options['seed'])
+        result["seed_seconds"] = round(t.seconds, 2)
+        self.stdout.write(f"  🌱 Données générées en {t.seconds:.1f}s")
+
+        forum, recruiter, offers = data["forum"], data["recruiter"], data["offers"]
+        try:
+            with Timer() as t:
+                candidates = [reg.candidate for reg in get_forum_registrations(forum.id)]
+            result["load_profiles_seconds"] = round(t.seconds, 3)
+
+            # Encodage à froid : aucun embedding stocké pour ces candidats
+            with Timer() as t:
+                candidate_vectors = get_candidate_embeddings(candidates)
+            result["encode_candidates_seconds"] = round(t.seconds, 2)
+            result["encode_candidates_per_second"] = round(size / t.seconds, 1) if t.seconds else None
+            self.stdout.write(f"  🧠 Encodage des candidats : {t.seconds:.1f}s")
+
+            with Timer() as t:
+                offer_vectors = get_offer_embeddings(offers)
+            result["encode_offers_seconds"] = round(t.seconds, 3)
+
+            # Relecture à chaud : contrôle des hash, aucun ré-encodage
+            with Timer() as t:
+                get_candidate_embeddings(candidates)
+            result["reload_embeddings_seconds"] = round(t.seconds, 3)
+
+            candidate_matrix = np.vstack([candidate_vectors[cand.pk] for cand in candidates])
+            offer_matrix = np.vstack([offer_vectors[offer.pk] for offer in offers])
+
+            with Timer() as t:
+                scores = offer_matrix @ candidate_matrix.T
+            result["scoring_seconds"] = round(t.seconds, 4)
+
+            with Timer() as t:
+                top_k_per_row(scores, top_k)
+            result["top_k_seconds"] = round(t.seconds, 4)
+            self.stdout.write(
+                f"  ⚡ Scoring {scores.shape[0]}×{scores.shape[1]} : {result['scoring_seconds']}s, "
+                f"top-{top_k} : {result['top_k_seconds']}s"
+            )
+
+            # Matrice du forum projetée en mémoire (float16 / int8), utilisée par le matching
+            with Timer() as t:
+                forum_vectors = get_forum_vectors(forum.id, [cand.pk for cand in candidates])
+            result["write_forum_vectors_seconds"] = round(t.seconds, 3)
+            result["forum_vectors_mb"] = round(forum_vectors.nbytes / 1024 / 1024, 1)
+            result["sections_per_candidate"] = round(len(forum_vectors.sections) / max(len(forum_vectors), 1), 2)
+
+            with Timer() as t:
+                forum_vectors.section_scores(offer_matrix)
+            result["mapped_scoring_seconds"] = round(t.seconds, 4)
+            self.stdout.write(
+                f"  🗂️ Matrice projetée ({forum_vectors.dtype}, {result['forum_vectors_mb']} Mo, "
+                f"{result['sections_per_candidate']} blocs/candidat) : scoring multi-vecteurs {result['mapped_scoring_seconds']}s"
+            )
+
+            # Chemin réel d'une tâche de matching (pré-filtrage, embeddings stockés, classement)
+            durations = []
+            for offer in offers[:options['sample_offers']]:
+                with Timer() as t:
+                    matching_offer_candidates(recruiter, offer.id, top_n=top_k)
+                durations.append(t.seconds)
+            if durations:
+                result["matching_offer_candidates_mean_seconds"] = round(statistics.mean(durations), 3)
+                result["matching_offer_candidates_max_seconds"] = round(max(durations), 3)
+                self.stdout.write(
+                    f"  🎯 matching_offer_candidates : moyenne {result['matching_offer_candidates_mean_seconds']}s "
+                    f"(max {result['matching_offer_candidates_max_seconds']}s)"
+                )
+
+            result["peak_rss_mb"] = peak_rss_mb()
+            self.stdout.write(f"  💾 Pic RSS : {result['peak_rss_mb']} Mo")
+        finally:
+            if options['keep']:
+                self.stdout.write(f"  📌 Forum conservé : {forum.id} (tag {data['tag']})")
+            else:
+                delete_synthetic_forum(data['tag'])
+
+        return result
+
+    def print_summary(self, results):
+        columns = [
+            ('candidates', 'candidats'),
+            ('encode_candidates_seconds', 'encodage (s)'),
+            ('reload_embeddings_seconds', 'relecture (s)'),
+            ('scoring_seconds', 'scoring (s)'),
+            ('mapped_scoring_seconds', 'scoring mmap (s)'),
+            ('top_k_seconds', 'top-k (s)'),
+            ('matching_offer_candidates_mean_seconds', 'matching/offre (s)'),
+            ('peak_rss_mb', 'pic RSS (Mo)'),
+        ]
+        self.stdout.write("\n" + " | ".join(label for _, label in columns))
+        for result in results:
+            self.stdout.write(" | ".join(str(result.get(key, '-')) for key, _ in columns))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-18 19:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('candidates', '0002_initial'),
+        ('recruiters', '0005_remove_recruiter_bio_alter_recruiter_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateEmbedding',
+            fields=[
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='candidates.candidate')),
+                ('model_name', models.CharField(max_length=255)),
+                ('content_hash', models.CharField(help_text='SHA-256 du texte construit par build_candidate_text', max_length=64)),
+                ('dimension', models.PositiveIntegerField()),
+                ('vector', models.BinaryField(help_text='Vecteur normalisé float32 sérialisé')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OfferEmbedding',
+            fields=[
+                ('offer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='recruiters.offer')),
+                ('model_name', models.CharField(max_length=255)),
+                ('content_hash', models.CharField(help_text='SHA-256 du texte construit par build_offer_text', max_length=64)),
+                ('dimension', models.PositiveIntegerField()),
+                ('vector', models.BinaryField(help_text='Vecteur normalisé float32 sérialisé')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 19:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0001_initial'),
+        ('recruiters', '0005_remove_recruiter_bio_alter_recruiter_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(help_text="Hash de l'offre et des inscriptions au forum", max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('success', 'Terminé'), ('failure', 'Échec')], default='pending', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Progression en pourcentage')),
+                ('results', models.JSONField(default=list, help_text='Liste [candidate_id, score] triée par score décroissant')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matching_jobs', to='recruiters.offer')),
+            ],
+            options={
+                'unique_together': {('offer', 'version')},
+            },
+        ),
+    ]
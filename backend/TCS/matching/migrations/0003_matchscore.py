@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 19:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0002_initial'),
+        ('forums', '0004_programmeregistration'),
+        ('matching', '0002_matchingjob'),
+        ('recruiters', '0005_remove_recruiter_bio_alter_recruiter_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('offer_rank', models.PositiveIntegerField(blank=True, help_text="Rang du candidat parmi les meilleurs de l'offre", null=True)),
+                ('candidate_rank', models.PositiveIntegerField(blank=True, help_text="Rang de l'offre parmi les meilleures du candidat", null=True)),
+                ('computed_at', models.DateTimeField(auto_now_add=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_scores', to='candidates.candidate')),
+                ('forum', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_scores', to='forums.forum')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_scores', to='recruiters.offer')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['forum', 'offer', 'offer_rank'], name='matching_ma_forum_i_a4e7a9_idx'), models.Index(fields=['forum', 'candidate', 'candidate_rank'], name='matching_ma_forum_i_41baa4_idx')],
+                'unique_together': {('offer', 'candidate')},
+            },
+        ),
+    ]
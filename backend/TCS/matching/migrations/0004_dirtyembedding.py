@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 19:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0003_matchscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyEmbedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('candidate', 'Candidat'), ('offer', 'Offre')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('marked_at', models.DateTimeField(help_text='Dernière modification signalée')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entity_type', 'marked_at'], name='matching_di_entity__92af32_idx')],
+                'unique_together': {('entity_type', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    replaces = [
+        ('matching', '0005_candidateembedding_field_vectors'),
+    ]
+
+    dependencies = [
+        ('matching', '0004_dirtyembedding'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='matchingjob',
+            name='results',
+            field=models.JSONField(default=list, help_text='Liste [candidate_id, score, composantes du score] triée par score décroissant'),
+        ),
+    ]
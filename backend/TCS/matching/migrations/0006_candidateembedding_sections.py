@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 19:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0005_alter_matchingjob_results'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateembedding',
+            name='section_fields',
+            field=models.JSONField(default=list, help_text='Champ de chaque bloc du profil (build_candidate_sections)'),
+        ),
+        migrations.AddField(
+            model_name='candidateembedding',
+            name='section_vectors',
+            field=models.BinaryField(blank=True, help_text="Vecteurs normalisés float16 des blocs du profil, sérialisés à la suite dans l'ordre de section_fields", null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0006_candidateembedding_sections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchingjob',
+            name='parameters',
+            field=models.JSONField(default=dict, help_text='Critères éliminatoires et poids du score (structured.normalize_parameters)'),
+        ),
+    ]
@@ -1,3 +1,104 @@
 from django.db import models
+from candidates.models import Candidate
+from forums.models import Forum
+from recruiters.models import Offer
 
-# Create your models here.
+
+class CandidateEmbedding(models.Model):
+    """Embedding stocké d'un candidat, indexé par le hash du texte de profil"""
+    candidate = models.OneToOneField(Candidate, on_delete=models.CASCADE, primary_key=True, related_name='embedding')
+    model_name = models.CharField(max_length=255)
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 du texte construit par build_candidate_text")
+    dimension = models.PositiveIntegerField()
+    vector = models.BinaryField(help_text="Vecteur normalisé float32 sérialisé")
+    section_fields = models.JSONField(default=list, help_text="Champ de chaque bloc du profil (build_candidate_sections)")
+    section_vectors = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="Vecteurs normalisés float16 des blocs du profil, sérialisés à la suite dans l'ordre de section_fields"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Embedding {self.candidate}"
+
+
+class OfferEmbedding(models.Model):
+    """Embedding stocké d'une offre, indexé par le hash du texte de l'offre"""
+    offer = models.OneToOneField(Offer, on_delete=models.CASCADE, primary_key=True, related_name='embedding')
+    model_name = models.CharField(max_length=255)
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 du texte construit par build_offer_text")
+    dimension = models.PositiveIntegerField()
+    vector = models.BinaryField(help_text="Vecteur normalisé float32 sérialisé")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Embedding {self.offer}"
+
+
+class MatchingJob(models.Model):
+    """Tâche de matching offre → candidats, mise en cache par version de l'ensemble des inscriptions"""
+    STATUS_CHOICES = [
+        ('pending', 'En attente'),
+        ('running', 'En cours'),
+        ('success', 'Terminé'),
+        ('failure', 'Échec'),
+    ]
+
+    offer = models.ForeignKey(Offer, on_delete=models.CASCADE, related_name='matching_jobs')
+    version = models.CharField(max_length=64, help_text="Hash de l'offre et des inscriptions au forum")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Progression en pourcentage")
+    parameters = models.JSONField(default=dict, help_text="Critères éliminatoires et poids du score (structured.normalize_parameters)")
+    results = models.JSONField(default=list, help_text="Liste [candidate_id, score, composantes du score] triée par score décroissant")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('offer', 'version')
+
+    def __str__(self):
+        return f"Matching {self.offer} ({self.status})"
+
+
+class MatchScore(models.Model):
+    """Score offre × candidat précalculé pour un forum (top-k par offre et par candidat)"""
+    forum = models.ForeignKey(Forum, on_delete=models.CASCADE, related_name='match_scores')
+    offer = models.ForeignKey(Offer, on_delete=models.CASCADE, related_name='match_scores')
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='match_scores')
+    score = models.FloatField()
+    offer_rank = models.PositiveIntegerField(null=True, blank=True, help_text="Rang du candidat parmi les meilleurs de l'offre")
+    candidate_rank = models.PositiveIntegerField(null=True, blank=True, help_text="Rang de l'offre parmi les meilleures du candidat")
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('offer', 'candidate')
+        indexes = [
+            models.Index(fields=['forum', 'offer', 'offer_rank']),
+            models.Index(fields=['forum', 'candidate', 'candidate_rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.offer} ↔ {self.candidate} : {self.score:.3f}"
+
+
+class DirtyEmbedding(models.Model):
+    """Entité dont le texte de matching a pu changer : son embedding sera recalculé par la file de ré-encodage"""
+    ENTITY_CHOICES = [
+        ('candidate', 'Candidat'),
+        ('offer', 'Offre'),
+    ]
+
+    entity_type = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    object_id = models.PositiveIntegerField()
+    marked_at = models.DateTimeField(help_text="Dernière modification signalée")
+
+    class Meta:
+        unique_together = ('entity_type', 'object_id')
+        indexes = [
+            models.Index(fields=['entity_type', 'marked_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} {self.object_id} (modifié le {self.marked_at})"
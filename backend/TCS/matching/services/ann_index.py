@@ -0,0 +1,260 @@
+"""
+Index approximatif (IVF) des embeddings candidats, un par forum.
+
+Les blocs des profils (une expérience, les compétences, ...) sont répartis en listes inversées autour
+de centroïdes appris par k-means sphérique : un candidat figure dans la liste de chacun de ses blocs.
+Une recherche ne parcourt que les `nprobe` listes les plus proches de la requête.
+L'index ne contient que les centroïdes et l'affectation de chaque bloc : les vecteurs sont lus
+dans la matrice projetée du forum (forum_vectors), qui sert aussi au score multi-vecteurs des candidats trouvés.
+"""
+import logging
+import os
+
+import numpy as np
+from django.conf import settings
+
+from matching.services.forum_vectors import forum_file_lock, update_forum_vector_rows
+
+logger = logging.getLogger(__name__)
+
+KMEANS_ITERATIONS = 10
+KMEANS_MAX_TRAINING_SIZE = 50000
+
+# Cache des index chargés dans le processus : {forum_id: (mtime, index)}
+_loaded_indexes = {}
+
+
+class IVFIndex:
+    def __init__(self, centroids, ids, assignments, trained_size):
+        # ids : candidat de chaque bloc indexé (un candidat apparaît une fois par bloc)
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.assignments = np.asarray(assignments, dtype=np.int32)
+        self.trained_size = int(trained_size)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, ids, vectors, nlist=None, seed=0):
+        """Apprend les centroïdes par k-means sphérique et répartit les vecteurs."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n = len(vectors)
+        nlist = nlist or max(1, int(np.sqrt(n)))
+        nlist = min(nlist, max(n, 1))
+        centroids = _spherical_kmeans(vectors, nlist, seed)
+        assignments = np.argmax(vectors @ centroids.T, axis=1) if n else np.empty(0, dtype=np.int32)
+        return cls(centroids, ids, assignments, trained_size=n)
+
+    def needs_rebuild(self):
+        """Les centroïdes ne représentent plus l'ensemble quand sa taille a trop varié depuis l'apprentissage."""
+        return len(self) > 2 * max(self.trained_size, 1) or len(self) < self.trained_size // 2
+
+    def remove(self, ids):
+        keep = ~np.isin(self.ids, np.asarray(list(ids), dtype=np.int64))
+        self.ids = self.ids[keep]
+        self.assignments = self.assignments[keep]
+
+    def add_or_update(self, ids, vectors):
+        """
+        Ajoute (ou ré-affecte) des candidats sans ré-apprendre les centroïdes :
+        `ids` donne le candidat de chaque ligne de `vectors`, tous les blocs d'un candidat sont fournis.
+        """
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if not len(ids):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.remove(np.unique(ids))
+        assignments = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+        self.ids = np.concatenate([self.ids, ids])
+        self.assignments = np.concatenate([self.assignments, assignments])
+
+    def search(self, query, k, nprobe, forum_vectors):
+        """
+        Retourne (ids, scores) des k meilleurs candidats ayant au moins un bloc dans les `nprobe` listes
+        les plus proches de la requête (parcours complet si elles contiennent moins de k candidats).
+        Les scores multi-vecteurs sont calculés directement sur la matrice projetée `forum_vectors`.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = min(nprobe, len(self.centroids))
+        centroid_scores = self.centroids @ query
+        probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        candidate_ids = np.unique(self.ids[np.isin(self.assignments, probed)])
+        if len(candidate_ids) < k:
+            candidate_ids = np.unique(self.ids)
+
+        rows, candidate_ids = forum_vectors.rows(candidate_ids)
+        scores = forum_vectors.section_scores(query, rows)
+        k = min(k, len(rows))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return candidate_ids[top], scores[top]
+
+    def save(self, path):
+        """Écriture atomique (fichier temporaire puis renommage)."""
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            ids=self.ids,
+            assignments=self.assignments,
+            trained_size=np.array(self.trained_size),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                data['centroids'],
+                data['ids'],
+                data['assignments'],
+                int(data['trained_size']),
+            )
+
+
+def _spherical_kmeans(vectors, nlist, seed):
+    """k-means sur vecteurs normalisés (similarité cosine), centroïdes re-normalisés à chaque itération."""
+    rng = np.random.default_rng(seed)
+    if not len(vectors):
+        return np.zeros((1, vectors.shape[-1]), dtype=np.float32)
+
+    sample = vectors
+    if len(vectors) > KMEANS_MAX_TRAINING_SIZE:
+        sample = vectors[rng.choice(len(vectors), KMEANS_MAX_TRAINING_SIZE, replace=False)]
+
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        # Liste vide : on ré-initialise le centroïde sur un vecteur aléatoire
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = (sums / norms[:, None]).astype(np.float32)
+    return centroids
+
+
+def get_index_path(forum_id):
+    return os.path.join(settings.MATCHING_INDEX_DIR, f"forum_{forum_id}.npz")
+
+
+def load_forum_index(forum_id):
+    """Retourne l'index du forum (rechargé seulement si le fichier a changé), ou None s'il n'existe pas."""
+    path = get_index_path(forum_id)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        _loaded_indexes.pop(forum_id, None)
+        return None
+
+    cached = _loaded_indexes.get(forum_id)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    index = IVFIndex.load(path)
+    _loaded_indexes[forum_id] = (mtime, index)
+    return index
+
+
+def _save_forum_index(forum_id, index):
+    path = get_index_path(forum_id)
+    index.save(path)
+    _loaded_indexes[forum_id] = (os.path.getmtime(path), index)
+
+
+def build_forum_index(forum_id, forum_vectors):
+    with forum_file_lock(forum_id, 'index'):
+        index = IVFIndex.build(*forum_vectors.candidate_sections(np.arange(len(forum_vectors))))
+        _save_forum_index(forum_id, index)
+    logger.info(f"📚 Index ANN du forum {forum_id} construit ({len(index)} blocs, {len(index.centroids)} listes)")
+    return index
+
+
+def update_forum_index(forum_id, add_vectors=None, remove_ids=None):
+    """
+    Mise à jour incrémentale d'un index existant : {candidate_id: matrice des blocs} à ajouter / ré-affecter
+    et identifiants à retirer. Sans effet si le forum n'a pas encore d'index.
+    """
+    if not os.path.exists(get_index_path(forum_id)):
+        return None
+
+    with forum_file_lock(forum_id, 'index'):
+        index = IVFIndex.load(get_index_path(forum_id))
+        if remove_ids:
+            index.remove(remove_ids)
+        if add_vectors:
+            ids = list(add_vectors.keys())
+            index.add_or_update(
+                np.repeat(ids, [len(add_vectors[i]) for i in ids]),
+                np.vstack([add_vectors[i] for i in ids]),
+            )
+        _save_forum_index(forum_id, index)
+    return index
+
+
+def update_candidate_vectors(vectors, sections):
+    """
+    Propage des embeddings candidats ré-encodés ({candidate_id: vecteur}, {candidate_id: matrice des blocs})
+    vers les forums où ils sont inscrits : blocs de la matrice projetée remplacés,
+    candidats ré-affectés dans l'index. Seuls les blocs sont utilisés.
+    """
+    from forums.models import ForumRegistration
+    from matching.services.embeddings import ID_CHUNK_SIZE
+
+    candidate_ids = list(vectors.keys())
+    forum_candidates = {}
+    for start in range(0, len(candidate_ids), ID_CHUNK_SIZE):
+        registrations = ForumRegistration.objects.filter(
+            candidate_id__in=candidate_ids[start:start + ID_CHUNK_SIZE]
+        ).values_list('forum_id', 'candidate_id')
+        for forum_id, candidate_id in registrations:
+            forum_candidates.setdefault(forum_id, []).append(candidate_id)
+
+    for forum_id, forum_candidate_ids in forum_candidates.items():
+        update_forum_vector_rows(
+            forum_id, {candidate_id: sections[candidate_id] for candidate_id in forum_candidate_ids}
+        )
+        update_forum_index(
+            forum_id, add_vectors={candidate_id: sections[candidate_id] for candidate_id in forum_candidate_ids}
+        )
+
+
+def get_forum_index(forum_id, forum_vectors):
+    """
+    Retourne l'index du forum aligné sur sa matrice projetée (donc sur ses inscrits) :
+    - construit s'il n'existe pas encore
+    - sinon mis à jour incrémentalement (nouveaux inscrits ajoutés, désinscrits retirés)
+    - ré-entraîné quand sa taille a trop varié depuis l'apprentissage des centroïdes
+    """
+    index = load_forum_index(forum_id)
+    if index is None:
+        return build_forum_index(forum_id, forum_vectors)
+
+    missing_ids = np.setdiff1d(forum_vectors.ids, index.ids)
+    removed_ids = np.setdiff1d(index.ids, forum_vectors.ids)
+    if len(missing_ids) or len(removed_ids):
+        rows, _ = forum_vectors.rows(missing_ids)
+        section_ids, section_vectors = forum_vectors.candidate_sections(rows)
+        # Les blocs d'un candidat sont contigus : un seul passage pour les regrouper
+        ids, starts, counts = np.unique(section_ids, return_index=True, return_counts=True)
+        index = update_forum_index(
+            forum_id,
+            add_vectors={
+                candidate_id: section_vectors[start:start + count]
+                for candidate_id, start, count in zip(ids.tolist(), starts.tolist(), counts.tolist())
+            },
+            remove_ids=removed_ids.tolist(),
+        )
+        if index is None:
+            # Fichier de l'index supprimé entre-temps
+            return build_forum_index(forum_id, forum_vectors)
+
+    if index.needs_rebuild():
+        index = build_forum_index(forum_id, forum_vectors)
+    return index
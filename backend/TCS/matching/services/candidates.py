@@ -1,24 +1,49 @@
+# Champs du profil encodés séparément pour le détail du score de matching
+CANDIDATE_FIELDS = ('skills', 'experiences', 'education', 'languages')
+
+
+def build_experience_text(experience):
+    return f"{experience.job_title} chez {experience.company} : {experience.description or ''}"
+
+
+def build_candidate_field_texts(candidate):
+    """Texte de chaque champ du profil (CANDIDATE_FIELDS), vide si le champ n'est pas renseigné."""
+    return {
+        'skills': " ".join([s.name for s in candidate.skills.all()]),
+        'experiences': " ".join([build_experience_text(exp) for exp in candidate.experiences.all()]),
+        'education': " ".join([
+            f"{edu.degree} - {edu.institution}"
+            for edu in candidate.educations.all()
+        ]),
+        'languages': " ".join([
+            f"{cl.language.name}({cl.level})"
+            for cl in candidate.candidate_languages.all()
+        ]),
+    }
+
+
+def build_candidate_sections(candidate):
+    """
+    Blocs du profil encodés chacun dans leur propre vecteur (représentation multi-vecteurs) :
+    [(champ, texte), ...] avec un bloc par expérience, puis les blocs compétences, formation et langues.
+    Chaque bloc reste court : le modèle ne tronque plus les dernières expériences d'un long profil.
+    Les blocs vides sont omis.
+    """
+    fields = build_candidate_field_texts(candidate)
+    sections = [('experiences', build_experience_text(exp)) for exp in candidate.experiences.all()]
+    sections += [(field, fields[field]) for field in ('skills', 'education', 'languages')]
+    return [(field, text) for field, text in sections if text.strip()]
+
+
 def build_candidate_text(candidate):
-    skills = " ".join([s.name for s in candidate.skills.all()])
-    experiences = " ".join([
-        f"{exp.job_title} chez {exp.company} : {exp.description or ''}"
-        for exp in candidate.experiences.all()
-    ])
-    educations = " ".join([
-        f"{edu.degree} - {edu.institution}"
-        for edu in candidate.educations.all()
-    ])
-    languages = " ".join([
-        f"{cl.language.name}({cl.level})"
-        for cl in candidate.candidate_languages.all()
-    ])
+    fields = build_candidate_field_texts(candidate)
 
     candidate_text = (
         f"{candidate.first_name} {candidate.last_name} "
-        f"Compétences: {skills} "
-        f"Expériences: {experiences} "
-        f"Éducation: {educations} "
-        f"Langues: {languages}"
+        f"Compétences: {fields['skills']} "
+        f"Expériences: {fields['experiences']} "
+        f"Éducation: {fields['education']} "
+        f"Langues: {fields['languages']}"
     )
     return candidate_text
 
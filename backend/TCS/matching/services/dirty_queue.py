@@ -0,0 +1,134 @@
+"""
+File de ré-encodage incrémental : les modifications de profils candidats et d'offres marquent
+l'entité concernée comme « sale », une tâche Celery différée (debounce) ré-encode ensuite
+les entités marquées par lots.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from matching.models import DirtyEmbedding
+
+logger = logging.getLogger(__name__)
+
+DIRTY_BATCH_SIZE = 256
+SCHEDULED_CACHE_KEY = 'matching:dirty_embeddings:scheduled'
+
+_tracking = threading.local()
+
+
+@contextmanager
+def suspend_dirty_tracking():
+    """
+    Désactive le marquage pour le thread courant (imports / suppressions en masse) :
+    l'appelant se charge alors de recalculer ou de purger les embeddings concernés.
+    """
+    previous = getattr(_tracking, 'suspended', False)
+    _tracking.suspended = True
+    try:
+        yield
+    finally:
+        _tracking.suspended = previous
+
+
+def mark_dirty(entity_type, object_ids):
+    """
+    Marque des candidats / offres à ré-encoder et planifie le traitement de la file.
+    Une entité déjà marquée voit simplement sa date de modification avancée.
+    """
+    if getattr(_tracking, 'suspended', False):
+        return
+    object_ids = {object_id for object_id in object_ids if object_id is not None}
+    if not object_ids:
+        return
+
+    now = timezone.now()
+    DirtyEmbedding.objects.bulk_create(
+        [DirtyEmbedding(entity_type=entity_type, object_id=object_id, marked_at=now) for object_id in object_ids],
+        update_conflicts=True,
+        unique_fields=['entity_type', 'object_id'],
+        update_fields=['marked_at'],
+    )
+    schedule_dirty_processing()
+
+
+def clear_dirty(entity_type, object_ids):
+    """Retire de la file des entités supprimées."""
+    if getattr(_tracking, 'suspended', False):
+        return
+    DirtyEmbedding.objects.filter(entity_type=entity_type, object_id__in=list(object_ids)).delete()
+
+
+def schedule_dirty_processing():
+    """
+    Planifie une seule tâche par fenêtre de debounce : les modifications successives
+    d'un même profil (compétences, expériences, ...) sont ré-encodées ensemble.
+    """
+    from matching.tasks import process_dirty_embeddings
+
+    delay = settings.MATCHING_DIRTY_DEBOUNCE_SECONDS
+
+    def enqueue():
+        try:
+            process_dirty_embeddings.apply_async(countdown=delay)
+        except Exception as e:
+            # Broker indisponible : les entités restent marquées en base, la prochaine
+            # modification (ou le prochain passage) replanifiera le traitement
+            cache.delete(SCHEDULED_CACHE_KEY)
+            logger.warning(f"⚠️ Planification du ré-encodage impossible : {e}")
+
+    if cache.add(SCHEDULED_CACHE_KEY, True, timeout=delay):
+        transaction.on_commit(enqueue)
+
+
+def _process_batch(entity_type, object_ids):
+    from candidates.models import Candidate
+    from matching.services.embeddings import get_candidate_embeddings, get_offer_embeddings
+    from recruiters.models import Offer
+
+    if entity_type == 'candidate':
+        candidates = Candidate.objects.filter(pk__in=object_ids).prefetch_related(
+            'skills', 'experiences', 'educations', 'candidate_languages__language'
+        )
+        get_candidate_embeddings(list(candidates))
+    else:
+        get_offer_embeddings(list(Offer.objects.filter(pk__in=object_ids)))
+
+
+def process_dirty_queue():
+    """
+    Ré-encode par lots les entités marquées avant le début du traitement.
+    Une entité re-marquée pendant le traitement, ou dont le lot a échoué, reste dans la file
+    et un nouveau passage est planifié.
+    Retourne le nombre d'entités traitées par type.
+    """
+    cache.delete(SCHEDULED_CACHE_KEY)
+    started_at = timezone.now()
+    processed = {}
+    failed = False
+
+    for entity_type, _ in DirtyEmbedding.ENTITY_CHOICES:
+        dirty = DirtyEmbedding.objects.filter(entity_type=entity_type, marked_at__lte=started_at)
+        object_ids = list(dirty.order_by('marked_at').values_list('object_id', flat=True))
+        processed[entity_type] = 0
+        for start in range(0, len(object_ids), DIRTY_BATCH_SIZE):
+            batch = object_ids[start:start + DIRTY_BATCH_SIZE]
+            try:
+                # Les embeddings ne sont recalculés que si le hash du texte a changé
+                _process_batch(entity_type, batch)
+            except Exception:
+                # Le lot reste dans la file, les suivants sont tout de même traités
+                logger.exception(f"❌ Échec du ré-encodage d'un lot de {len(batch)} {entity_type}")
+                failed = True
+                continue
+            dirty.filter(object_id__in=batch).delete()
+            processed[entity_type] += len(batch)
+
+    if failed or DirtyEmbedding.objects.filter(marked_at__gt=started_at).exists():
+        schedule_dirty_processing()
+    return processed
@@ -0,0 +1,230 @@
+import hashlib
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from matching.models import CandidateEmbedding, OfferEmbedding
+from matching.services.candidates import build_candidate_sections, build_candidate_text
+from matching.services.offers import build_offer_text
+from matching.services.model_registry import get_model
+
+ENCODE_BATCH_SIZE = 64
+# Nombre de textes encodés entre deux notifications de progression
+PROGRESS_CHUNK_SIZE = 256
+# Taille des lots d'identifiants pour les requêtes `__in`
+ID_CHUNK_SIZE = 5000
+# Champ du bloc unique d'un profil sans expérience, compétence, formation ni langue (vecteur du profil complet)
+PROFILE_SECTION = 'profile'
+
+
+def compute_content_hash(text):
+    """Hash SHA-256 du texte utilisé pour l'embedding."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def vector_to_bytes(vector):
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def bytes_to_vector(data):
+    return np.frombuffer(bytes(data), dtype=np.float32)
+
+
+def sections_to_bytes(vectors):
+    """Blocs d'un profil stockés en float16 : deux fois moins de place que le vecteur du profil complet."""
+    return np.asarray(vectors, dtype=np.float16).tobytes()
+
+
+def bytes_to_sections(section_fields, data):
+    """Retourne (champs, matrice float32 blocs × dimension) des blocs stockés d'un profil."""
+    vectors = np.frombuffer(bytes(data), dtype=np.float16).astype(np.float32)
+    return list(section_fields), vectors.reshape(len(section_fields), -1)
+
+
+def aggregate_similarities(similarities, aggregation=None):
+    """Agrège (max ou moyenne) les similarités des blocs d'un profil, sur le dernier axe."""
+    aggregation = aggregation or settings.MATCHING_SECTION_AGGREGATION
+    if aggregation == 'mean':
+        return similarities.mean(axis=-1)
+    return similarities.max(axis=-1)
+
+
+def encode_texts(model, texts):
+    """Encode une liste de textes en vecteurs float32 normalisés (norme L2 = 1)."""
+    embeddings = model.encode(
+        texts,
+        batch_size=ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def encode_sections(model, sections, fallback_vectors):
+    """
+    Encode les blocs [[(champ, texte), ...], ...] de plusieurs profils en un seul appel au modèle.
+    Retourne [(champs, matrice blocs × dimension), ...] ; un profil sans bloc garde
+    son vecteur complet comme bloc unique.
+    """
+    texts = [text for profile in sections for _, text in profile]
+    encoded = encode_texts(model, texts) if texts else None
+
+    result = []
+    offset = 0
+    for profile, fallback in zip(sections, fallback_vectors):
+        if not profile:
+            result.append(([PROFILE_SECTION], fallback[None, :]))
+            continue
+        result.append(([field for field, _ in profile], encoded[offset:offset + len(profile)]))
+        offset += len(profile)
+    return result
+
+
+def _sync_embeddings(embedding_model, owner_field, objects, build_text, progress=None, on_encoded=None,
+                     build_sections=None):
+    """
+    Retourne {pk: vecteur} pour les objets donnés.
+    Seuls les objets dont le hash du texte a changé (ou sans embedding) sont ré-encodés.
+    Le modèle n'est chargé que s'il y a réellement quelque chose à encoder.
+    Avec `build_sections`, chaque bloc de l'objet est aussi encodé dans son propre vecteur
+    (section_vectors) dans le même passage.
+    `progress(done, total)` est appelé après chaque lot encodé,
+    `on_encoded({pk: vecteur}, {pk: matrice des blocs})` une fois les vecteurs ré-encodés enregistrés.
+    """
+    model_name = settings.MATCHING_MODEL_NAME
+    owner_id_field = f"{owner_field}_id"
+    texts = {obj.pk: build_text(obj) for obj in objects}
+    if not texts:
+        return {}
+
+    hashes = {pk: compute_content_hash(text) for pk, text in texts.items()}
+    stored = {
+        getattr(emb, owner_id_field): emb
+        for emb in embedding_model.objects.filter(**{f"{owner_id_field}__in": list(texts.keys())})
+    }
+
+    vectors = {}
+    stale_pks = []
+    for pk, content_hash in hashes.items():
+        emb = stored.get(pk)
+        has_sections = build_sections is None or emb is None or emb.section_vectors is not None
+        if emb and emb.content_hash == content_hash and emb.model_name == model_name and has_sections:
+            vectors[pk] = bytes_to_vector(emb.vector)
+        else:
+            stale_pks.append(pk)
+
+    if not stale_pks:
+        return vectors
+
+    model = get_model(model_name)
+    objects_by_pk = {obj.pk: obj for obj in objects} if build_sections else {}
+    chunks = []
+    sections = []
+    for start in range(0, len(stale_pks), PROGRESS_CHUNK_SIZE):
+        chunk = stale_pks[start:start + PROGRESS_CHUNK_SIZE]
+        chunks.append(encode_texts(model, [texts[pk] for pk in chunk]))
+        if build_sections:
+            sections.extend(encode_sections(model, [build_sections(objects_by_pk[pk]) for pk in chunk], chunks[-1]))
+        if progress:
+            progress(start + len(chunk), len(stale_pks))
+    encoded = np.vstack(chunks)
+
+    to_create = []
+    to_update = []
+    for i, (pk, vector) in enumerate(zip(stale_pks, encoded)):
+        vectors[pk] = vector
+        emb = stored.get(pk)
+        if emb is None:
+            emb = embedding_model(**{owner_id_field: pk})
+            to_create.append(emb)
+        else:
+            to_update.append(emb)
+        emb.model_name = model_name
+        emb.content_hash = hashes[pk]
+        emb.dimension = vector.shape[0]
+        emb.vector = vector_to_bytes(vector)
+        if sections:
+            emb.section_fields = sections[i][0]
+            emb.section_vectors = sections_to_bytes(sections[i][1])
+
+    update_fields = ['model_name', 'content_hash', 'dimension', 'vector']
+    if sections:
+        update_fields += ['section_fields', 'section_vectors']
+    with transaction.atomic():
+        if to_create:
+            embedding_model.objects.bulk_create(to_create, batch_size=500)
+        if to_update:
+            embedding_model.objects.bulk_update(to_update, update_fields, batch_size=500)
+
+    if on_encoded:
+        on_encoded(
+            {pk: vectors[pk] for pk in stale_pks},
+            {pk: matrix for pk, (_, matrix) in zip(stale_pks, sections)},
+        )
+    return vectors
+
+
+def get_candidate_embeddings(candidates, progress=None, update_indexes=True):
+    """
+    Retourne {candidate_id: vecteur} en ne ré-encodant que les profils modifiés
+    (profil complet et chacun de ses blocs, cf. build_candidate_sections).
+    Les candidats doivent être préchargés avec skills, experiences, educations et langues.
+    Les vecteurs ré-encodés sont reportés dans les matrices et index ANN des forums concernés.
+    """
+    on_encoded = None
+    if update_indexes:
+        from matching.services.ann_index import update_candidate_vectors
+        on_encoded = update_candidate_vectors
+    return _sync_embeddings(
+        CandidateEmbedding, 'candidate', candidates, build_candidate_text, progress, on_encoded,
+        build_sections=build_candidate_sections,
+    )
+
+
+def _load_stored_candidate_vectors(candidate_ids, columns, decode):
+    """
+    Retourne {candidate_id: decode(*colonnes)} pour les colonnes `columns` de CandidateEmbedding.
+    Les candidats sans valeur pour le modèle courant (dernière colonne nulle) sont chargés et encodés.
+    """
+    from candidates.models import Candidate
+
+    candidate_ids = list(candidate_ids)
+    vectors = {}
+    for start in range(0, len(candidate_ids), ID_CHUNK_SIZE):
+        stored = CandidateEmbedding.objects.filter(
+            candidate_id__in=candidate_ids[start:start + ID_CHUNK_SIZE],
+            model_name=settings.MATCHING_MODEL_NAME,
+            **{f"{columns[-1]}__isnull": False}
+        ).values_list('candidate_id', *columns)
+        for candidate_id, *values in stored:
+            vectors[candidate_id] = decode(*values)
+
+    missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in vectors]
+    for start in range(0, len(missing), ID_CHUNK_SIZE):
+        candidates = Candidate.objects.filter(pk__in=missing[start:start + ID_CHUNK_SIZE]).prefetch_related(
+            'skills', 'experiences', 'educations', 'candidate_languages__language'
+        )
+        get_candidate_embeddings(candidates, update_indexes=False)
+        stored = CandidateEmbedding.objects.filter(
+            candidate_id__in=missing[start:start + ID_CHUNK_SIZE]
+        ).values_list('candidate_id', *columns)
+        for candidate_id, *values in stored:
+            vectors[candidate_id] = decode(*values)
+    return vectors
+
+
+def load_candidate_sections(candidate_ids):
+    """
+    Retourne {candidate_id: (champs, matrice blocs × dimension)} des blocs de chaque profil,
+    depuis le stockage.
+    """
+    return _load_stored_candidate_vectors(candidate_ids, ('section_fields', 'section_vectors'), bytes_to_sections)
+
+
+def get_offer_embeddings(offers):
+    """
+    Retourne {offer_id: vecteur} en ne ré-encodant que les offres modifiées.
+    """
+    return _sync_embeddings(OfferEmbedding, 'offer', offers, build_offer_text)
@@ -0,0 +1,86 @@
+import numpy as np
+from django.db import transaction
+
+from matching.models import MatchScore
+from matching.services.embeddings import get_offer_embeddings
+from matching.services.forum_vectors import get_forum_vectors, get_registered_candidate_ids
+
+DEFAULT_TOP_K = 20
+
+
+def top_k_per_row(scores, k):
+    """
+    Indices des k meilleurs scores de chaque ligne, triés par score décroissant.
+    argpartition sélectionne en O(n) par ligne, seul le top-k est ensuite trié.
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    partitioned = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, partitioned, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(partitioned, order, axis=1)
+
+
+def compute_forum_score_matrix(forum_id, top_k=DEFAULT_TOP_K):
+    """
+    Calcule la matrice complète offres × candidats d'un forum (score multi-vecteurs sur les blocs
+    projetés du forum, par lots de candidats), puis persiste le top-k par offre et par candidat dans MatchScore.
+    """
+    from recruiters.models import Offer
+
+    offers = list(Offer.objects.filter(forum_id=forum_id).order_by('id'))
+    candidate_ids = get_registered_candidate_ids(forum_id)
+
+    if not offers or not candidate_ids:
+        with transaction.atomic():
+            MatchScore.objects.filter(forum_id=forum_id).delete()
+        return {"offers": len(offers), "candidates": len(candidate_ids), "scores": 0}
+
+    offer_vectors = get_offer_embeddings(offers)
+    offer_matrix = np.vstack([offer_vectors[offer.pk] for offer in offers])
+    forum_vectors = get_forum_vectors(forum_id, candidate_ids)
+    candidate_ids = forum_vectors.ids.tolist()
+
+    # (nb_offres × nb_candidats) : similarité cosine de toutes les paires, agrégée sur les blocs des profils
+    scores = forum_vectors.section_scores(offer_matrix)
+
+    # {(i_offre, j_candidat): [score, rang pour l'offre, rang pour le candidat]}
+    pairs = {}
+    for i, row in enumerate(top_k_per_row(scores, top_k)):
+        for rank, j in enumerate(row, start=1):
+            pairs[(i, int(j))] = [float(scores[i, j]), rank, None]
+    for j, column in enumerate(top_k_per_row(scores.T, top_k)):
+        for rank, i in enumerate(column, start=1):
+            pair = pairs.setdefault((int(i), j), [float(scores[i, j]), None, None])
+            pair[2] = rank
+
+    match_scores = [
+        MatchScore(
+            forum_id=forum_id,
+            offer_id=offers[i].pk,
+            candidate_id=candidate_ids[j],
+            score=round(score, 4),
+            offer_rank=offer_rank,
+            candidate_rank=candidate_rank,
+        )
+        for (i, j), (score, offer_rank, candidate_rank) in pairs.items()
+    ]
+
+    with transaction.atomic():
+        MatchScore.objects.filter(forum_id=forum_id).delete()
+        MatchScore.objects.bulk_create(match_scores, batch_size=1000)
+
+    return {"offers": len(offers), "candidates": len(candidate_ids), "scores": len(match_scores)}
+
+
+def get_top_candidates_for_offer(forum_id, offer_id, limit=DEFAULT_TOP_K):
+    return MatchScore.objects.filter(
+        forum_id=forum_id, offer_id=offer_id, offer_rank__isnull=False
+    ).select_related('candidate').order_by('offer_rank')[:limit]
+
+
+def get_top_offers_for_candidate(forum_id, candidate_id, limit=DEFAULT_TOP_K):
+    return MatchScore.objects.filter(
+        forum_id=forum_id, candidate_id=candidate_id, candidate_rank__isnull=False
+    ).select_related('offer', 'offer__company').order_by('candidate_rank')[:limit]
@@ -0,0 +1,382 @@
+"""
+Matrices d'embeddings candidats par forum, stockées en float16 ou en int8 (quantification par ligne)
+dans des fichiers .npy projetés en mémoire en lecture seule : les processus gunicorn / Celery
+d'une même machine partagent le cache de pages du système au lieu de garder chacun leur copie.
+
+Fichiers d'un forum (dans MATCHING_INDEX_DIR) :
+- forum_<id>.vectors.json : format, génération courante, type de stockage et dimension
+- forum_<id>.g<n>.ids.npy : identifiants candidats triés (index id → ligne par recherche dichotomique)
+- forum_<id>.g<n>.sections.npy : vecteurs des blocs des profils (un par expérience, compétences, formation,
+  langues), float16 ou int8, utilisés pour le score et par l'index ANN
+- forum_<id>.g<n>.section_starts.npy / section_counts.npy : premier bloc et nombre de blocs de chaque candidat
+- forum_<id>.g<n>.section_scales.npy : facteur d'échelle float32 de chaque bloc (int8 uniquement)
+- forum_<id>.<kind>.lock : verrous inter-processus (forum_file_lock)
+"""
+import fcntl
+import glob
+import json
+import logging
+import os
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+STORAGE_DTYPES = ('float16', 'int8')
+# Version de l'organisation des fichiers : une matrice d'un autre format est reconstruite
+FILE_FORMAT = 3
+FILE_NAMES = ('ids', 'sections', 'section_scales', 'section_starts', 'section_counts')
+# Fichiers des formats précédents, supprimés avec leur génération
+LEGACY_FILE_NAMES = ('vectors', 'scales')
+# Nombre de candidats dont les blocs sont scorés à la fois
+SECTION_CHUNK_CANDIDATES = 4096
+
+# Cache des matrices projetées dans le processus : {forum_id: (mtime du pointeur, ForumVectors)}
+_mapped_forums = {}
+
+
+@contextmanager
+def forum_file_lock(forum_id, kind):
+    """Verrou exclusif inter-processus sur les fichiers `kind` (vectors, index, ...) d'un forum."""
+    os.makedirs(settings.MATCHING_INDEX_DIR, exist_ok=True)
+    lock_path = os.path.join(settings.MATCHING_INDEX_DIR, f"forum_{forum_id}.{kind}.lock")
+    with open(lock_path, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def quantize(vectors, dtype):
+    """Retourne (matrice stockée, échelles par ligne ou None) pour des vecteurs float32."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dtype == 'float16':
+        return vectors.astype(np.float16), None
+    scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.empty(0, dtype=np.float32)
+    scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+    return np.round(vectors / scales[:, None]).astype(np.int8), scales
+
+
+def _segments(starts, counts):
+    """Indices des lignes de segments [start, start + count) mis bout à bout, et début de chaque segment."""
+    offsets = np.cumsum(counts) - counts
+    index = np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(offsets, counts) + np.repeat(starts, counts)
+    return index, offsets
+
+
+class ForumVectors:
+    def __init__(self, ids, sections, section_starts, section_counts, section_scales=None, model_name=None):
+        self.model_name = model_name
+        self.ids = ids
+        self.sections = sections
+        self.section_scales = section_scales
+        self.section_starts = section_starts
+        self.section_counts = section_counts
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def dtype(self):
+        return 'int8' if self.section_scales is not None else 'float16'
+
+    @property
+    def nbytes(self):
+        arrays = (self.ids, self.sections, self.section_scales, self.section_starts, self.section_counts)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def rows(self, candidate_ids):
+        """Retourne (lignes, identifiants trouvés) des candidats présents dans la matrice."""
+        candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        if not len(self.ids) or not len(candidate_ids):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.int64)
+        rows = np.minimum(np.searchsorted(self.ids, candidate_ids), len(self.ids) - 1)
+        found = self.ids[rows] == candidate_ids
+        return rows[found], candidate_ids[found]
+
+    def dequantize_sections(self, index):
+        block = np.asarray(self.sections[index], dtype=np.float32)
+        if self.section_scales is not None:
+            block *= self.section_scales[index][:, None]
+        return block
+
+    def candidate_sections(self, rows):
+        """Retourne (identifiant du candidat de chaque bloc, matrice float32 des blocs) des candidats `rows`."""
+        index, _, counts = self.section_rows(rows)
+        return np.repeat(self.ids[rows], counts), self.dequantize_sections(index)
+
+    def section_rows(self, rows):
+        """Retourne (lignes des blocs des candidats `rows` mises bout à bout, début de chaque candidat, nombre de blocs)."""
+        counts = np.asarray(self.section_counts[rows], dtype=np.int64)
+        index, offsets = _segments(np.asarray(self.section_starts[rows], dtype=np.int64), counts)
+        return index, offsets, counts
+
+    def section_scores(self, queries, rows=None, aggregation=None):
+        """
+        Score multi-vecteurs : similarité de la requête avec chaque bloc du profil, agrégée par candidat
+        (max ou moyenne, MATCHING_SECTION_AGGREGATION) avec reduceat sur les blocs mis bout à bout.
+        Requête (d,) ou requêtes (q, d) ; retourne (n,) ou (q, n).
+        """
+        aggregation = aggregation or settings.MATCHING_SECTION_AGGREGATION
+        reduce = np.maximum.reduceat if aggregation == 'max' else np.add.reduceat
+        queries = np.asarray(queries, dtype=np.float32)
+        single = queries.ndim == 1
+        queries = np.atleast_2d(queries)
+        rows = np.arange(len(self.ids)) if rows is None else np.asarray(rows)
+
+        out = np.empty((len(queries), len(rows)), dtype=np.float32)
+        for start in range(0, len(rows), SECTION_CHUNK_CANDIDATES):
+            chunk = rows[start:start + SECTION_CHUNK_CANDIDATES]
+            index, offsets, counts = self.section_rows(chunk)
+            section_scores = queries @ self.dequantize_sections(index).T
+            # Chaque candidat a au moins un bloc : les segments ne sont jamais vides
+            chunk_scores = reduce(section_scores, offsets, axis=1)
+            if aggregation == 'mean':
+                chunk_scores /= counts
+            out[:, start:start + len(chunk)] = chunk_scores
+        return out[0] if single else out
+
+
+def _pointer_path(forum_id):
+    return os.path.join(settings.MATCHING_INDEX_DIR, f"forum_{forum_id}.vectors.json")
+
+
+def _generation_path(forum_id, generation, name):
+    return os.path.join(settings.MATCHING_INDEX_DIR, f"forum_{forum_id}.g{generation}.{name}.npy")
+
+
+def _read_pointer(forum_id):
+    try:
+        with open(_pointer_path(forum_id)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_current(meta):
+    """Pointeur lisible et fichiers au format courant (sinon la matrice est reconstruite)."""
+    return meta is not None and meta.get('format') == FILE_FORMAT
+
+
+def _map(forum_id, meta, mode='r'):
+    arrays = {}
+    for name in FILE_NAMES:
+        if name == 'section_scales' and meta['dtype'] != 'int8':
+            continue
+        # Identifiants et emplacements des blocs ne sont jamais modifiés sur place
+        name_mode = 'r' if name in ('ids', 'section_starts', 'section_counts') else mode
+        arrays[name] = np.load(_generation_path(forum_id, meta['generation'], name), mmap_mode=name_mode)
+    return ForumVectors(model_name=meta['model_name'], **arrays)
+
+
+def load_forum_vectors(forum_id):
+    """
+    Retourne la matrice projetée du forum (projetée à nouveau seulement si une nouvelle génération
+    a été écrite), ou None si elle n'existe pas.
+    """
+    for _ in range(2):
+        try:
+            mtime = os.path.getmtime(_pointer_path(forum_id))
+        except OSError:
+            _mapped_forums.pop(forum_id, None)
+            return None
+
+        cached = _mapped_forums.get(forum_id)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        meta = _read_pointer(forum_id)
+        if not _is_current(meta):
+            return None
+        try:
+            forum_vectors = _map(forum_id, meta)
+        except OSError:
+            # Génération remplacée entre la lecture du pointeur et la projection : on relit le pointeur
+            continue
+        _mapped_forums[forum_id] = (mtime, forum_vectors)
+        return forum_vectors
+    return None
+
+
+def _assemble(previous, kept_rows, new_ids, new_sections, dtype):
+    """
+    Tableaux d'une nouvelle génération, triés par identifiant :
+    - lignes `kept_rows` de la matrice `previous` recopiées telles quelles (sans re-quantification)
+    - nouveaux candidats `new_ids` : matrice float32 des blocs de chacun
+    """
+    new_ids = np.asarray(new_ids, dtype=np.int64)
+    new_counts = np.array([len(matrix) for matrix in new_sections], dtype=np.int32)
+    if new_sections:
+        sections = np.vstack(new_sections).astype(np.float32)
+    else:
+        dimension = previous.sections.shape[1] if previous is not None and previous.sections.ndim == 2 else 0
+        sections = np.empty((0, dimension), dtype=np.float32)
+    stored_sections, section_scales = quantize(sections, dtype)
+    section_starts = np.cumsum(new_counts, dtype=np.int64) - new_counts
+
+    arrays = {
+        'ids': new_ids,
+        'sections': stored_sections,
+        'section_scales': section_scales,
+        'section_starts': section_starts,
+        'section_counts': new_counts,
+    }
+    if previous is not None and len(kept_rows):
+        index, offsets, counts = previous.section_rows(kept_rows)
+        kept = {
+            'ids': previous.ids[kept_rows],
+            'sections': previous.sections[index],
+            'section_scales': previous.section_scales[index] if section_scales is not None else None,
+            'section_counts': counts.astype(np.int32),
+        }
+        # Les nouveaux blocs sont placés après les blocs recopiés
+        arrays['section_starts'] = np.concatenate([offsets, section_starts + len(index)])
+        for name, values in kept.items():
+            if values is not None:
+                arrays[name] = np.concatenate([values, arrays[name]])
+
+    order = np.argsort(arrays['ids'], kind='stable')
+    for name in ('ids', 'section_starts', 'section_counts'):
+        arrays[name] = arrays[name][order]
+    return arrays
+
+
+def _write_generation(forum_id, previous, dtype, arrays):
+    """Écrit une nouvelle génération puis bascule le pointeur dessus (verrou 'vectors' tenu par l'appelant)."""
+    generation = previous['generation'] + 1 if previous else 1
+    for name, values in arrays.items():
+        if values is not None:
+            np.save(_generation_path(forum_id, generation, name), values)
+
+    sections = arrays['sections']
+    meta = {
+        "format": FILE_FORMAT,
+        "generation": generation,
+        "model_name": settings.MATCHING_MODEL_NAME,
+        "dtype": dtype,
+        "dimension": int(sections.shape[1]) if sections.ndim == 2 else 0,
+    }
+    tmp_path = f"{_pointer_path(forum_id)}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, _pointer_path(forum_id))
+
+    # Les processus qui projettent encore l'ancienne génération gardent leur accès (fichiers supprimés
+    # mais toujours ouverts) jusqu'à leur prochaine lecture du pointeur
+    if previous:
+        for name in FILE_NAMES + LEGACY_FILE_NAMES:
+            path = _generation_path(forum_id, previous['generation'], name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    logger.info(
+        f"🗂️ Matrice du forum {forum_id} écrite ({len(arrays['ids'])} candidats, "
+        f"{len(arrays['sections'])} blocs, {dtype}, génération {generation})"
+    )
+
+
+def delete_forum_vectors(forum_id):
+    """
+    Supprime tous les fichiers du forum dans MATCHING_INDEX_DIR : pointeur, générations de la matrice,
+    index ANN (forum_<id>.npz), fichiers temporaires et verrous. À appeler une fois le forum supprimé.
+    Retourne le nombre de fichiers supprimés.
+    """
+    _mapped_forums.pop(forum_id, None)
+    removed = 0
+    for path in glob.glob(os.path.join(settings.MATCHING_INDEX_DIR, f"forum_{forum_id}.*")):
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def write_forum_vectors(forum_id, ids, sections, dtype=None):
+    """
+    Écrit une nouvelle génération de la matrice du forum puis bascule le pointeur dessus.
+    `sections` : matrice float32 des blocs de chaque candidat de `ids`.
+    """
+    dtype = dtype or settings.MATCHING_VECTOR_DTYPE
+    arrays = _assemble(None, [], ids, sections, dtype)
+    with forum_file_lock(forum_id, 'vectors'):
+        _write_generation(forum_id, _read_pointer(forum_id), dtype, arrays)
+    return load_forum_vectors(forum_id)
+
+
+def update_forum_vector_rows(forum_id, sections):
+    """
+    Remplace les blocs de candidats déjà présents ({candidate_id: matrice float32 des blocs}).
+    Sur place quand le nombre de blocs est inchangé : les processus qui projettent la matrice
+    voient la modification via le cache de pages partagé. Sinon (expérience ajoutée ou supprimée),
+    une nouvelle génération est écrite en recopiant les autres candidats tels quels.
+    """
+    with forum_file_lock(forum_id, 'vectors'):
+        meta = _read_pointer(forum_id)
+        if not _is_current(meta):
+            return
+        if meta['model_name'] != settings.MATCHING_MODEL_NAME:
+            # Changement de modèle : la matrice sera reconstruite à la prochaine lecture
+            os.remove(_pointer_path(forum_id))
+            return
+        current = _map(forum_id, meta, mode='r+')
+        rows, found_ids = current.rows(list(sections.keys()))
+        if not len(rows):
+            return
+        found_ids = found_ids.tolist()
+        updated_sections = [sections[candidate_id] for candidate_id in found_ids]
+        counts = np.array([len(matrix) for matrix in updated_sections])
+
+        if not np.array_equal(counts, current.section_counts[rows]):
+            kept_rows = np.setdiff1d(np.arange(len(current)), rows)
+            arrays = _assemble(current, kept_rows, found_ids, updated_sections, meta['dtype'])
+            _write_generation(forum_id, meta, meta['dtype'], arrays)
+            return
+
+        index, _, _ = current.section_rows(rows)
+        stored_sections, section_scales = quantize(np.vstack(updated_sections), meta['dtype'])
+        current.sections[index] = stored_sections
+        if section_scales is not None:
+            current.section_scales[index] = section_scales
+        for array in (current.sections, current.section_scales):
+            if array is not None:
+                array.flush()
+
+
+def get_forum_vectors(forum_id, candidate_ids):
+    """
+    Retourne la matrice projetée du forum alignée sur `candidate_ids` (ses inscrits).
+    Quand les inscriptions ont changé, une nouvelle génération est écrite en recopiant les lignes
+    existantes : seuls les nouveaux inscrits sont lus depuis CandidateEmbedding (et encodés au besoin).
+    """
+    from matching.services.embeddings import load_candidate_sections
+
+    dtype = settings.MATCHING_VECTOR_DTYPE
+    expected_ids = np.unique(np.asarray(list(candidate_ids), dtype=np.int64))
+    forum_vectors = load_forum_vectors(forum_id)
+    if forum_vectors is not None and (
+        forum_vectors.dtype != dtype or forum_vectors.model_name != settings.MATCHING_MODEL_NAME
+    ):
+        # Lignes existantes non réutilisables : la matrice est reconstruite entièrement
+        forum_vectors = None
+    if forum_vectors is not None and np.array_equal(forum_vectors.ids, expected_ids):
+        return forum_vectors
+
+    kept_rows, kept_ids = forum_vectors.rows(expected_ids) if forum_vectors is not None else ([], [])
+    missing_ids = np.setdiff1d(expected_ids, kept_ids).tolist()
+    sections = load_candidate_sections(missing_ids)
+    new_ids = [candidate_id for candidate_id in missing_ids if candidate_id in sections]
+
+    arrays = _assemble(forum_vectors, kept_rows, new_ids, [sections[candidate_id][1] for candidate_id in new_ids], dtype)
+    with forum_file_lock(forum_id, 'vectors'):
+        _write_generation(forum_id, _read_pointer(forum_id), dtype, arrays)
+    return load_forum_vectors(forum_id)
+
+
+def get_registered_candidate_ids(forum_id):
+    from forums.models import ForumRegistration
+
+    return list(ForumRegistration.objects.filter(forum_id=forum_id).values_list('candidate_id', flat=True))
@@ -0,0 +1,116 @@
+"""
+Résultats d'une tâche de matching servis par pages : une ligne résumée par candidat
+(identité, critères de recherche, score et son détail), le profil complet n'étant chargé
+qu'à la demande, par lots (expand_profiles).
+"""
+import base64
+from urllib.parse import parse_qs, urlencode
+
+RESULTS_PAGE_SIZE = 20
+MAX_RESULTS_PAGE_SIZE = 100
+MAX_EXPANDED_PROFILES = 50
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(offset):
+    """Curseur opaque : position dans le classement (les résultats d'une tâche ne changent plus)."""
+    return base64.urlsafe_b64encode(urlencode({'o': offset}).encode('ascii')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return 0
+    try:
+        query = parse_qs(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('ascii'), strict_parsing=True)
+        offset = int(query['o'][0])
+    except (ValueError, KeyError, UnicodeError):
+        raise InvalidCursor(cursor)
+    if offset < 0:
+        raise InvalidCursor(cursor)
+    return offset
+
+
+def serialize_match_components(components):
+    """Détail du score en pourcentages, comme match_score (None pour un champ vide du profil)."""
+    return {
+        key: serialize_match_components(value) if isinstance(value, dict)
+        else None if value is None else round(value * 100, 1)
+        for key, value in components.items()
+    }
+
+
+def _file_url(field):
+    return field.url if field else None
+
+
+def summarize_match_results(job, results):
+    """
+    Lignes résumées des résultats [candidate_id, score, composantes] donnés, dans l'ordre du classement.
+    Deux requêtes quel que soit le nombre de lignes : identité des candidats et critères de recherche
+    de leur inscription au forum de l'offre.
+    """
+    from candidates.models import Candidate
+    from forums.models import ForumRegistration
+
+    candidate_ids = [result[0] for result in results]
+    candidates = Candidate.objects.only(
+        'user_id', 'first_name', 'last_name', 'title', 'profile_picture', 'cv_file', 'public_token'
+    ).in_bulk(candidate_ids)
+    searches = {
+        candidate_id: {"sector": sector or [], "region": region or '', "contract_type": contract_type or []}
+        for candidate_id, sector, region, contract_type in ForumRegistration.objects.filter(
+            forum_id=job.offer.forum_id, candidate_id__in=candidate_ids
+        ).values_list('candidate_id', 'search__sector', 'search__region', 'search__contract_type')
+    }
+
+    rows = []
+    for candidate_id, score, *components in results:
+        candidate = candidates.get(candidate_id)
+        if candidate is None:
+            continue
+        rows.append({
+            "user": candidate.pk,
+            "first_name": candidate.first_name,
+            "last_name": candidate.last_name,
+            "title": candidate.title,
+            "profile_picture": _file_url(candidate.profile_picture),
+            "cv_file": _file_url(candidate.cv_file),
+            "public_token": str(candidate.public_token),
+            "search": searches.get(candidate_id),
+            "match_score": round(score * 100, 1),
+            # Les tâches calculées avant le détail du score n'ont que [candidate_id, score]
+            "match_components": serialize_match_components(components[0]) if components else None,
+        })
+    return rows
+
+
+def get_results_page(job, cursor=None, page_size=RESULTS_PAGE_SIZE):
+    """
+    Page de résultats d'une tâche terminée : {"count", "next_cursor", "candidates"}.
+    Lève InvalidCursor si le curseur n'a pas été produit par encode_cursor.
+    """
+    offset = decode_cursor(cursor)
+    page_size = max(1, min(page_size, MAX_RESULTS_PAGE_SIZE))
+    results = job.results[offset:offset + page_size]
+    next_offset = offset + page_size
+    return {
+        "count": len(job.results),
+        "next_cursor": encode_cursor(next_offset) if next_offset < len(job.results) else None,
+        "candidates": summarize_match_results(job, results),
+    }
+
+
+def expand_profiles(job, candidate_ids):
+    """
+    Profils complets (documents précalculés) des candidats demandés, limités à ceux classés par la tâche
+    et à MAX_EXPANDED_PROFILES par appel. Retourne {candidate_id: profil}.
+    """
+    from candidates.services.profile_snapshot import get_profile_snapshots
+
+    ranked_ids = {result[0] for result in job.results}
+    candidate_ids = [candidate_id for candidate_id in candidate_ids if candidate_id in ranked_ids]
+    candidate_ids = candidate_ids[:MAX_EXPANDED_PROFILES]
+    return get_profile_snapshots(candidate_ids)
@@ -0,0 +1,110 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from forums.models import ForumRegistration
+from matching.models import MatchingJob
+from matching.services.embeddings import compute_content_hash
+from matching.services.offers import build_offer_text
+from matching.services.structured import SEARCH_VALUES, normalize_parameters
+
+# Au-delà de ce délai, une tâche restée en attente / en cours est considérée perdue et relancée
+STALE_JOB_TIMEOUT = timedelta(minutes=15)
+
+# Format des résultats stockés dans MatchingJob.results (et mode de calcul du score) : le changer invalide les tâches existantes
+RESULTS_FORMAT = 3
+
+
+def get_registration_version(offer, parameters):
+    """
+    Version de l'ensemble (offre, inscriptions du forum, paramètres du score) :
+    change dès qu'une inscription est ajoutée / supprimée, que les critères de recherche
+    d'un inscrit (pré-filtrage structuré), que l'embedding d'un inscrit (profil ré-encodé
+    par la file dirty_queue), que le texte / les champs de l'offre, les critères
+    éliminatoires / poids demandés ou que le format des résultats sont modifiés.
+    """
+    registrations = ForumRegistration.objects.filter(
+        forum_id=offer.forum_id
+    ).order_by('id').values_list(
+        'id', *SEARCH_VALUES, 'candidate__embedding__model_name', 'candidate__embedding__content_hash'
+    )
+
+    offer_key = (
+        f"{RESULTS_FORMAT}|{build_offer_text(offer)}|{offer.experience_required}"
+        f"|{json.dumps(parameters, sort_keys=True)}"
+    )
+    digest = hashlib.sha256(compute_content_hash(offer_key).encode('utf-8'))
+    for registration in registrations:
+        digest.update(f"{registration!r};".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _enqueue(job):
+    from matching.tasks import run_matching_job
+    transaction.on_commit(lambda: run_matching_job.delay(job.id))
+
+
+def start_matching_job(offer, parameters=None):
+    """
+    Retourne la tâche de matching pour la version courante de l'offre et les paramètres
+    (normalisés par normalize_parameters, valeurs par défaut si None).
+    - résultat déjà calculé : la tâche terminée est renvoyée telle quelle
+    - tâche en cours : partagée entre les requêtes concurrentes
+    - sinon : une nouvelle tâche Celery est lancée
+    """
+    parameters = parameters or normalize_parameters()
+    version = get_registration_version(offer, parameters)
+
+    try:
+        with transaction.atomic():
+            job, created = MatchingJob.objects.get_or_create(
+                offer=offer, version=version, defaults={'parameters': parameters}
+            )
+    except IntegrityError:
+        # Création concurrente pour la même offre : on partage la tâche existante
+        job, created = MatchingJob.objects.get(offer=offer, version=version), False
+
+    if created:
+        _enqueue(job)
+        return job
+
+    # Relance d'une tâche en échec ou bloquée (worker arrêté) ; la mise à jour conditionnelle
+    # garantit qu'une seule requête la relance
+    stale_before = timezone.now() - STALE_JOB_TIMEOUT
+    relaunched = MatchingJob.objects.filter(pk=job.pk).filter(
+        Q(status='failure') | Q(status__in=['pending', 'running'], updated_at__lt=stale_before)
+    ).update(status='pending', progress=0, error='', updated_at=timezone.now())
+    if relaunched:
+        job.refresh_from_db()
+        _enqueue(job)
+    return job
+
+
+def prune_matching_jobs(job):
+    """
+    Supprime les tâches devenues inutiles une fois `job` terminée :
+    - tâches terminées de la même offre et des mêmes paramètres, remplacées par `job`
+      (après STALE_JOB_TIMEOUT, pour qu'un client qui les suit encore lise leur résultat)
+    - toutes les tâches sans activité depuis MATCHING_JOB_RETENTION_DAYS
+    Retourne le nombre de tâches supprimées.
+    """
+    now = timezone.now()
+    superseded = MatchingJob.objects.filter(
+        offer_id=job.offer_id,
+        parameters=job.parameters,
+        status__in=['success', 'failure'],
+        updated_at__lt=now - STALE_JOB_TIMEOUT,
+    ).exclude(pk=job.pk)
+    expired = MatchingJob.objects.filter(updated_at__lt=now - timedelta(days=settings.MATCHING_JOB_RETENTION_DAYS))
+    deleted, _ = superseded.delete()
+    expired_count, _ = expired.delete()
+    return deleted + expired_count
+
+
+def update_job_progress(job_id, percent):
+    MatchingJob.objects.filter(pk=job_id).update(progress=percent, updated_at=timezone.now())
@@ -1,49 +1,188 @@
-from sentence_transformers import SentenceTransformer
-from matching.services.candidates import build_candidate_text
-from matching.services.offers import build_offer_text
-import torch
+import math
 
-def matching_offer_candidates(recruiter, offer_id, top_n=10):
-    from recruiters.models import Offer
-    from forums.models import ForumRegistration
-
-    try:
-        offer = Offer.objects.select_related('company', 'forum').get(id=offer_id, company=recruiter.company)
-    except Offer.DoesNotExist:
-        return {}
+import numpy as np
+from django.conf import settings
 
-    forum_id = offer.forum.id
+from matching.services.ann_index import get_forum_index
+from matching.services.candidates import CANDIDATE_FIELDS
+from matching.services.embeddings import get_offer_embeddings, load_candidate_sections
+from matching.services.forum_vectors import get_forum_vectors, get_registered_candidate_ids
+from matching.services.structured import (
+    DEFAULT_FILTERS,
+    SEARCH_VALUES,
+    STRUCTURED_FIELDS,
+    build_offer_filters,
+    combine_scores,
+    structured_agreement,
+)
 
-    registrations = ForumRegistration.objects.filter(forum_id=forum_id).select_related('candidate')
-    candidates = [reg.candidate for reg in registrations]
+DEFAULT_TOP_N = 10
 
-    # Initialiser le modèle SentenceTransformer
-    model = SentenceTransformer('all-MiniLM-L6-v2')
 
-    # Construire le texte de l'offre et des candidats
-    offer_text = build_offer_text(offer)
-    candidate_texts = [build_candidate_text(cand) for cand in candidates]
+def get_forum_registrations(forum_id):
+    from forums.models import ForumRegistration
 
-    # Calculer embeddings
-    offer_embedding = model.encode(offer_text, convert_to_tensor=True)
-    candidate_embeddings = model.encode(candidate_texts, convert_to_tensor=True)
+    return ForumRegistration.objects.filter(forum_id=forum_id).select_related('candidate').prefetch_related(
+        'candidate__skills',
+        'candidate__experiences',
+        'candidate__educations',
+        'candidate__candidate_languages__language'
+    )
+
+
+def _top_ranked(candidate_ids, scores, semantic, agreement, top_n):
+    """
+    Retourne [(candidate_id, score, composantes), ...] des top_n meilleurs scores.
+    Les composantes reprennent les termes déjà calculés pour le score final :
+    similarité sémantique (agrégée sur les blocs du profil) et accord sur chaque critère structuré.
+    """
+    order = np.argsort(-scores)[:top_n]
+    return [
+        (
+            candidate_ids[i],
+            float(scores[i]),
+            {
+                'semantic': round(float(semantic[i]), 4),
+                'structured': {field: float(agreement[field][i]) for field in STRUCTURED_FIELDS},
+            },
+        )
+        for i in order
+    ]
+
+
+def add_field_components(ranked, offer_embedding):
+    """
+    Ajoute aux composantes la similarité de l'offre avec chaque champ du profil (CANDIDATE_FIELDS),
+    en un seul produit matriciel sur les blocs stockés des candidats classés
+    (meilleure expérience pour le champ experiences). Un champ vide du profil a pour composante None.
+    """
+    sections = load_candidate_sections([candidate_id for candidate_id, _, _ in ranked])
+    ranked = [row for row in ranked if row[0] in sections]
+    if not ranked:
+        return []
+
+    # (blocs de tous les candidats × dimension) · (dimension) → similarité de chaque bloc
+    similarities = np.vstack([sections[candidate_id][1] for candidate_id, _, _ in ranked]) @ offer_embedding
+    offset = 0
+    for candidate_id, _, components in ranked:
+        fields = np.array(sections[candidate_id][0])
+        candidate_similarities = similarities[offset:offset + len(fields)]
+        offset += len(fields)
+        for field in CANDIDATE_FIELDS:
+            field_similarities = candidate_similarities[fields == field]
+            components[field] = round(float(field_similarities.max()), 4) if len(field_similarities) else None
+    return ranked
+
+
+def _with_candidates(ranked):
+    from candidates.models import Candidate
+
+    candidates = Candidate.objects.in_bulk([candidate_id for candidate_id, _, _ in ranked])
+    return [
+        (candidates[candidate_id], round(score, 4), components)
+        for candidate_id, score, components in ranked
+        if candidate_id in candidates
+    ]
+
+
+def rank_candidates_with_index(offer, offer_embedding, forum_vectors, eligible_rows, top_n=DEFAULT_TOP_N, weights=None):
+    """
+    Recherche approximative dans l'index ANN du forum (blocs des profils, liste restreinte de
+    top_n × MATCHING_ANN_RERANK_FACTOR candidats), puis re-classement par le score multi-vecteurs
+    des blocs des profils et les critères structurés.
+    Retourne [(candidate_id, score, composantes), ...].
+    """
+    index = get_forum_index(offer.forum_id, forum_vectors)
+
+    # L'index couvre tous les inscrits : la liste restreinte est élargie en proportion
+    # des candidats écartés par les filtres structurés
+    widen = math.ceil(len(forum_vectors) / len(eligible_rows))
+    shortlist_ids, _ = index.search(
+        offer_embedding,
+        top_n * settings.MATCHING_ANN_RERANK_FACTOR * widen,
+        settings.MATCHING_ANN_NPROBE,
+        forum_vectors,
+    )
+    rows_by_id = {row[0]: row for row in eligible_rows}
+    rows, candidate_ids = forum_vectors.rows(
+        [candidate_id for candidate_id in shortlist_ids.tolist() if candidate_id in rows_by_id]
+    )
+    if not len(rows):
+        return []
+
+    shortlist = [rows_by_id[candidate_id] for candidate_id in candidate_ids.tolist()]
+    semantic = forum_vectors.section_scores(offer_embedding, rows)
+    agreement = structured_agreement(offer, shortlist)
+    scores = combine_scores(semantic, agreement, weights)
+    return _top_ranked([row[0] for row in shortlist], scores, semantic, agreement, top_n)
+
+
+def rank_candidates_exact(offer, offer_embedding, forum_vectors, eligible_rows, top_n=DEFAULT_TOP_N, weights=None):
+    """
+    Score multi-vecteurs de tous les candidats retenus, calculé directement sur les blocs projetés du forum.
+    Retourne [(candidate_id, score, composantes), ...].
+    """
+    rows, candidate_ids = forum_vectors.rows([row[0] for row in eligible_rows])
+    semantic = forum_vectors.section_scores(offer_embedding, rows)
+
+    rows_by_id = {row[0]: row for row in eligible_rows}
+    agreement = structured_agreement(offer, [rows_by_id[candidate_id] for candidate_id in candidate_ids.tolist()])
+    scores = combine_scores(semantic, agreement, weights)
+    return _top_ranked(candidate_ids.tolist(), scores, semantic, agreement, top_n)
+
+
+def rank_candidates_for_offer(offer, top_n=DEFAULT_TOP_N, progress=None, filters=DEFAULT_FILTERS, weights=None):
+    """
+    Matching hybride des candidats inscrits au forum de l'offre :
+    1. pré-filtrage SQL des inscriptions sur les critères `filters` (CandidateSearch vs champs de l'offre)
+    2. similarité cosine des seuls candidats retenus avec chacun des blocs de leur profil
+       (une par expérience, compétences, formation, langues), agrégée par max ou moyenne
+       (MATCHING_SECTION_AGGREGATION) sur la matrice projetée du forum
+    3. score final pondéré par `weights` (sémantique + accord sur chaque critère structuré)
+    4. détail du score des candidats classés : similarité par champ du profil et accords structurés
+    Retourne [(candidate, score, composantes), ...] trié par score décroissant.
+    Au-delà de MATCHING_ANN_MIN_CANDIDATES candidats retenus, la recherche passe par l'index ANN du forum.
+    Les embeddings des profils modifiés sont tenus à jour par la file de ré-encodage (dirty_queue).
+    `progress(percent)` est appelé aux différentes étapes du calcul.
+    """
+    from forums.models import ForumRegistration
 
-    # Calculer similarité cosine entre l'offre et tous les candidats
-    cos_scores = torch.nn.functional.cosine_similarity(offer_embedding.unsqueeze(0), candidate_embeddings)
+    offer_filters = build_offer_filters(offer, filters)
+    eligible_rows = list(
+        ForumRegistration.objects.filter(forum_id=offer.forum_id).filter(offer_filters).values_list(*SEARCH_VALUES)
+    )
+    if progress:
+        progress(10)
+    if not eligible_rows:
+        return []
 
+    offer_embedding = get_offer_embeddings([offer])[offer.id]
+    if progress:
+        progress(20)
 
+    # Seuls les nouveaux inscrits sont lus (et encodés au besoin) quand la matrice doit être réécrite
+    forum_vectors = get_forum_vectors(offer.forum_id, get_registered_candidate_ids(offer.forum_id))
+    if progress:
+        progress(70)
 
+    if len(eligible_rows) >= settings.MATCHING_ANN_MIN_CANDIDATES:
+        ranked = rank_candidates_with_index(offer, offer_embedding, forum_vectors, eligible_rows, top_n, weights)
+    else:
+        ranked = rank_candidates_exact(offer, offer_embedding, forum_vectors, eligible_rows, top_n, weights)
 
+    ranked = add_field_components(ranked, offer_embedding)
+    if progress:
+        progress(100)
+    return _with_candidates(ranked)
 
-    scores = []
-    for j, cand in enumerate(candidates):
-        score = cos_scores[j].item()
-        scores.append((cand, score))
 
-    # Trier par score décroissant et garder top_n
-    top_candidates = sorted(scores, key=lambda x: x[1], reverse=True)[:top_n]
+def matching_offer_candidates(recruiter, offer_id, top_n=DEFAULT_TOP_N):
+    from recruiters.models import Offer
 
-    # Résultat : {offer.id: [(candidate, score), ...]}
-    results = {offer.id: [(cand, round(score, 4)) for cand, score in top_candidates]}
+    try:
+        offer = Offer.objects.select_related('company', 'forum').get(id=offer_id, company=recruiter.company)
+    except Offer.DoesNotExist:
+        return {}
 
-    return results
+    # Résultat : {offer.id: [(candidate, score, composantes), ...]}
+    return {offer.id: rank_candidates_for_offer(offer, top_n)}
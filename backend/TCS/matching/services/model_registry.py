@@ -0,0 +1,97 @@
+"""
+Registre des modèles SentenceTransformer : un seul modèle par processus,
+chargé à la demande (import de torch différé) ou préchauffé au démarrage du worker.
+"""
+import logging
+import os
+import resource
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_models = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+def _get_rss_mb():
+    """Mémoire résidente actuelle du processus en Mo (Linux), sinon le pic mesuré par getrusage."""
+    try:
+        with open('/proc/self/status') as status_file:
+            for line in status_file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _load_model(model_name):
+    rss_before = _get_rss_mb()
+    start = time.perf_counter()
+
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(model_name)
+
+    load_seconds = time.perf_counter() - start
+    rss_after = _get_rss_mb()
+    _stats[model_name] = {
+        'model_name': model_name,
+        'pid': os.getpid(),
+        'loaded_at': timezone.now().isoformat(),
+        'load_seconds': round(load_seconds, 3),
+        'rss_before_mb': round(rss_before, 1),
+        'rss_after_mb': round(rss_after, 1),
+        'memory_mb': round(rss_after - rss_before, 1),
+    }
+    logger.info(
+        f"🧠 Modèle {model_name} chargé en {load_seconds:.2f}s "
+        f"(+{rss_after - rss_before:.0f} Mo, pid {os.getpid()})"
+    )
+    return model
+
+
+def get_model(model_name=None):
+    """
+    Retourne le modèle du processus courant, en le chargeant au premier appel.
+    Partagé entre les requêtes HTTP et les tâches Celery d'un même processus.
+    """
+    model_name = model_name or settings.MATCHING_MODEL_NAME
+    model = _models.get(model_name)
+    if model is not None:
+        return model
+
+    with _lock:
+        if model_name not in _models:
+            _models[model_name] = _load_model(model_name)
+    return _models[model_name]
+
+
+def is_loaded(model_name=None):
+    return (model_name or settings.MATCHING_MODEL_NAME) in _models
+
+
+def warm_up_if_configured():
+    """Précharge le modèle au démarrage du worker si MATCHING_MODEL_WARMUP est activé."""
+    if not settings.MATCHING_MODEL_WARMUP:
+        return
+    try:
+        get_model()
+    except Exception as e:
+        # Le modèle sera chargé à la première requête de matching
+        logger.error(f"❌ Préchauffage du modèle de matching impossible : {str(e)}")
+
+
+def get_registry_status():
+    """Retourne l'état du registre pour le processus courant (temps de chargement, mémoire)."""
+    return {
+        'pid': os.getpid(),
+        'configured_model': settings.MATCHING_MODEL_NAME,
+        'warmup_enabled': settings.MATCHING_MODEL_WARMUP,
+        'rss_mb': round(_get_rss_mb(), 1),
+        'models': list(_stats.values()),
+    }
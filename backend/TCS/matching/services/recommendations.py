@@ -0,0 +1,88 @@
+"""
+Recommandations d'offres côté candidat : classement des offres d'un forum pour un candidat,
+à partir des embeddings stockés, mis en cache jusqu'à modification du profil ou des offres.
+"""
+import hashlib
+
+import numpy as np
+from django.core.cache import cache
+
+from matching.services.candidates import build_candidate_text
+from matching.services.embeddings import (
+    aggregate_similarities,
+    compute_content_hash,
+    get_candidate_embeddings,
+    get_offer_embeddings,
+    load_candidate_sections,
+)
+from matching.services.offers import build_offer_text
+from matching.services.structured import DEFAULT_FILTERS, SEARCH_VALUES, combine_scores, structured_agreement
+
+DEFAULT_RECOMMENDATIONS = 10
+# La clé contient déjà la version du profil et des offres : l'expiration ne sert qu'à libérer la place
+RECOMMENDATIONS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _recommendations_cache_key(candidate, forum_id, offers, search_row, top_n):
+    """
+    Clé versionnée : hash du texte de profil, des offres du forum (texte + expérience requise)
+    et des critères de recherche du candidat pour ce forum.
+    """
+    digest = hashlib.sha256(compute_content_hash(build_candidate_text(candidate)).encode('utf-8'))
+    digest.update(repr(search_row).encode('utf-8'))
+    for offer in offers:
+        offer_key = f"{offer.pk}|{build_offer_text(offer)}|{offer.experience_required}"
+        digest.update(compute_content_hash(offer_key).encode('utf-8'))
+    return f"matching:recommendations:{forum_id}:{candidate.pk}:{top_n}:{digest.hexdigest()}"
+
+
+def rank_offers_for_candidate(candidate, offers, search_row, top_n, filters=DEFAULT_FILTERS, weights=None):
+    """
+    Classe les offres pour le candidat : similarité cosine des embeddings stockés (agrégée sur les blocs
+    du profil) combinée à l'accord sur les critères structurés, offres incompatibles (`filters`) écartées.
+    Retourne [[offer_id, score], ...] trié par score décroissant.
+    """
+    get_candidate_embeddings([candidate])
+    _, sections = load_candidate_sections([candidate.pk])[candidate.pk]
+    offer_vectors = get_offer_embeddings(offers)
+
+    ranked = []
+    for offer in offers:
+        agreement = structured_agreement(offer, [search_row])
+        if any(agreement[field][0] == 0 for field in filters):
+            continue
+        semantic = np.array([aggregate_similarities(sections @ offer_vectors[offer.pk])], dtype=np.float32)
+        score = float(combine_scores(semantic, agreement, weights)[0])
+        ranked.append([offer.pk, round(score, 4)])
+
+    ranked.sort(key=lambda x: x[1], reverse=True)
+    return ranked[:top_n]
+
+
+def get_offer_recommendations(candidate_id, forum_id, top_n=DEFAULT_RECOMMENDATIONS):
+    """
+    Retourne [[offer_id, score], ...] : les top_n offres du forum pour le candidat.
+    Le résultat est servi depuis le cache tant que le profil du candidat, ses critères
+    de recherche et les offres du forum n'ont pas changé.
+    """
+    from candidates.models import Candidate
+    from forums.models import ForumRegistration
+    from recruiters.models import Offer
+
+    candidate = Candidate.objects.prefetch_related(
+        'skills', 'experiences', 'educations', 'candidate_languages__language'
+    ).get(pk=candidate_id)
+    offers = list(Offer.objects.filter(forum_id=forum_id).order_by('id'))
+    if not offers:
+        return []
+
+    search_row = ForumRegistration.objects.filter(
+        forum_id=forum_id, candidate_id=candidate_id
+    ).values_list(*SEARCH_VALUES).first() or (candidate_id, None, None, None, None)
+
+    cache_key = _recommendations_cache_key(candidate, forum_id, offers, search_row, top_n)
+    ranked = cache.get(cache_key)
+    if ranked is None:
+        ranked = rank_offers_for_candidate(candidate, offers, search_row, top_n)
+        cache.set(cache_key, ranked, RECOMMENDATIONS_CACHE_TIMEOUT)
+    return ranked
@@ -0,0 +1,148 @@
+"""
+Critères structurés du matching : pré-filtrage SQL des inscriptions à partir des champs de l'offre
+(critères indexés SearchCriterion de la CandidateSearch du candidat) et score d'accord structuré
+des candidats retenus.
+"""
+import numpy as np
+from django.db.models import Exists, OuterRef, Q
+
+from forums.models import SearchCriterion, normalize_region
+
+# Années d'expérience minimales correspondant à Offer.EXPERIENCE_CHOICES
+EXPERIENCE_MIN_YEARS = {'0-1': 0, '1-3': 1, '3-5': 3, '5+': 5}
+
+STRUCTURED_FIELDS = ('contract_type', 'sector', 'region', 'experience')
+
+# Critères éliminatoires appliqués en base avant le scoring sémantique
+DEFAULT_FILTERS = ('contract_type', 'sector')
+
+# Poids du score final : similarité sémantique + accord sur chaque critère structuré
+DEFAULT_WEIGHTS = {
+    'semantic': 0.8,
+    'contract_type': 0.05,
+    'sector': 0.05,
+    'region': 0.05,
+    'experience': 0.05,
+}
+
+# Accord attribué quand le candidat n'a pas renseigné le critère
+NO_PREFERENCE_AGREEMENT = 0.5
+
+# Colonnes de ForumRegistration lues (values_list) pour le score structuré
+SEARCH_VALUES = (
+    'candidate_id',
+    'search__contract_type',
+    'search__sector',
+    'search__region',
+    'search__experience',
+)
+
+
+def _criterion_filter(field, value):
+    """
+    Inscriptions dont la recherche accepte `value` pour `field` (ou n'a pas de préférence),
+    via les critères indexés SearchCriterion (index unique (search, field, value)).
+    """
+    criteria = SearchCriterion.objects.filter(search_id=OuterRef('search_id'), field=field)
+    return ~Exists(criteria) | Exists(criteria.filter(value=value))
+
+
+def build_offer_filters(offer, filters=DEFAULT_FILTERS):
+    """
+    Construit le filtre des inscriptions compatibles avec l'offre, à appliquer sur ForumRegistration.
+    Un candidat sans recherche ou sans préférence sur un critère n'est jamais exclu par ce critère.
+    """
+    query = Q()
+    no_search = Q(search__isnull=True)
+
+    if 'contract_type' in filters and offer.contract_type:
+        query &= no_search | _criterion_filter('contract_type', offer.contract_type)
+
+    if 'sector' in filters and offer.sector:
+        query &= no_search | _criterion_filter('sector', offer.sector)
+
+    if 'region' in filters and normalize_region(offer.location):
+        query &= no_search | _criterion_filter('region', normalize_region(offer.location))
+
+    min_years = EXPERIENCE_MIN_YEARS.get(offer.experience_required)
+    if 'experience' in filters and min_years:
+        query &= no_search | Q(search__experience__isnull=True) | Q(search__experience__gte=min_years)
+
+    return query
+
+
+def normalize_parameters(filters=None, weights=None):
+    """
+    Valide les critères éliminatoires et les poids reçus par l'API (None : valeurs par défaut).
+    Retourne {"filters": [...], "weights": {...}} sous une forme stable (clé de version des tâches) ;
+    ValueError si un critère ou un poids est invalide.
+    """
+    if filters is None:
+        filters = DEFAULT_FILTERS
+    if not isinstance(filters, (list, tuple)) or not set(filters) <= set(STRUCTURED_FIELDS):
+        raise ValueError(f"filters doit être une liste parmi {', '.join(STRUCTURED_FIELDS)}.")
+
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    allowed = ('semantic', *STRUCTURED_FIELDS)
+    if not isinstance(weights, dict) or not set(weights) <= set(allowed):
+        raise ValueError(f"weights doit être un objet dont les clés sont parmi {', '.join(allowed)}.")
+    if not all(isinstance(w, (int, float)) and not isinstance(w, bool) and w >= 0 for w in weights.values()):
+        raise ValueError("Les poids doivent être des nombres positifs.")
+
+    return {
+        "filters": sorted(set(filters)),
+        "weights": {field: float(weights[field]) for field in allowed if field in weights},
+    }
+
+
+def _list_agreement(values, expected):
+    if not values:
+        return NO_PREFERENCE_AGREEMENT
+    return 1.0 if expected in values else 0.0
+
+
+def _region_agreement(region, location):
+    region = normalize_region(region)
+    location = normalize_region(location)
+    if not region or not location:
+        return NO_PREFERENCE_AGREEMENT
+    return 1.0 if region in location or location in region else 0.0
+
+
+def _experience_agreement(years, min_years):
+    if years is None or min_years is None:
+        return NO_PREFERENCE_AGREEMENT
+    return 1.0 if years >= min_years else 0.0
+
+
+def structured_agreement(offer, rows):
+    """
+    Accord (0, 0.5 ou 1) de chaque candidat sur chaque critère structuré.
+    `rows` : tuples (candidate_id, contract_type, sector, region, experience) issus de SEARCH_VALUES.
+    Retourne {critère: tableau numpy aligné sur `rows`}.
+    """
+    min_years = EXPERIENCE_MIN_YEARS.get(offer.experience_required)
+    agreement = {field: np.empty(len(rows), dtype=np.float32) for field in STRUCTURED_FIELDS}
+    for i, (_, contract_types, sectors, region, experience) in enumerate(rows):
+        agreement['contract_type'][i] = _list_agreement(contract_types, offer.contract_type)
+        agreement['sector'][i] = _list_agreement(sectors, offer.sector)
+        agreement['region'][i] = _region_agreement(region, offer.location)
+        agreement['experience'][i] = _experience_agreement(experience, min_years)
+    return agreement
+
+
+def combine_scores(semantic, agreement, weights=None):
+    """
+    Score final = moyenne pondérée de la similarité sémantique et des accords structurés.
+    Les critères absents de `weights` sont ignorés.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    total = sum(weights.values())
+    if not total:
+        return semantic
+    combined = weights.get('semantic', 0) * semantic
+    for field in STRUCTURED_FIELDS:
+        if weights.get(field):
+            combined = combined + weights[field] * agreement[field]
+    return combined / total
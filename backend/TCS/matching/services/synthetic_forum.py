@@ -0,0 +1,160 @@
+"""
+Génération de forums synthétiques pour les benchmarks de matching :
+candidats avec compétences, expériences, formations et langues réalistes, offres tirées du catalogue.
+Tout est inséré par bulk_create (sans signaux) et supprimé par `delete_synthetic_forum`.
+"""
+import random
+import uuid
+
+from django.db import connection, transaction
+
+from candidates.services.synthetic_profiles import (
+    COMPANIES, DEGREES, FIRST_NAMES, INSTITUTIONS, JOB_TITLES_BY_SECTOR, LANGUAGES, LAST_NAMES, LEVELS,
+    SKILLS_BY_SECTOR,
+)
+from matching.services.dirty_queue import suspend_dirty_tracking
+from TCS.constants import CONTRACT_CHOICES, REGION_CHOICES
+
+BULK_BATCH_SIZE = 2000
+EMAIL_DOMAIN = 'benchmark.local'
+
+EXPERIENCE_CHOICES = ['0-1', '1-3', '3-5', '5+']
+
+
+def _returned_pks(objects, queryset):
+    """
+    Objets créés par bulk_create avec leur clé primaire : certaines bases (MySQL)
+    ne la renvoient pas, on relit alors les lignes insérées.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return objects
+    return list(queryset.order_by('pk'))
+
+
+def create_synthetic_forum(num_candidates, num_offers, seed=0):
+    """
+    Crée un forum avec `num_candidates` inscrits et `num_offers` offres.
+    Retourne {"forum": forum, "recruiter": recruiter, "offers": [...], "tag": tag}.
+    """
+    from candidates.models import Candidate, CandidateLanguage, Education, Experience, Language, Skill
+    from company.models import Company, ForumCompany
+    from forums.models import CandidateSearch, Forum, ForumRegistration, SearchCriterion, search_criteria
+    from organizers.models import Organizer
+    from recruiters.models import Offer, Recruiter
+    from scripts.generate_offers import OFFER_CATALOG
+    from users.models import User
+
+    rng = random.Random(seed)
+    tag = uuid.uuid4().hex[:8]
+    sectors = list(SKILLS_BY_SECTOR.keys())
+    regions = [choice[0] for choice in REGION_CHOICES]
+    contracts = [choice[0] for choice in CONTRACT_CHOICES]
+
+    with transaction.atomic(), suspend_dirty_tracking():
+        organizer_user = User.objects.create(email=f"bench-{tag}-organizer@{EMAIL_DOMAIN}", role='organizer')
+        organizer = Organizer.objects.create(user=organizer_user, name=f"Benchmark {tag}")
+        forum = Forum.objects.create(name=f"Benchmark matching {tag}", type='virtuel', organizer=organizer)
+
+        company = Company.objects.create(name=f"Benchmark {tag}", sectors=sectors)
+        ForumCompany.objects.create(company=company, forum=forum, approved=True)
+        recruiter_user = User.objects.create(email=f"bench-{tag}-recruiter@{EMAIL_DOMAIN}", role='company')
+        recruiter = Recruiter.objects.create(user=recruiter_user, company=company, first_name='Bench', last_name='Recruiter')
+
+        Offer.objects.bulk_create([
+            Offer(
+                recruiter=recruiter,
+                company=company,
+                forum=forum,
+                title=entry['title'],
+                description=entry['description'],
+                profile_recherche=entry['profile'],
+                sector=entry['sector'],
+                contract_type=rng.choice(contracts),
+                location=rng.choice(regions),
+                experience_required=rng.choice(EXPERIENCE_CHOICES),
+                status='published',
+            )
+            for entry in (OFFER_CATALOG[i % len(OFFER_CATALOG)] for i in range(num_offers))
+        ])
+        offers = list(Offer.objects.filter(forum=forum).order_by('pk'))
+
+        languages = [Language.objects.get_or_create(name=name)[0] for name in LANGUAGES]
+
+        for start in range(0, num_candidates, BULK_BATCH_SIZE):
+            size = min(BULK_BATCH_SIZE, num_candidates - start)
+            prefix = f"bench-{tag}-{start:07d}-"
+            users = User.objects.bulk_create([
+                User(email=f"{prefix}{i:05d}@{EMAIL_DOMAIN}", role='candidate', is_active=True)
+                for i in range(size)
+            ])
+            users = _returned_pks(users, User.objects.filter(email__startswith=prefix))
+
+            candidates = Candidate.objects.bulk_create([
+                Candidate(user=user, first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES))
+                for user in users
+            ])
+
+            skills, experiences, educations, candidate_languages, searches = [], [], [], [], []
+            for candidate in candidates:
+                sector = rng.choice(sectors)
+                for name in rng.sample(SKILLS_BY_SECTOR[sector], k=min(6, len(SKILLS_BY_SECTOR[sector]))):
+                    skills.append(Skill(candidate=candidate, name=name))
+                for _ in range(rng.randint(1, 3)):
+                    title = rng.choice(JOB_TITLES_BY_SECTOR[sector])
+                    company_name = rng.choice(COMPANIES)
+                    experiences.append(Experience(
+                        candidate=candidate,
+                        job_title=title,
+                        company=company_name,
+                        description=f"{title} chez {company_name} : " + ", ".join(rng.sample(SKILLS_BY_SECTOR[sector], k=3)),
+                    ))
+                educations.append(Education(candidate=candidate, degree=rng.choice(DEGREES), institution=rng.choice(INSTITUTIONS)))
+                for language in rng.sample(languages, k=rng.randint(1, 3)):
+                    candidate_languages.append(CandidateLanguage(candidate=candidate, language=language, level=rng.choice(LEVELS)))
+                searches.append(CandidateSearch(
+                    contract_type=rng.sample(contracts, k=rng.randint(1, 2)),
+                    sector=[sector],
+                    region=rng.choice(regions),
+                    experience=rng.randint(0, 15),
+                ))
+
+            Skill.objects.bulk_create(skills, batch_size=BULK_BATCH_SIZE)
+            Experience.objects.bulk_create(experiences, batch_size=BULK_BATCH_SIZE)
+            Education.objects.bulk_create(educations, batch_size=BULK_BATCH_SIZE)
+            CandidateLanguage.objects.bulk_create(candidate_languages, batch_size=BULK_BATCH_SIZE)
+
+            last_search_id = CandidateSearch.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+            searches = CandidateSearch.objects.bulk_create(searches)
+            searches = _returned_pks(searches, CandidateSearch.objects.filter(pk__gt=last_search_id))
+            # bulk_create ne passe pas par CandidateSearch.save : critères indexés créés ici
+            SearchCriterion.objects.bulk_create(
+                [criterion for search in searches for criterion in search_criteria(search)], batch_size=BULK_BATCH_SIZE
+            )
+            ForumRegistration.objects.bulk_create([
+                ForumRegistration(forum=forum, candidate=candidate, search=search)
+                for candidate, search in zip(candidates, searches)
+            ], batch_size=BULK_BATCH_SIZE)
+
+    return {"forum": forum, "recruiter": recruiter, "offers": offers, "tag": tag}
+
+
+def delete_synthetic_forum(tag):
+    """Supprime le forum synthétique `tag` et tous ses utilisateurs (candidats, recruteur, organisateur)."""
+    from company.models import Company
+    from forums.models import CandidateSearch
+    from matching.services.forum_vectors import delete_forum_vectors
+    from users.models import User
+
+    with transaction.atomic(), suspend_dirty_tracking():
+        forum_ids = list(
+            User.objects.filter(email=f"bench-{tag}-organizer@{EMAIL_DOMAIN}").values_list('organizer_profile__forums', flat=True)
+        )
+        CandidateSearch.objects.filter(
+            registration_reverse__forum_id__in=forum_ids
+        ).delete()
+        User.objects.filter(email__startswith=f"bench-{tag}-", email__endswith=f"@{EMAIL_DOMAIN}").delete()
+        Company.objects.filter(name=f"Benchmark {tag}").delete()
+
+    for forum_id in forum_ids:
+        if forum_id:
+            delete_forum_vectors(forum_id)
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from candidates.models import Candidate, CandidateLanguage, Education, Experience, Skill
+from matching.services.dirty_queue import clear_dirty, mark_dirty
+from recruiters.models import Offer
+
+
+@receiver(post_save, sender=Candidate)
+def candidate_saved(sender, instance, **kwargs):
+    mark_dirty('candidate', [instance.pk])
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=CandidateLanguage)
+@receiver(post_delete, sender=CandidateLanguage)
+def candidate_profile_changed(sender, instance, **kwargs):
+    """Une ligne du profil (compétence, expérience, formation, langue) a changé : le candidat est à ré-encoder."""
+    mark_dirty('candidate', [instance.candidate_id])
+
+
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, **kwargs):
+    mark_dirty('offer', [instance.pk])
+
+
+@receiver(post_delete, sender=Candidate)
+def candidate_deleted(sender, instance, **kwargs):
+    # Les lignes du profil supprimées en cascade ont marqué le candidat juste avant
+    clear_dirty('candidate', [instance.pk])
+
+
+@receiver(post_delete, sender=Offer)
+def offer_deleted(sender, instance, **kwargs):
+    clear_dirty('offer', [instance.pk])
@@ -0,0 +1,61 @@
+from celery import shared_task
+from django.utils import timezone
+
+from matching.models import MatchingJob
+from matching.services.forum_matrix import DEFAULT_TOP_K, compute_forum_score_matrix
+from matching.services.dirty_queue import process_dirty_queue
+from matching.services.matching_jobs import prune_matching_jobs, update_job_progress
+from matching.services.matching_offers_candidates import rank_candidates_for_offer
+
+
+@shared_task
+def run_matching_job(job_id):
+    """Calcule le classement des candidats d'une offre et stocke le résultat dans la tâche."""
+    try:
+        job = MatchingJob.objects.select_related('offer', 'offer__forum').get(pk=job_id)
+    except MatchingJob.DoesNotExist:
+        return {"error": f"Tâche de matching introuvable : {job_id}"}
+
+    MatchingJob.objects.filter(pk=job.pk).update(status='running', progress=0, updated_at=timezone.now())
+    print(f"[CELERY] Matching de l'offre {job.offer_id} (tâche {job.pk})")
+
+    try:
+        ranked = rank_candidates_for_offer(
+            job.offer,
+            progress=lambda percent: update_job_progress(job.pk, percent),
+            **job.parameters
+        )
+        results = [[cand.pk, score, components] for cand, score, components in ranked]
+        MatchingJob.objects.filter(pk=job.pk).update(
+            status='success', progress=100, results=results, error='', updated_at=timezone.now()
+        )
+        # Les versions précédentes de ce classement et les tâches expirées ne servent plus
+        try:
+            prune_matching_jobs(job)
+        except Exception as e:
+            print(f"[CELERY] Nettoyage des tâches de matching impossible : {str(e)}")
+        return {"job_id": job.pk, "count": len(results)}
+
+    except Exception as e:
+        MatchingJob.objects.filter(pk=job.pk).update(
+            status='failure', error=str(e), updated_at=timezone.now()
+        )
+        return {"error": f"Erreur interne dans la tâche de matching : {str(e)}"}
+
+
+@shared_task
+def compute_forum_match_scores(forum_id, top_k=DEFAULT_TOP_K):
+    """Recalcule les scores offres × candidats de tout un forum."""
+    try:
+        print(f"[CELERY] Calcul de la matrice de scores du forum {forum_id}")
+        return compute_forum_score_matrix(forum_id, top_k=top_k)
+    except Exception as e:
+        return {"error": f"Erreur interne dans le calcul de la matrice : {str(e)}"}
+
+
+@shared_task
+def process_dirty_embeddings():
+    """Ré-encode par lots les candidats et offres marqués comme modifiés."""
+    processed = process_dirty_queue()
+    print(f"[CELERY] Embeddings ré-encodés depuis la file : {processed}")
+    return processed
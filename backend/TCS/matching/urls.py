@@ -1,7 +1,26 @@
 from django.urls import path
 
-from matching.views.matching_view import start_matching
+from matching.views.matching_view import (
+    start_matching, matching_job_status, matching_job_results, expand_match_profiles, model_status
+)
+from matching.views.forum_matrix_view import (
+    compute_forum_scores, forum_offer_top_candidates, forum_candidate_top_offers
+)
+from matching.views.recommendations_view import offer_recommendations
 
 urlpatterns = [
     path('start/<int:offer_id>/', start_matching, name='start_matching'),
+    path('jobs/<int:job_id>/', matching_job_status, name='matching_job_status'),
+    path('jobs/<int:job_id>/results/', matching_job_results, name='matching_job_results'),
+    path('jobs/<int:job_id>/profiles/', expand_match_profiles, name='expand_match_profiles'),
+
+    # Matrice de scores du forum (organisateurs)
+    path('forums/<int:forum_id>/scores/compute/', compute_forum_scores, name='compute_forum_scores'),
+    path('forums/<int:forum_id>/offers/<int:offer_id>/top-candidates/', forum_offer_top_candidates, name='forum_offer_top_candidates'),
+    path('forums/<int:forum_id>/candidates/<int:candidate_id>/top-offers/', forum_candidate_top_offers, name='forum_candidate_top_offers'),
+
+    # Offres recommandées au candidat connecté
+    path('recommendations/<int:forum_id>/', offer_recommendations, name='offer_recommendations'),
+
+    path('model/status/', model_status, name='matching_model_status'),
 ]
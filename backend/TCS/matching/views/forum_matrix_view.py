@@ -0,0 +1,88 @@
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from forums.models import Forum
+from organizers.models import Organizer
+from matching.services.forum_matrix import get_top_candidates_for_offer, get_top_offers_for_candidate
+from matching.tasks import compute_forum_match_scores
+
+
+def _get_organizer_forum(user, forum_id):
+    """Retourne (forum, None) si l'utilisateur organise le forum, sinon (None, Response d'erreur)."""
+    try:
+        organizer = Organizer.objects.get(user=user)
+    except ObjectDoesNotExist:
+        return None, Response({"error": "Accès réservé aux organisateurs."}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        return Forum.objects.get(id=forum_id, organizer=organizer), None
+    except Forum.DoesNotExist:
+        return None, Response({"error": "Forum non trouvé ou vous n'êtes pas autorisé à y accéder."},
+                              status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def compute_forum_scores(request, forum_id):
+    """
+    Lance le calcul de la matrice de scores offres × candidats du forum.
+    """
+    forum, error = _get_organizer_forum(request.user, forum_id)
+    if error:
+        return error
+
+    task = compute_forum_match_scores.delay(forum.id)
+    return Response({
+        "message": "Calcul des scores du forum lancé.",
+        "task_id": task.id
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def forum_offer_top_candidates(request, forum_id, offer_id):
+    """
+    Meilleurs candidats précalculés pour une offre du forum.
+    """
+    forum, error = _get_organizer_forum(request.user, forum_id)
+    if error:
+        return error
+
+    scores = get_top_candidates_for_offer(forum.id, offer_id)
+    return Response([
+        {
+            "candidate_id": match.candidate_id,
+            "first_name": match.candidate.first_name,
+            "last_name": match.candidate.last_name,
+            "public_token": match.candidate.public_token,
+            "rank": match.offer_rank,
+            "match_score": round(match.score * 100, 1),
+        }
+        for match in scores
+    ], status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def forum_candidate_top_offers(request, forum_id, candidate_id):
+    """
+    Meilleures offres précalculées pour un candidat du forum.
+    """
+    forum, error = _get_organizer_forum(request.user, forum_id)
+    if error:
+        return error
+
+    scores = get_top_offers_for_candidate(forum.id, candidate_id)
+    return Response([
+        {
+            "offer_id": match.offer_id,
+            "title": match.offer.title,
+            "company_name": match.offer.company.name,
+            "rank": match.candidate_rank,
+            "match_score": round(match.score * 100, 1),
+        }
+        for match in scores
+    ], status=status.HTTP_200_OK)
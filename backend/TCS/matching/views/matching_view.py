@@ -2,47 +2,149 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
-from recruiters.models import Recruiter
-from candidates.models import Candidate
-from matching.services.matching_offers_candidates import matching_offer_candidates
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from recruiters.models import Recruiter, Offer
+from matching.models import MatchingJob
+from matching.services.match_results import (
+    MAX_EXPANDED_PROFILES,
+    RESULTS_PAGE_SIZE,
+    InvalidCursor,
+    expand_profiles,
+    get_results_page,
+)
+from matching.services.matching_jobs import start_matching_job
+from matching.services.model_registry import get_registry_status
+from matching.services.structured import normalize_parameters
 
-from candidates.serializers import CandidateSerializer
 from rest_framework.response import Response
 
 
+def build_job_payload(job):
+    """
+    État de la tâche ; une fois terminée, première page des résultats résumés
+    (les pages suivantes via matching_job_results et `next_cursor`).
+    """
+    payload = {
+        "job_id": job.id,
+        "offer_id": job.offer_id,
+        "status": job.status,
+        "progress": job.progress,
+    }
+    if job.status == 'success':
+        payload.update(get_results_page(job))
+    elif job.status == 'failure':
+        payload["error"] = job.error
+    return payload
+
+
+def _get_recruiter_job(user, job_id):
+    """Retourne (tâche, None) si la tâche concerne une offre de l'entreprise du recruteur, sinon (None, Response d'erreur)."""
+    try:
+        recruiter = user.recruiter_profile
+    except Recruiter.DoesNotExist:
+        return None, Response({"error": "Vous n'êtes pas un recruteur."}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        job = MatchingJob.objects.select_related('offer').get(id=job_id, offer__company=recruiter.company)
+    except MatchingJob.DoesNotExist:
+        return None, Response({"error": "Tâche de matching introuvable."}, status=status.HTTP_404_NOT_FOUND)
+    return job, None
+
+
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def start_matching(request, offer_id):
+    """
+    Lance (ou réutilise) la tâche de matching de l'offre.
+    Corps optionnel : {"filters": [critères éliminatoires], "weights": {critère: poids}}.
+    200 avec les candidats si le résultat est déjà en cache, 202 avec le job_id sinon.
+    """
     user = request.user
     try:
         recruiter = user.recruiter_profile
     except Recruiter.DoesNotExist:
         return JsonResponse({"error": "Vous n'êtes pas un recruteur."}, status=403)
 
-    results = matching_offer_candidates(recruiter, offer_id)
-
-    if not results:
+    try:
+        offer = Offer.objects.select_related('forum').get(id=offer_id, company=recruiter.company)
+    except Offer.DoesNotExist:
         return JsonResponse({"status": "no_results", "candidates": []})
 
-    candidates_scores = []
-    candidate_users = set()
+    try:
+        parameters = normalize_parameters(request.data.get('filters'), request.data.get('weights'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    job = start_matching_job(offer, parameters)
+
+    if job.status == 'success':
+        return Response(build_job_payload(job), status=status.HTTP_200_OK)
+    return Response(build_job_payload(job), status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def matching_job_status(request, job_id):
+    """
+    Retourne l'état et la progression d'une tâche de matching, et les candidats une fois terminée.
+    """
+    job, error = _get_recruiter_job(request.user, job_id)
+    if error:
+        return error
+
+    return Response(build_job_payload(job), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def matching_job_results(request, job_id):
+    """
+    Résultats résumés d'une tâche terminée, paginés par curseur (?cursor=...&page_size=...).
+    """
+    job, error = _get_recruiter_job(request.user, job_id)
+    if error:
+        return error
+    if job.status != 'success':
+        return Response({"error": "Le matching n'est pas terminé."}, status=status.HTTP_409_CONFLICT)
+
+    try:
+        page_size = int(request.query_params.get('page_size', RESULTS_PAGE_SIZE))
+        page = get_results_page(job, request.query_params.get('cursor'), page_size)
+    except (ValueError, InvalidCursor):
+        return Response({"error": "Curseur ou taille de page invalide."}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(page, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def expand_match_profiles(request, job_id):
+    """
+    Profils complets d'un lot de candidats classés par la tâche : {"candidate_ids": [...]}.
+    """
+    job, error = _get_recruiter_job(request.user, job_id)
+    if error:
+        return error
 
-    for candidates_list in results.values():
-        for cand, score in candidates_list:
-            candidates_scores.append((cand.user, score))
-            candidate_users.add(cand.user)
+    candidate_ids = request.data.get('candidate_ids')
+    if not isinstance(candidate_ids, list) or not all(isinstance(i, int) for i in candidate_ids):
+        return Response({"error": "candidate_ids doit être une liste d'identifiants."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(candidate_ids) > MAX_EXPANDED_PROFILES:
+        return Response(
+            {"error": f"Au plus {MAX_EXPANDED_PROFILES} profils par appel."}, status=status.HTTP_400_BAD_REQUEST
+        )
 
-    candidates_qs = Candidate.objects.filter(user__in=candidate_users).select_related("user").prefetch_related("experiences", "educations", "skills", "candidate_languages")
-    user_to_candidate = {cand.user: cand for cand in candidates_qs}
+    profiles = expand_profiles(job, candidate_ids)
+    return Response(
+        [profiles[candidate_id] for candidate_id in candidate_ids if candidate_id in profiles],
+        status=status.HTTP_200_OK
+    )
 
-    response_candidates = []
-    for cand_user, score in candidates_scores:
-        cand = user_to_candidate.get(cand_user)
-        if cand:
-            serialized = CandidateSerializer(cand).data
-            serialized['match_score'] = round(score * 100, 1)
-            response_candidates.append(serialized)
 
-    return Response({"candidates": response_candidates}, status=status.HTTP_200_OK)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def model_status(request):
+    """
+    Retourne l'état du modèle de matching pour le processus courant (temps de chargement, mémoire).
+    """
+    return Response(get_registry_status(), status=status.HTTP_200_OK)
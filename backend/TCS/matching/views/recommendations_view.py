@@ -0,0 +1,49 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from candidates.models import Candidate
+from forums.models import Forum
+from matching.services.recommendations import DEFAULT_RECOMMENDATIONS, get_offer_recommendations
+from recruiters.models import Offer
+from recruiters.serializers import OfferSerializer
+
+MAX_RECOMMENDATIONS = 50
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def offer_recommendations(request, forum_id):
+    """
+    Retourne les offres du forum les plus pertinentes pour le candidat connecté,
+    avec leur score de matching (paramètre optionnel `top_n`).
+    """
+    try:
+        candidate = request.user.candidate_profile
+    except Candidate.DoesNotExist:
+        return Response({"error": "Accès réservé aux candidats."}, status=status.HTTP_403_FORBIDDEN)
+
+    if not Forum.objects.filter(id=forum_id).exists():
+        return Response({"error": "Forum non trouvé."}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        top_n = min(int(request.query_params.get('top_n', DEFAULT_RECOMMENDATIONS)), MAX_RECOMMENDATIONS)
+    except ValueError:
+        return Response({"error": "top_n doit être un entier."}, status=status.HTTP_400_BAD_REQUEST)
+
+    ranked = get_offer_recommendations(candidate.pk, forum_id, top_n=max(top_n, 1))
+
+    scores = dict(ranked)
+    positions = {offer_id: position for position, (offer_id, _) in enumerate(ranked)}
+    offers = Offer.objects.filter(pk__in=scores).select_related(
+        'company', 'recruiter__user', 'questionnaire'
+    ).prefetch_related('questionnaire__questions')
+    # Ordre du classement, offres supprimées entre-temps ignorées
+    offers = sorted(offers, key=lambda offer: positions[offer.pk])
+
+    recommendations = OfferSerializer(offers, many=True, context={'request': request}).data
+    for serialized in recommendations:
+        serialized['match_score'] = round(scores[serialized['id']] * 100, 1)
+
+    return Response(recommendations, status=status.HTTP_200_OK)
@@ -106,6 +106,18 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         
         await self.send(text_data=json.dumps(response_data))
     
+    async def cv_parse_progress(self, event):
+        """Envoyer une étape du parsing d'un CV (la dernière porte le résultat)"""
+        response_data = {
+            'type': 'cv_parse_progress',
+            'task_id': event['task_id'],
+            'stage': event['stage'],
+            'progress': event['progress'],
+        }
+        if 'result' in event:
+            response_data['result'] = event['result']
+        await self.send(text_data=json.dumps(response_data))
+    
     @database_sync_to_async
     def get_unread_count(self):
         """Récupérer le nombre de notifications non lues"""
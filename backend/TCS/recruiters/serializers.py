@@ -116,42 +116,34 @@ class OfferSerializer(serializers.ModelSerializer):
         }
     
     def get_questionnaire(self, obj):
-        """Récupérer le questionnaire associé à l'offre"""
+        """Récupérer le questionnaire associé à l'offre (préchargé avec ses questions si disponible)"""
+        from virtual.models import Questionnaire
+
         try:
-            # Utiliser la relation inverse depuis le modèle Questionnaire
-            from virtual.models import Questionnaire
-            
-            try:
-                questionnaire = Questionnaire.objects.select_related('offer').prefetch_related('questions').get(offer=obj)
-                print(f"Questionnaire trouvé: {questionnaire.id} - {questionnaire.title}")
-                
-                # Retourner les données du questionnaire
-                return {
-                    'id': questionnaire.id,
-                    'title': questionnaire.title,
-                    'description': questionnaire.description,
-                    'is_active': questionnaire.is_active,
-                    'is_required': questionnaire.is_required,
-                    'questions_count': questionnaire.questions.count(),
-                    'questions': [
-                        {
-                            'id': q.id,
-                            'question_text': q.question_text,
-                            'question_type': q.question_type,
-                            'is_required': q.is_required,
-                            'order': q.order,
-                            'options': q.options
-                        } for q in questionnaire.questions.all()
-                    ]
-                }
-            except Questionnaire.DoesNotExist:
-                print("Aucun questionnaire trouvé pour cette offre")
-                return None
-                
-        except Exception as e:
-            print(f"Erreur lors de la récupération du questionnaire: {e}")
+            questionnaire = obj.questionnaire
+        except Questionnaire.DoesNotExist:
             return None
 
+        questions = list(questionnaire.questions.all())
+        return {
+            'id': questionnaire.id,
+            'title': questionnaire.title,
+            'description': questionnaire.description,
+            'is_active': questionnaire.is_active,
+            'is_required': questionnaire.is_required,
+            'questions_count': len(questions),
+            'questions': [
+                {
+                    'id': q.id,
+                    'question_text': q.question_text,
+                    'question_type': q.question_type,
+                    'is_required': q.is_required,
+                    'order': q.order,
+                    'options': q.options
+                } for q in questions
+            ]
+        }
+
 
 class OfferCandidateSerializer(serializers.ModelSerializer):
     """Serializer pour les candidats - sans le statut"""
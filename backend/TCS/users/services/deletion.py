@@ -3,6 +3,8 @@ from rest_framework.response import Response
 from rest_framework import status
 from users.models import AccountDeletion, UserToken
 from candidates.models import Candidate
+from candidates.services.cv_storage import release_cv
+from candidates.services.profile_snapshot import refresh_profile_snapshot
 from recruiters.models import Recruiter
 from organizers.models import Organizer
 
@@ -32,9 +34,9 @@ def delete_candidate_account_and_data(user, reason):
         candidate = None
 
     if candidate:
-        # Supprime les fichiers CV
+        # Supprime le fichier CV (sauf s'il est partagé avec un autre candidat)
         if candidate.cv_file:
-            candidate.cv_file.delete(save=False)
+            release_cv(candidate)
 
         # Supprime les objets liés
         candidate.experiences.all().delete()
@@ -58,6 +60,10 @@ def delete_candidate_account_and_data(user, reason):
     user.is_active = False
     user.save()
 
+    # Profil précalculé anonymisé lui aussi
+    if candidate:
+        refresh_profile_snapshot(candidate)
+
     # Supprime les anciens tokens
     UserToken.objects.filter(user=user).delete()
 
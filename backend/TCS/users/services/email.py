@@ -2,6 +2,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.core.signing import TimestampSigner, SignatureExpired, BadSignature
 from users.models import UserToken, User
+from candidates.services.profile_snapshot import refresh_profile_snapshots
 
 signer = TimestampSigner()
 
@@ -28,6 +29,8 @@ def validate_email_change_token(token_str):
         # Appliquer le changement
         user.email = new_email
         user.save()
+        # L'email figure dans le profil précalculé du candidat (sans effet pour les autres rôles)
+        refresh_profile_snapshots([user.pk])
 
         user_token.is_used = True
         user_token.save()
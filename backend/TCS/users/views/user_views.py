@@ -5,6 +5,7 @@ from rest_framework import status
 from users.models import User
 from users.serializers import UserTimezoneSerializer, UserProfileSerializer
 from candidates.models import Candidate
+from candidates.services.profile_snapshot import refresh_profile_snapshots
 from recruiters.models import Recruiter
 from organizers.models import Organizer
 
@@ -63,6 +64,8 @@ def update_user_timezone(request):
     
     if serializer.is_valid():
         serializer.save()
+        # Le fuseau horaire figure dans le profil précalculé du candidat
+        refresh_profile_snapshots([request.user.pk])
         print(f"✅ [BACKEND] Fuseau horaire mis à jour avec succès: {serializer.data['timezone']}")
         return Response({
             "message": "Fuseau horaire mis à jour avec succès",
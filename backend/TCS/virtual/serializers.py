@@ -6,6 +6,7 @@ from .models import VirtualAgendaSlot, Questionnaire, Question, QuestionnaireRes
 from forums.models import Forum
 from recruiters.models import Offer
 from .utils.timezone_utils import format_time_for_user, get_user_timezone
+from candidates.services.profile_snapshot import ProfileSnapshotListSerializer, forum_search_for, snapshot_for
 
 User = get_user_model()
 
@@ -509,86 +510,81 @@ class VirtualApplicationSerializer(serializers.ModelSerializer):
             'notes', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = ProfileSnapshotListSerializer
 
     def get_candidate_photo(self, obj):
         """Retourne la photo du candidat"""
-        if obj.candidate and hasattr(obj.candidate, 'candidate_profile'):
-            candidate_profile = obj.candidate.candidate_profile
-            if hasattr(candidate_profile, 'profile_picture') and candidate_profile.profile_picture:
-                return candidate_profile.profile_picture.url
+        profile = snapshot_for(self, obj.candidate_id) if obj.candidate_id else None
+        if profile:
+            return profile.get('profile_picture')
         return None
 
     def get_candidate_profile(self, obj):
-        """Retourne le profil complet du candidat"""
-        if obj.candidate and hasattr(obj.candidate, 'candidate_profile'):
-            candidate_profile = obj.candidate.candidate_profile
-            
-            # Récupérer le secteur et la région depuis ForumRegistration pour ce forum
-            search_sector = []
-            search_region = ''
-            if obj.forum:
-                try:
-                    from forums.models import ForumRegistration
-                    registration = ForumRegistration.objects.filter(
-                        forum=obj.forum,
-                        candidate=candidate_profile
-                    ).select_related('search').first()
-                    
-                    if registration and registration.search:
-                        # sector est un JSONField (liste)
-                        search_sector = registration.search.sector if isinstance(registration.search.sector, list) else []
-                        search_region = registration.search.region or ''
-                except Exception as e:
-                    logger.warning(f"Erreur lors de la récupération du search: {e}")
-            
-            return {
-                'id': candidate_profile.id if hasattr(candidate_profile, 'id') else None,
-                'first_name': candidate_profile.first_name if hasattr(candidate_profile, 'first_name') else '',
-                'last_name': candidate_profile.last_name if hasattr(candidate_profile, 'last_name') else '',
-                'email': obj.candidate.email,
-                'phone': candidate_profile.phone if hasattr(candidate_profile, 'phone') else '',
-                'profile_picture': candidate_profile.profile_picture.url if hasattr(candidate_profile, 'profile_picture') and candidate_profile.profile_picture else None,
-                'cv_file': candidate_profile.cv_file.url if hasattr(candidate_profile, 'cv_file') and candidate_profile.cv_file else None,
-                'birth_date': candidate_profile.birth_date.isoformat() if hasattr(candidate_profile, 'birth_date') and candidate_profile.birth_date else None,
-                'address': candidate_profile.address if hasattr(candidate_profile, 'address') else '',
-                'city': candidate_profile.city if hasattr(candidate_profile, 'city') else '',
-                'postal_code': candidate_profile.postal_code if hasattr(candidate_profile, 'postal_code') else '',
-                'country': candidate_profile.country if hasattr(candidate_profile, 'country') else '',
-                'linkedin': candidate_profile.linkedin if hasattr(candidate_profile, 'linkedin') else '',
-                'github': candidate_profile.github if hasattr(candidate_profile, 'github') else '',
-                'portfolio': candidate_profile.portfolio if hasattr(candidate_profile, 'portfolio') else '',
-                'bio': candidate_profile.bio if hasattr(candidate_profile, 'bio') else '',
-                'search': {
-                    'sector': search_sector,
-                    'region': search_region,
-                },
-                'educations': [{
-                    'id': edu.id,
-                    'degree': edu.degree,
-                    'institution': edu.institution,
-                    'start_date': edu.start_date.isoformat() if edu.start_date else None,
-                    'end_date': edu.end_date.isoformat() if edu.end_date else None,
-                } for edu in candidate_profile.educations.all()] if hasattr(candidate_profile, 'educations') else [],
-                'experiences': [{
-                    'id': exp.id,
-                    'job_title': exp.job_title,
-                    'company': exp.company,
-                    'start_date': exp.start_date.isoformat() if exp.start_date else None,
-                    'end_date': exp.end_date.isoformat() if exp.end_date else None,
-                    'description': exp.description,
-                } for exp in candidate_profile.experiences.all()] if hasattr(candidate_profile, 'experiences') else [],
-                'candidate_languages': [{
-                    'id': lang.id,
-                    'language': lang.language.name if hasattr(lang, 'language') and lang.language else lang.language_name if hasattr(lang, 'language_name') else '',
-                    'level': lang.level,
-                } for lang in candidate_profile.candidate_languages.all()] if hasattr(candidate_profile, 'candidate_languages') else [],
-                'skills': [{
-                    'id': skill.id,
-                    'name': skill.name,
-                    'level': skill.level if hasattr(skill, 'level') else '',
-                } for skill in candidate_profile.skills.all()] if hasattr(candidate_profile, 'skills') else [],
-            }
-        return None
+        """Retourne le profil complet du candidat (document précalculé du profil)"""
+        profile = snapshot_for(self, obj.candidate_id) if obj.candidate_id else None
+        if profile is None:
+            return None
+
+        # Secteur et région de la recherche de l'inscription au forum (chargées pour toute la liste)
+        search_sector = []
+        search_region = ''
+        if obj.forum_id:
+            try:
+                search = forum_search_for(self, obj.forum_id, obj.candidate_id)
+                if search:
+                    # sector est un JSONField (liste)
+                    search_sector = search.sector if isinstance(search.sector, list) else []
+                    search_region = search.region or ''
+            except Exception as e:
+                logger.warning(f"Erreur lors de la récupération du search: {e}")
+
+        return {
+            'id': profile.get('id'),
+            'first_name': profile.get('first_name', ''),
+            'last_name': profile.get('last_name', ''),
+            'email': profile.get('email'),
+            'phone': profile.get('phone', ''),
+            'profile_picture': profile.get('profile_picture'),
+            'cv_file': profile.get('cv_file'),
+            'birth_date': profile.get('birth_date'),
+            'address': profile.get('address', ''),
+            'city': profile.get('city', ''),
+            'postal_code': profile.get('postal_code', ''),
+            'country': profile.get('country', ''),
+            'linkedin': profile.get('linkedin', ''),
+            'github': profile.get('github', ''),
+            'portfolio': profile.get('portfolio', ''),
+            'bio': profile.get('bio', ''),
+            'search': {
+                'sector': search_sector,
+                'region': search_region,
+            },
+            'educations': [{
+                'id': edu['id'],
+                'degree': edu['degree'],
+                'institution': edu['institution'],
+                'start_date': edu['start_date'],
+                'end_date': edu['end_date'],
+            } for edu in profile.get('educations', [])],
+            'experiences': [{
+                'id': exp['id'],
+                'job_title': exp['job_title'],
+                'company': exp['company'],
+                'start_date': exp['start_date'],
+                'end_date': exp['end_date'],
+                'description': exp['description'],
+            } for exp in profile.get('experiences', [])],
+            'candidate_languages': [{
+                'id': lang['id'],
+                'language': lang['language'] or '',
+                'level': lang['level'],
+            } for lang in profile.get('candidate_languages', [])],
+            'skills': [{
+                'id': skill['id'],
+                'name': skill['name'],
+                'level': skill.get('level', ''),
+            } for skill in profile.get('skills', [])],
+        }
 
     def get_offer(self, obj):
         """Retourne l'objet offre complet"""
@@ -1,4 +1,4 @@
-import React, { useState, useCallback } from 'react';
+import React, { useState, useCallback, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { useAuth } from '../../../../context/AuthContext';
 import { FileCheck, Loader2, AlertCircle, Upload, Eye } from 'lucide-react';
@@ -6,12 +6,31 @@ import toast from '../../../../utils/toast';
 import '../../../../pages/styles/candidate/uploadCV.css';
 import { Button, Badge } from '../../../common';
 
+// Délai sans nouvelle de la tâche sur le WebSocket (depuis le dernier événement) avant de consulter task_status
+const FALLBACK_DELAY = 5000;
+// Intervalle de consultation de task_status quand la progression n'est pas poussée (pas de Redis)
+const POLL_INTERVAL = 3000;
+
+const STAGE_LABELS = {
+  uploaded: 'CV reçu',
+  text_extracted: 'Texte extrait',
+  parsed: 'CV analysé',
+  completed: 'Analyse terminée',
+};
+
 const UploadCV = ({ onUpload, formData }) => {
   const { accessToken } = useAuth();
   const [file, setFile] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [isDragging, setIsDragging] = useState(false);
+  const [progress, setProgress] = useState(null);
+  const taskIdRef = useRef(null);
+  const fallbackRef = useRef(null);
+  // Faux si le serveur ne peut pas pousser la progression : consultation de task_status dès le départ
+  const pushRef = useRef(true);
+  // Événements arrivés avant la réponse de l'upload (CV servi par le cache), par task_id
+  const earlyEventsRef = useRef({});
   const API = process.env.REACT_APP_API_BASE_URL;
 
   const existingCVUrl = formData?.cv_file?.startsWith('http')
@@ -80,7 +99,7 @@ const UploadCV = ({ onUpload, formData }) => {
       const taskId = response.data.task_id;
       if (!taskId) throw new Error('ID de tâche manquant');
 
-      checkTaskStatus(taskId);
+      checkTaskStatus(taskId, response.data.progress_push !== false);
     } catch (err) {
       const errorMessage =
         err.response?.data?.error ||
@@ -92,47 +111,98 @@ const UploadCV = ({ onUpload, formData }) => {
     }
   };
 
-  const checkTaskStatus = async (taskId) => {
-    const interval = setInterval(async () => {
+  const finishTask = useCallback((result) => {
+    clearTimeout(fallbackRef.current);
+    taskIdRef.current = null;
+    setLoading(false);
+    setProgress(null);
+
+    if (!result?.is_cv) {
+      const msg = " Le fichier fourni n'est pas reconnu comme un CV.";
+      setError(msg);
+      toast.warning(msg);
+      return;
+    }
+
+    toast.success(' CV analysé avec succès !');
+    onUpload(result.data);
+  }, [onUpload]);
+
+  const failTask = useCallback((message) => {
+    clearTimeout(fallbackRef.current);
+    taskIdRef.current = null;
+    setLoading(false);
+    setProgress(null);
+    setError(message);
+    toast.error(message);
+  }, []);
+
+  // Repli si le WebSocket est muet (déconnecté, ou progression non poussée) : une consultation de task_status,
+  // renouvelée tant que la tâche tourne
+  const scheduleFallback = useCallback((taskId) => {
+    clearTimeout(fallbackRef.current);
+    fallbackRef.current = setTimeout(async () => {
+      if (taskIdRef.current !== taskId) return;
       try {
         const res = await axios.get(`${API}/candidates/task_status/${taskId}/`, {
           headers: { Authorization: `Bearer ${accessToken}` },
         });
-
         const { state, result } = res.data;
+        if (taskIdRef.current !== taskId) return;
 
         if (state === 'SUCCESS') {
-          clearInterval(interval);
-          setLoading(false);
-
-          if (!result?.is_cv) {
-            const msg = " Le fichier fourni n'est pas reconnu comme un CV.";
-            setError(msg);
-            toast.warning(msg);
-            return;
-          }
-
-          toast.success(' CV analysé avec succès !');
-          onUpload(result.data);
-        }
-
-        if (state === 'FAILURE') {
-          clearInterval(interval);
-          setLoading(false);
-          const failMsg = " L'analyse du CV a échoué.";
-          setError(failMsg);
-          toast.error(failMsg);
+          finishTask(result);
+        } else if (state === 'FAILURE') {
+          failTask(" L'analyse du CV a échoué.");
+        } else {
+          scheduleFallback(taskId);
         }
       } catch (err) {
-        clearInterval(interval);
-        setLoading(false);
-        const errMsg = "Erreur lors du suivi de l'analyse.";
-        setError(errMsg);
-        toast.error(errMsg);
+        failTask("Erreur lors du suivi de l'analyse.");
       }
-    }, 3000);
+    }, pushRef.current ? FALLBACK_DELAY : POLL_INTERVAL);
+  }, [API, accessToken, finishTask, failTask]);
+
+  const applyProgress = useCallback(({ task_id: taskId, stage, progress: percent, result }) => {
+    if (stage === 'completed' || stage === 'failed') {
+      finishTask(result);
+      return;
+    }
+    setProgress({ stage, percent });
+    scheduleFallback(taskId);
+  }, [finishTask, scheduleFallback]);
+
+  const checkTaskStatus = (taskId, push) => {
+    taskIdRef.current = taskId;
+    pushRef.current = push;
+    const early = earlyEventsRef.current[taskId];
+    earlyEventsRef.current = {};
+    if (early) {
+      applyProgress(early);
+    } else {
+      scheduleFallback(taskId);
+    }
   };
 
+  // Progression poussée par le serveur (NotificationConsumer), relayée par useNotificationWebSocket
+  useEffect(() => {
+    const handleProgress = (event) => {
+      const detail = event.detail;
+      if (!taskIdRef.current) {
+        earlyEventsRef.current[detail.task_id] = detail;
+        return;
+      }
+      if (detail.task_id === taskIdRef.current) {
+        applyProgress(detail);
+      }
+    };
+
+    window.addEventListener('cv-parse-progress', handleProgress);
+    return () => window.removeEventListener('cv-parse-progress', handleProgress);
+  }, [applyProgress]);
+
+  useEffect(() => () => clearTimeout(fallbackRef.current), []);
+
   return (
     <div className="upload-cv-container" id="uploadcv">
       <div className="upload-header">
@@ -153,7 +223,11 @@ const UploadCV = ({ onUpload, formData }) => {
       {loading && (
         <div className="parsing-banner">
           <Loader2 size={18} className="spin" />
-          <span>Analyse du CV en cours, veuillez patienter...</span>
+          <span>
+            {progress
+              ? `${STAGE_LABELS[progress.stage] || 'Analyse du CV en cours'} (${progress.percent}%)...`
+              : 'Analyse du CV en cours, veuillez patienter...'}
+          </span>
         </div>
       )}
 
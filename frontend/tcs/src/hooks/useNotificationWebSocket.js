@@ -51,6 +51,11 @@ const useNotificationWebSocket = () => {
       case 'notifications':
         // Liste de notifications (si demandée)
         break;
+
+      case 'cv_parse_progress':
+        // Progression du parsing d'un CV : relayée au composant d'upload (UploadCV)
+        window.dispatchEvent(new CustomEvent('cv-parse-progress', { detail: data }));
+        break;
       
       default:
         console.log('Type de message non géré:', data.type);
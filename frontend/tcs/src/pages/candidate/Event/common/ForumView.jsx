@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useCallback } from 'react';
-import axios from 'axios';
+import { fetchForumPage } from '../../../../utils/forumPagination';
 import ForumCard from '../../../../components/card/forum/ForumCard';
 import SearchBar from '../../../../components/filters/offer/SearchBar';
 import ForumCardRegistered from '../../../../components/card/forum/ForumCardRegistered';
@@ -16,6 +16,9 @@ const ForumView = () => {
   const [displayedForums, setDisplayedForums] = useState([]);
   const [error, setError] = useState(null);
   const [isLoading, setIsLoading] = useState(true); 
+  // URL de la page suivante des forums à explorer (en-tête Link), chargée à la demande
+  const [nextPage, setNextPage] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [statusFilter, setStatusFilter] = useState('ongoing');
   const { isAuthenticated, role, isAuthLoading } = useAuth();
   const API = process.env.REACT_APP_API_BASE_URL;
@@ -24,17 +27,19 @@ const ForumView = () => {
     try {
       setIsLoading(true);
       if (isAuthenticated) {
-        const res = await axios.get(`${API}/forums/candidate/`, {
+        const { data, items, next } = await fetchForumPage(`${API}/forums/candidate/`, {
           withCredentials: true
-        });
-        setRegisteredForums(res.data.registered || []);
-        setUnregisteredForums(res.data.unregistered || []);
-        setDisplayedForums(res.data.unregistered || []);
+        }, 'unregistered');
+        setRegisteredForums(data.registered || []);
+        setUnregisteredForums(items);
+        setDisplayedForums(items);
+        setNextPage(next);
       } else if (!isAuthLoading) {
         // Seulement si l'authentification est complètement terminée et que l'utilisateur n'est pas connecté
-        const res = await axios.get(`${API}/forums/`);
-        setAllForums(res.data || []);
-        setDisplayedForums(res.data || []);
+        const { items, next } = await fetchForumPage(`${API}/forums/`);
+        setAllForums(items);
+        setDisplayedForums(items);
+        setNextPage(next);
       }
     } catch (err) {
       setError("Erreur lors du chargement des forums.");
@@ -48,6 +53,29 @@ const ForumView = () => {
     fetchForums();
   }, [fetchForums]);
 
+  // ➕ Page suivante des forums à explorer, ajoutée à la liste
+  const loadMoreForums = async () => {
+    if (!nextPage) return;
+    try {
+      setIsLoadingMore(true);
+      const { items, next } = isAuthenticated
+        ? await fetchForumPage(nextPage, { withCredentials: true }, 'unregistered')
+        : await fetchForumPage(nextPage);
+      if (isAuthenticated) {
+        setUnregisteredForums(prev => [...prev, ...items]);
+      } else {
+        setAllForums(prev => [...prev, ...items]);
+      }
+      setDisplayedForums(prev => [...prev, ...items]);
+      setNextPage(next);
+    } catch (err) {
+      setError("Erreur lors du chargement des forums.");
+      console.error(err.message);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   // Un forum est en cours/à venir si sa date de fin (avec heure) est dans le futur
   const isOngoing = forum => {
     if (!forum.end_date) return false;
@@ -230,6 +258,14 @@ const ForumView = () => {
             </div>
           )
         )}
+
+        {nextPage && (
+          <div className="forum-load-more">
+            <button className="btn-outline" onClick={loadMoreForums} disabled={isLoadingMore}>
+              {isLoadingMore ? 'Chargement...' : 'Voir plus de forums'}
+            </button>
+          </div>
+        )}
       </section>
     </div>
     
@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useCallback } from 'react';
-import axios from 'axios';
+import { fetchForumPage } from '../../../../utils/forumPagination';
 import ForumCard from '../../../../components/card/forum/ForumCard';
 import SearchBar from '../../../../components/filters/offer/SearchBar';
 import ForumCardRegistered from '../../../../components/card/forum/ForumCardRegistered';
@@ -17,6 +17,9 @@ const ForumOrganizerView = () => {
   const [displayedForums, setDisplayedForums] = useState([]);
   const [error, setError] = useState(null);
   const [isLoading, setIsLoading] = useState(true); 
+  // URL de la page suivante des forums à explorer (en-tête Link), chargée à la demande
+  const [nextPage, setNextPage] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [statusFilter, setStatusFilter] = useState('ongoing');
   const { isAuthenticated, role, isAuthLoading } = useAuth();
   const API = process.env.REACT_APP_API_BASE_URL;
@@ -25,18 +28,20 @@ const ForumOrganizerView = () => {
     try {
       setIsLoading(true);
       if (isAuthenticated) {
-        const res = await axios.get(`${API}/forums/organizer/my-forums/`, {
+        const { data, items, next } = await fetchForumPage(`${API}/forums/organizer/my-forums/`, {
           withCredentials: true
-        });
-        setRegisteredForums(res.data.organized || []);
-        setUnregisteredForums(res.data.not_organized || []);
-        setDisplayedForums(res.data.not_organized || []);
-        console.log(res.data)
+        }, 'not_organized');
+        setRegisteredForums(data.organized || []);
+        setUnregisteredForums(items);
+        setDisplayedForums(items);
+        setNextPage(next);
+        console.log(data)
       } else if (!isAuthLoading) {
         // Seulement si l'authentification est complètement terminée et que l'utilisateur n'est pas connecté
-        const res = await axios.get(`${API}/forums/`);
-        setAllForums(res.data || []);
-        setDisplayedForums(res.data || []);
+        const { items, next } = await fetchForumPage(`${API}/forums/`);
+        setAllForums(items);
+        setDisplayedForums(items);
+        setNextPage(next);
       }
     } catch (err) {
       setError("Erreur lors du chargement des forums.");
@@ -50,6 +55,29 @@ const ForumOrganizerView = () => {
     fetchForums();
   }, [fetchForums]);
 
+  // ➕ Page suivante des forums à explorer, ajoutée à la liste
+  const loadMoreForums = async () => {
+    if (!nextPage) return;
+    try {
+      setIsLoadingMore(true);
+      const { items, next } = isAuthenticated
+        ? await fetchForumPage(nextPage, { withCredentials: true }, 'not_organized')
+        : await fetchForumPage(nextPage);
+      if (isAuthenticated) {
+        setUnregisteredForums(prev => [...prev, ...items]);
+      } else {
+        setAllForums(prev => [...prev, ...items]);
+      }
+      setDisplayedForums(prev => [...prev, ...items]);
+      setNextPage(next);
+    } catch (err) {
+      setError("Erreur lors du chargement des forums.");
+      console.error(err.message);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   // Un forum est en cours/à venir si sa date de fin (avec heure) est dans le futur
   const isOngoing = forum => {
     if (!forum.end_date) return false;
@@ -232,6 +260,14 @@ const ForumOrganizerView = () => {
             </div>
           )
         )}
+
+        {nextPage && (
+          <div className="forum-load-more">
+            <button className="btn-outline" onClick={loadMoreForums} disabled={isLoadingMore}>
+              {isLoadingMore ? 'Chargement...' : 'Voir plus de forums'}
+            </button>
+          </div>
+        )}
       </section>
     </div>
   
@@ -48,13 +48,36 @@ const MatchingOffers = ({ forum, accessToken, apiBaseUrl }) => {
     setMatchingInProgressForOffer(offerId);
 
     try {
-      const res = await axios.post(
+      let res = await axios.post(
         `${apiBaseUrl}/matching/start/${offerId}/`,
         {},
         { headers: { Authorization: `Bearer ${accessToken}` } }
       );
 
-      const candidates = res.data.candidates || [];
+      // Matching asynchrone : on suit la tâche jusqu'à la fin (résultat immédiat s'il est déjà en cache)
+      while (res.data.job_id && ['pending', 'running'].includes(res.data.status)) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        res = await axios.get(
+          `${apiBaseUrl}/matching/jobs/${res.data.job_id}/`,
+          { headers: { Authorization: `Bearer ${accessToken}` } }
+        );
+      }
+
+      if (res.data.status === 'failure') {
+        throw new Error(res.data.error || 'Erreur lors du matching');
+      }
+
+      // Résultats résumés paginés : on suit le curseur jusqu'à la dernière page
+      let candidates = res.data.candidates || [];
+      let cursor = res.data.next_cursor;
+      while (cursor) {
+        const page = await axios.get(
+          `${apiBaseUrl}/matching/jobs/${res.data.job_id}/results/`,
+          { params: { cursor }, headers: { Authorization: `Bearer ${accessToken}` } }
+        );
+        candidates = candidates.concat(page.data.candidates);
+        cursor = page.data.next_cursor;
+      }
       const offer = offers.find(o => o.id === offerId);
       
       // Navigation vers la page de détails de matching
@@ -69,7 +92,7 @@ const MatchingOffers = ({ forum, accessToken, apiBaseUrl }) => {
       });
 
     } catch (err) {
-      alert(err.response?.data?.detail || 'Erreur lors du matching');
+      alert(err.response?.data?.detail || err.message || 'Erreur lors du matching');
     } finally {
       setMatchingInProgressForOffer(null);
     }
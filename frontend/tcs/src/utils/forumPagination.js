@@ -0,0 +1,26 @@
+import axios from 'axios';
+
+/**
+ * Extrait l'URL de la page suivante de l'en-tête Link (rel="next")
+ * @param {string|undefined} linkHeader - En-tête Link de la réponse
+ * @returns {string|null} URL de la page suivante ou null
+ */
+const getNextLink = (linkHeader) => {
+  if (!linkHeader) return null;
+  const match = linkHeader.match(/<([^>]+)>;\s*rel="next"/);
+  return match ? match[1] : null;
+};
+
+/**
+ * Récupère une page d'une liste de forums paginée (en-tête Link).
+ * Les pages suivantes se chargent à la demande ("Voir plus") avec l'URL `next`.
+ * @param {string} url - URL de la page (première page, ou `next` de la page précédente)
+ * @param {Object} config - Configuration axios (withCredentials...)
+ * @param {string|null} pagedKey - Clé de la liste paginée si la réponse est un objet ("unregistered", "not_organized")
+ * @returns {Promise<{data: Array|Object, items: Array, next: string|null}>} Réponse, forums de la page et URL de la page suivante
+ */
+export const fetchForumPage = async (url, config = {}, pagedKey = null) => {
+  const res = await axios.get(url, config);
+  const items = (pagedKey ? res.data[pagedKey] : res.data) || [];
+  return { data: res.data, items, next: getNextLink(res.headers.link) };
+};